@@ -19,21 +19,26 @@ def _dump(args):
     yaml.dump(config, sys.stdout, default_flow_style=False, sort_keys=False)
 
 
-def _process(args):
+def _caseroot_config_path(caseroot) -> Path:
+    """Return the config.json of a caseroot."""
     from CrocoDash import case_state
-    from CrocoDash.extract_forcings.driver import run_workflow, resolve_components
 
+    state = case_state.read(Path(caseroot))
+    config_path = Path(state["inputdir"]) / "extract_forcings" / "config.json"
+    if not config_path.exists():
+        raise FileNotFoundError(
+            f"Forcing configuration not found at {config_path}\n"
+            "Run case.configure_forcings() before calling 'crocodash process'."
+        )
+    return config_path
+
+
+def _config_path(args) -> Path:
+    """Find config.json from --config, --caseroot or the current directory."""
     if args.config:
         config_path = Path(args.config)
     elif args.caseroot:
-        caseroot = Path(args.caseroot)
-        state = case_state.read(caseroot)
-        config_path = Path(state["inputdir"]) / "extract_forcings" / "config.json"
-        if not config_path.exists():
-            raise FileNotFoundError(
-                f"Forcing configuration not found at {config_path}\n"
-                "Run case.configure_forcings() before calling 'crocodash process'."
-            )
+        config_path = _caseroot_config_path(args.caseroot)
     elif (Path.cwd() / "config.json").exists():
         # Ran directly from inside the extract_forcings/ directory
         config_path = Path.cwd() / "config.json"
@@ -42,10 +47,35 @@ def _process(args):
             "No config.json found in the current directory and no --config or --caseroot provided.\n"
             "Run from inside an extract_forcings/ directory, or pass --caseroot <path> or --config <path>."
         )
+    return config_path
+
+
+# Component flags of 'crocodash process' and 'crocodash process-many'
+_COMPONENT_FLAGS = (
+    ("--ic", "Run initial conditions"),
+    ("--bc", "Run boundary conditions"),
+    ("--bgcic", "Run BGC initial conditions"),
+    ("--bgcironforcing", "Run BGC iron forcing"),
+    ("--bgcrivernutrients", "Run BGC river nutrients"),
+    ("--runoff", "Run runoff mapping"),
+    ("--tides", "Run tidal forcing"),
+    ("--chl", "Run chlorophyll processing"),
+)
+
 
+def _process(args):
+    from CrocoDash.extract_forcings.driver import run_workflow, resolve_components
+
+    config_path = _config_path(args)
+    if args.emit_tasks is not None or args.task is not None:
+        _process_tasks(args, config_path)
+        return
     with open(config_path) as f:
         config = json.load(f)
 
+    if args.extend_to:
+        # Only the boundary conditions depend on the end date
+        args.bc = True
     args = resolve_components(args, config)
 
     if not any(
@@ -74,9 +104,119 @@ def _process(args):
         runoff=args.runoff,
         bgcrivernutrients=args.bgcrivernutrients,
         preview=config["conditions"]["outputs"].get("preview", False),
+        max_workers=args.jobs,
+        extend_to=args.extend_to,
     )
 
 
+def _process_tasks(args, config_path: Path):
+    """Write the task list (--emit-tasks) or run tasks of it (--task)."""
+    from CrocoDash.extract_forcings import scheduler, tasks
+
+    if args.emit_tasks is not None:
+        path = tasks.write_tasks(config_path, args.emit_tasks or None)
+        print(tasks.format_tasks(tasks.load_tasks(path), path))
+        return
+    task_file = args.task_file or tasks.default_path(config_path)
+    if args.task == "all":
+        status = tasks.run_local(task_file, max_workers=args.jobs or 1)
+        print(scheduler.format_status_table(status))
+        scheduler.raise_first_failure(status)
+    else:
+        tasks.run_task(task_file, int(args.task))
+
+
+def _process_many(args):
+    from CrocoDash.extract_forcings import batch, scheduler
+
+    skip = {s.lower() for s in args.skip}
+    components = [
+        name
+        for name in batch.COMPONENTS
+        if (args.all or getattr(args, name)) and name not in skip
+    ]
+    if not components:
+        args.subparser.print_help()
+        return
+    status = batch.run_workflows(
+        [_caseroot_config_path(c) for c in args.caseroots],
+        components=components,
+        max_workers=args.jobs,
+        memory_budget_gb=args.memory_budget_gb,
+    )
+    print(scheduler.format_status_table(status))
+    scheduler.raise_first_failure(status)
+
+
+def _report(args):
+    from CrocoDash.extract_forcings import report
+
+    if args.action == "diff":
+        if len(args.reports) != 2:
+            raise SystemExit("crocodash report diff needs two reports: A.json B.json")
+        a, b = (report.load(p) for p in args.reports)
+        thresholds = {
+            "time": args.time_threshold,
+            "memory": args.memory_threshold,
+            "io": args.io_threshold,
+        }
+        rows = report.diff_reports(
+            a,
+            b,
+            depth=1 if args.depth is None else args.depth,
+            thresholds={k: v for k, v in thresholds.items() if v is not None},
+        )
+        print(report.format_diff(a, b, rows, all_rows=args.show_all))
+        if any(row["regressed"] for row in rows):
+            sys.exit(1)
+        return
+
+    if args.reports:
+        paths = [Path(p) for p in args.reports]
+    else:
+        reports_dir = _config_path(args).parent / report.REPORTS_DIR
+        latest = report.latest(reports_dir)
+        if latest is None:
+            raise FileNotFoundError(f"No run reports in {reports_dir}")
+        paths = [latest]
+    for path in paths:
+        print(report.format_report(report.load(path), depth=args.depth))
+
+
+def _cache(args):
+    from datetime import datetime
+    from CrocoDash.extract_forcings.raw_cache import RawCache
+
+    cache = RawCache(args.dir)
+    if args.action == "list":
+        entries = cache.entries()
+        total = 0
+        for key, entry in sorted(entries.items(), key=lambda e: -e[1]["last_used"]):
+            request = entry["request"]
+            total += entry["size"]
+            last_used = datetime.fromtimestamp(entry["last_used"])
+            print(
+                f"{key[:12]}  {entry['size'] / 1024**2:10.1f} MB  "
+                f"{last_used:%Y-%m-%d %H:%M}  {request['function']}  "
+                f"{request['dates'][0]} → {request['dates'][1]}"
+            )
+        print(f"{len(entries)} entries, {total / 1024**3:.2f} GB in {cache.cache_dir}")
+    elif args.action == "prune":
+        removed = cache.prune(
+            max_bytes=None if args.max_gb is None else int(args.max_gb * 1024**3),
+            older_than_days=args.older_than,
+        )
+        print(f"Removed {len(removed)} entries from {cache.cache_dir}")
+    elif args.action == "verify":
+        problems = cache.verify(remove=args.remove)
+        for key, problem in sorted(problems.items()):
+            print(f"{key[:12]}  {problem}")
+        verb = "Removed" if args.remove else "Found"
+        print(f"{verb} {len(problems)} bad entries in {cache.cache_dir}")
+        if problems and not args.remove:
+            sys.exit(1)
+
+
 def _bundle(args):
     from CrocoDash.shareable import CaseBundle  # lazy import for faster startup
 
@@ -166,35 +306,175 @@ def main():
     ef_top = ef_parser.add_argument_group("Top-level actions")
     ef_top.add_argument("--all", action="store_true", help="Run all components")
     ef_components = ef_parser.add_argument_group("Forcing components")
-    ef_components.add_argument(
-        "--ic", action="store_true", help="Run initial conditions"
+    for flag, help in _COMPONENT_FLAGS:
+        ef_components.add_argument(flag, action="store_true", help=help)
+    ef_top.add_argument(
+        "--skip",
+        nargs="*",
+        default=[],
+        help="Skip components by name (e.g. --skip tides runoff)",
     )
-    ef_components.add_argument(
-        "--bc", action="store_true", help="Run boundary conditions"
+    ef_top.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of parallel workers (overrides max_workers in config.json)",
     )
-    ef_components.add_argument(
-        "--bgcic", action="store_true", help="Run BGC initial conditions"
+    ef_top.add_argument(
+        "--extend-to",
+        default=None,
+        metavar="DATE",
+        help="Extend the boundary conditions to DATE, processing only the new dates, "
+        "and update end_date and STOP_N",
+    )
+    ef_tasks = ef_parser.add_argument_group("Job arrays")
+    ef_tasks.add_argument(
+        "--emit-tasks",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Write the boundary-condition task list for a job array "
+        "(default: tasks.json next to config.json) instead of processing",
     )
-    ef_components.add_argument(
-        "--bgcironforcing", action="store_true", help="Run BGC iron forcing"
+    ef_tasks.add_argument(
+        "--task",
+        default=None,
+        metavar="ID",
+        help="Run one task of the task list, or 'all' to run every task locally",
+    )
+    ef_tasks.add_argument(
+        "--task-file",
+        default=None,
+        metavar="PATH",
+        help="Task list used by --task (default: tasks.json next to config.json)",
     )
-    ef_components.add_argument(
-        "--bgcrivernutrients", action="store_true", help="Run BGC river nutrients"
+    ef_parser.set_defaults(func=_process, subparser=ef_parser)
+
+    # --- process-many ---
+    many_parser = subparsers.add_parser(
+        "process-many",
+        help="Run the forcing extraction of several cases on one shared worker pool.",
     )
-    ef_components.add_argument(
-        "--runoff", action="store_true", help="Run runoff mapping"
+    many_parser.add_argument(
+        "caseroots", nargs="+", metavar="CASEROOT", help="Paths to the CESM caseroots."
     )
-    ef_components.add_argument("--tides", action="store_true", help="Run tidal forcing")
-    ef_components.add_argument(
-        "--chl", action="store_true", help="Run chlorophyll processing"
+    many_parser.add_argument(
+        "--all", action="store_true", help="Run all components of each case"
     )
-    ef_top.add_argument(
+    many_components = many_parser.add_argument_group("Forcing components")
+    for flag, help in _COMPONENT_FLAGS:
+        many_components.add_argument(flag, action="store_true", help=help)
+    many_parser.add_argument(
         "--skip",
         nargs="*",
         default=[],
         help="Skip components by name (e.g. --skip tides runoff)",
     )
-    ef_parser.set_defaults(func=_process, subparser=ef_parser)
+    many_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker slots shared by all the cases",
+    )
+    many_parser.add_argument(
+        "--memory-budget-gb",
+        type=float,
+        default=None,
+        help="Memory shared by the cases' 'auto' regrid plans "
+        "(default: each case's memory_budget_gb)",
+    )
+    many_parser.set_defaults(func=_process_many, subparser=many_parser)
+
+    # --- report ---
+    report_parser = subparsers.add_parser(
+        "report",
+        help="Show the timing and resource report of a forcing extraction run.",
+    )
+    report_parser.add_argument(
+        "action",
+        nargs="?",
+        default="show",
+        choices=["show", "diff"],
+        help="show a run report (default), or diff two reports A B and exit with "
+        "status 1 if B regressed.",
+    )
+    report_parser.add_argument(
+        "reports",
+        nargs="*",
+        help="Report files (default: the latest run of the case).",
+    )
+    report_parser.add_argument(
+        "--config",
+        default=None,
+        help="Direct path to the case's config.json. Takes precedence over --caseroot.",
+    )
+    report_parser.add_argument(
+        "--caseroot",
+        default=None,
+        help="Path to the CESM caseroot.",
+    )
+    report_parser.add_argument(
+        "--depth",
+        type=int,
+        default=None,
+        help="Show spans down to this many levels below the run "
+        "(diff: default 1, the components).",
+    )
+    for metric, default in (("time", "0.25"), ("memory", "0.2"), ("io", "0.25")):
+        report_parser.add_argument(
+            f"--{metric}-threshold",
+            type=float,
+            default=None,
+            dest=f"{metric}_threshold",
+            help=f"diff: flag a {metric} increase above this fraction "
+            f"(default {default}).",
+        )
+    report_parser.add_argument(
+        "--show-all",
+        action="store_true",
+        default=False,
+        dest="show_all",
+        help="diff: list every compared metric, not only regressions.",
+    )
+    report_parser.set_defaults(func=_report)
+
+    # --- cache ---
+    cache_parser = subparsers.add_parser(
+        "cache",
+        help="Inspect and maintain the raw-data cache shared across cases.",
+    )
+    cache_parser.add_argument(
+        "action",
+        choices=["list", "prune", "verify"],
+        help="list entries, prune old or excess entries, or verify every entry.",
+    )
+    cache_parser.add_argument(
+        "--dir",
+        default=None,
+        help="Cache directory (default: ~/.cache/crocodash/raw).",
+    )
+    cache_parser.add_argument(
+        "--max-gb",
+        type=float,
+        default=None,
+        dest="max_gb",
+        help="prune: shrink the cache to this size, least recently used first.",
+    )
+    cache_parser.add_argument(
+        "--older-than",
+        type=float,
+        default=None,
+        dest="older_than",
+        help="prune: remove entries unused for this many days.",
+    )
+    cache_parser.add_argument(
+        "--remove",
+        action="store_true",
+        default=False,
+        help="verify: delete bad entries instead of only reporting them.",
+    )
+    cache_parser.set_defaults(func=_cache)
 
     # --- bundle ---
     bundle_parser = subparsers.add_parser(
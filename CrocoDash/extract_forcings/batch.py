@@ -0,0 +1,289 @@
+"""Forcing extraction for many cases at once.
+
+Ensembles of cases that differ only in compset options or date windows
+request the same boundary data and build the same regridding weights.
+``run_workflows`` processes such a set of cases together:
+
+1. It collects every case's OBC download requests and keys them like the
+   raw-data cache does (see ``utils.describe_raw_request``). Each distinct
+   request is downloaded once, on one pool of ``max_workers``, into a raw
+   cache shared by all the cases. The other cases asking for it then link it
+   from the cache instead of downloading it again.
+2. It runs each case's ``run_workflow`` as one component of a single
+   ``scheduler.run_components`` run, so all the cases share one budget of
+   ``max_workers`` worker slots. A case claims as many slots as its own
+   ``max_workers`` (capped at the budget), and a global ``memory_budget_gb``
+   is split between the running cases in proportion to their slots.
+3. Cases whose boundary conditions need the same regridding weights (same
+   grid, product and boundaries) and that use the same weight cache (see
+   ``driver._weight_cache``) form a group. The first case of a group builds
+   the weights into that cache, and the others wait for it and reuse them. If
+   that case fails, the cases waiting for it are skipped. Cases without a
+   weight cache build their own weights.
+
+Cases that download all their boundaries in one union request per chunk
+(``union_download_max_gb``) share those union requests the same way, so
+identical small domains download each union chunk once. Cases whose boundary
+conditions are already up to date (see ``fingerprint``) or that preview are
+left out of step 1.
+"""
+
+import functools
+from pathlib import Path
+
+import pandas as pd
+import xarray as xr
+from CrocoDash import logging
+from CrocoDash.extract_forcings import (
+    driver,
+    fingerprint,
+    obc,
+    raw_cache as rc,
+    scheduler,
+    utils,
+)
+from CrocoDash.extract_forcings.manifest import checksum
+from CrocoDash.extract_forcings.weight_cache import fingerprint as weights_key
+from CrocoDash.grid import Grid
+
+logger = logging.setup_logger(__name__)
+
+# Component names, as in crocodash process, and their run_workflow flags
+COMPONENTS = {
+    "ic": "ic",
+    "bc": "bc",
+    "bgcic": "bgcic",
+    "bgcironforcing": "bgcironforcing",
+    "tides": "tides",
+    "chl": "chl_",
+    "runoff": "runoff",
+    "bgcrivernutrients": "bgcrivernutrients",
+}
+
+
+def _case_names(configs: list) -> list:
+    """Name each case after its caseroot, numbering repeated names."""
+    names = [Path(config["caseroot"]).name for config in configs]
+    return [
+        f"{name}#{i}" if names.count(name) > 1 else name for i, name in enumerate(names)
+    ]
+
+
+def _bc_up_to_date(config, state, inputdir) -> bool:
+    spec = driver._component_inputs(
+        "bc", config, state, inputdir, config["conditions"]["outputs"]["end_date"]
+    )
+    store = fingerprint.FingerprintStore(
+        inputdir / "extract_forcings" / fingerprint.FINGERPRINTS_NAME
+    )
+    return store.changed("bc", store.fingerprint(spec)) == [] and all(
+        Path(p).exists() for p in spec.outputs
+    )
+
+
+def _download_requests(config, state, inputdir, raw_cache) -> list:
+    """Return (cache key, _get_chunk arguments) for each OBC raw chunk of a case."""
+    arguments = driver._obc_arguments(config, state, inputdir)
+    variables, extra_args = utils.build_forcing_request(
+        arguments["product_info"], arguments["function_args"]
+    )
+    data_access_fn = utils.get_data_access_function(
+        arguments["product_name"], arguments["function_name"]
+    )
+    manifest = driver._manifest(config, inputdir)
+    raw_dir = Path(arguments["raw_dataset_path"])
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    halo = obc._strip_halo(arguments["product_info"], arguments.get("strip_halo_cells"))
+    boundaries = list(arguments["boundary_number_conversion"])
+    requests = []
+    with xr.open_dataset(arguments["hgrid_path"]) as hgrid:
+        boxes = Grid.get_bounding_boxes(hgrid)
+        start_date = pd.to_datetime(arguments["start_date"]).to_pydatetime()
+        end_date = pd.to_datetime(arguments["end_date"]).to_pydatetime()
+        # The same choice as obc._get_boundaries
+        union = obc._union_box(
+            boxes,
+            boundaries,
+            start_date,
+            end_date,
+            arguments["product_info"],
+            arguments.get("union_max_gb"),
+        )
+        if union is not None:
+            boxes, boundaries, halo = {"union": union}, ["union"], None
+        for boundary in boundaries:
+            strip = None if halo is None else obc._boundary_strip(hgrid, boundary, halo)
+            for request in obc._get_chunk_requests(
+                boundary=boundary,
+                start_date=start_date,
+                end_date=end_date,
+                get_step_days=arguments.get("get_step_days"),
+                latlon=boxes[boundary],
+                output_dir=raw_dir,
+                variables=variables,
+                extra_args=extra_args,
+                strip=strip,
+                raw_cache=raw_cache,
+                manifest=manifest,
+            ):
+                date_part = request["output_filename"].removeprefix(
+                    "union_unprocessed."
+                )
+                if boundary == "union" and all(
+                    utils.existing_artifact(
+                        raw_dir / f"{b}_unprocessed.{date_part}", manifest
+                    )
+                    for b in arguments["boundary_number_conversion"]
+                ):
+                    # Like obc._get_union: only chunks with a boundary missing
+                    continue
+                key = rc.request_key(
+                    utils.describe_raw_request(
+                        data_access_fn,
+                        request["dates"],
+                        request["latlon"],
+                        variables,
+                        extra_args,
+                        strip,
+                    )
+                )
+                requests.append(
+                    (
+                        key,
+                        dict(
+                            product_name=arguments["product_name"],
+                            function_name=arguments["function_name"],
+                            **request,
+                        ),
+                    )
+                )
+    return requests
+
+
+def _weight_group(config, state, inputdir) -> str:
+    """Return the key of the regridding weights a case's boundary conditions
+    need, or None if the case has no weight cache to share them through."""
+    weight_cache = driver._weight_cache(config)
+    if weight_cache is None:
+        return None
+    arguments = driver._obc_arguments(config, state, inputdir)
+    return weights_key(
+        cache_dir=str(weight_cache.cache_dir),
+        grid=checksum(arguments["hgrid_path"]),
+        **{
+            k: arguments.get(k)
+            for k in (
+                "boundary_number_conversion",
+                "product_name",
+                "function_name",
+                "product_info",
+                "strip_halo_cells",
+            )
+        },
+    )
+
+
+def run_workflows(
+    config_paths,
+    components=("ic", "bc"),
+    max_workers: int = 1,
+    memory_budget_gb: float = None,
+    raw_cache: rc.RawCache = None,
+    executor: str = "thread",
+) -> dict:
+    """Run the forcing workflow of several cases on one worker budget.
+
+    Parameters
+    ----------
+    config_paths : list
+        The cases' ``config.json`` files.
+    components : iterable of str
+        Components to run, named as in ``COMPONENTS``. A case runs those its
+        ``config.json`` configures.
+    max_workers : int
+        Worker slots shared by all the cases.
+    memory_budget_gb : float, optional
+        Memory shared by the running cases' ``"auto"`` OBC plans. Defaults
+        to each case's own ``memory_budget_gb``.
+    raw_cache : raw_cache.RawCache, optional
+        Cache the cases share their downloads through. Defaults to the first
+        case's ``raw_cache`` section, or the default cache directory.
+    executor : str
+        Pool type of the shared downloads, ``"thread"`` or ``"process"``.
+
+    Returns each case's ``scheduler.ComponentStatus``, keyed by case name.
+    """
+    unknown = set(components) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(
+            f"Unknown components {sorted(unknown)}. Expected some of {list(COMPONENTS)}."
+        )
+    config_paths = [Path(p) for p in config_paths]
+    cases = [driver._load(p) for p in config_paths]
+    names = _case_names([config for config, _, _ in cases])
+    if raw_cache is None:
+        raw_cache = driver._raw_cache(cases[0][0]) or rc.RawCache()
+
+    selected = {}
+    for name, (config, _, _) in zip(names, cases):
+        selected[name] = [c for c in components if c in {"ic", "bc"} or c in config]
+        for c in sorted(set(components) - set(selected[name])):
+            print(f"[skip] '{c}' requested but not in the config of {name}")
+
+    # 1. Every distinct OBC download once, on the shared pool
+    unique = {}
+    for name, (config, state, inputdir) in zip(names, cases):
+        outputs = config["conditions"]["outputs"]
+        if (
+            "bc" not in selected[name]
+            or outputs.get("preview", False)
+            or _bc_up_to_date(config, state, inputdir)
+        ):
+            continue
+        for key, request in _download_requests(config, state, inputdir, raw_cache):
+            unique.setdefault(key, request)
+    if unique:
+        logger.info(
+            f"Downloading {len(unique)} distinct raw chunks for {len(cases)} cases"
+        )
+        utils.run_tasks(
+            obc._get_chunk,
+            list(unique.values()),
+            max_workers=max_workers,
+            executor=executor,
+        )
+
+    # 2. and 3. Each case as one component, the first of a weight group first
+    builders = {}
+    batch = []
+    for name, config_path, (config, state, inputdir) in zip(names, config_paths, cases):
+        outputs = config["conditions"]["outputs"]
+        inputs, produces = (), ()
+        group = "bc" in selected[name] and _weight_group(config, state, inputdir)
+        if group:
+            group = f"weights:{group}"
+            if group in builders:
+                inputs = (group,)
+            else:
+                builders[group] = name
+                produces = (group,)
+        case_workers = outputs.get("max_workers", 1)
+        case_workers = max_workers if case_workers == "auto" else case_workers
+        case_workers = max(1, min(int(case_workers), max_workers))
+        case_memory = None
+        if memory_budget_gb is not None:
+            case_memory = memory_budget_gb * case_workers / max_workers
+        run = functools.partial(
+            driver.run_workflow,
+            config_path,
+            **{COMPONENTS[c]: True for c in selected[name]},
+            preview=outputs.get("preview", False),
+            max_workers=case_workers,
+            component_workers=1,
+            raw_cache=raw_cache,
+            memory_budget_gb=case_memory,
+        )
+        batch.append(
+            scheduler.Component(name, run, inputs, (name, *produces), case_workers)
+        )
+    return scheduler.run_components(batch, max_workers=max_workers)
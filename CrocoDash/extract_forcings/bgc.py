@@ -4,6 +4,8 @@ import xarray as xr
 import cftime
 import numpy as np
 from netCDF4 import default_fillvals
+from pathlib import Path
+from CrocoDash.extract_forcings.weight_cache import fingerprint
 
 
 def process_bgc_ic(file_path, output_path):
@@ -81,6 +83,7 @@ def process_river_nutrients(
     mapping_file,
     river_nutrients_nnsm_filepath,
     calendar="noleap",
+    weight_cache=None,
 ):
 
     # Open Dataset & Create Regridder
@@ -102,6 +105,18 @@ def process_river_nutrients(
     glofas_grid_t_points["lon"].attrs["units"] = "degrees"
     glofas_grid_t_points["lat"] = global_river_nutrients.lat
     glofas_grid_t_points["lat"].attrs["units"] = "degrees"
+    # Pull the weights from the shared cache if this grid pair was done before
+    key = None
+    if weight_cache is not None and not Path(mapping_file).exists():
+        key = fingerprint(
+            glofas_grid_t_points.lon,
+            glofas_grid_t_points.lat,
+            grid_t_points.lon,
+            grid_t_points.lat,
+            method="bilinear",
+        )
+        if weight_cache.materialize(key, ".nc", mapping_file):
+            key = None
     print("Creating regridder for river nutrients...")
     regridder = xe.Regridder(
         glofas_grid_t_points,
@@ -110,6 +125,8 @@ def process_river_nutrients(
         reuse_weights=True,
         filename=mapping_file,
     )
+    if key is not None:
+        weight_cache.put(key, ".nc", mapping_file)
 
     # Open Dataset & Unit Convert
 
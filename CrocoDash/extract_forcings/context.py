@@ -0,0 +1,96 @@
+"""Grid, topography and masks shared by the components of one workflow run.
+
+Several components need the same case geometry: the initial condition reads
+the hgrid, the vgrid and the bathymetry masks, tides and chlorophyll build a
+``Topo``, and the BGC forcings build a ``Grid``. Each used to load these on
+its own, so a run with every component opened and validated the supergrid
+and rebuilt the topography several times over, which takes minutes on large
+grids. ``run_workflow`` now creates one ``WorkflowContext`` and hands it to
+every component. Each object is loaded the first time a component asks for
+it and then reused; nothing is loaded for components that do not run.
+"""
+
+import threading
+from pathlib import Path
+
+import xarray as xr
+from CrocoDash.grid import Grid
+from CrocoDash.topo import Topo
+
+
+class WorkflowContext:
+    """Lazily loaded case geometry for one run_workflow invocation.
+
+    Attributes are loaded on first access and cached. Access is thread-safe,
+    so components running concurrently share a single load.
+    """
+
+    def __init__(self, supergrid_path, topo_path, vgrid_path):
+        self.supergrid_path = Path(supergrid_path)
+        self.topo_path = Path(topo_path)
+        self.vgrid_path = Path(vgrid_path)
+        self._cache = {}
+        self._lock = threading.RLock()
+
+    def _get(self, name, load):
+        with self._lock:
+            if name not in self._cache:
+                self._cache[name] = load()
+            return self._cache[name]
+
+    @property
+    def hgrid(self) -> xr.Dataset:
+        """The supergrid dataset, read into memory."""
+
+        def load():
+            with xr.open_dataset(self.supergrid_path) as ds:
+                return ds.load()
+
+        return self._get("hgrid", load)
+
+    @property
+    def vgrid(self) -> xr.Dataset:
+        """The vertical grid dataset, read into memory."""
+
+        def load():
+            with xr.open_dataset(self.vgrid_path) as ds:
+                return ds.load()
+
+        return self._get("vgrid", load)
+
+    @property
+    def grid(self) -> Grid:
+        """The horizontal Grid built from the supergrid."""
+        return self._get("grid", lambda: Grid.from_supergrid(str(self.supergrid_path)))
+
+    @property
+    def min_depth(self) -> float:
+        """The minimum depth recorded in the topography file."""
+
+        def load():
+            with xr.open_dataset(self.topo_path, decode_times=False) as ds:
+                return ds.attrs["min_depth"]
+
+        return self._get("min_depth", load)
+
+    @property
+    def topo(self) -> Topo:
+        """The case bathymetry on grid."""
+        return self._get(
+            "topo",
+            lambda: Topo.from_topo_file(
+                self.grid, str(self.topo_path), min_depth=self.min_depth, git=False
+            ),
+        )
+
+    @property
+    def masks(self) -> dict:
+        """The bathymetry's T, U and V ocean masks, keyed "t", "u" and "v"."""
+        return self._get(
+            "masks",
+            lambda: {
+                "t": self.topo.tmask,
+                "u": self.topo.umask,
+                "v": self.topo.vmask,
+            },
+        )
@@ -15,21 +15,34 @@ Typical Python usage::
 
 """
 
+import functools
 import json
-import time
+import os
+import subprocess
+from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
+
 from CrocoDash import case_state
 from CrocoDash.extract_forcings import (
     bgc,
     runoff as rof,
     tides as tides_mod,
     chlorophyll as chl,
+    estimate,
+    fingerprint,
     obc,
     initial_condition,
+    raw_cache as rc,
+    report,
+    scheduler,
+    utils,
+    weight_cache as wc,
 )
-from CrocoDash.grid import Grid
-from CrocoDash.topo import Topo
+from CrocoDash.extract_forcings.context import WorkflowContext
+from CrocoDash.extract_forcings.manifest import MANIFEST_NAME, RunManifest
+from CrocoDash.extract_forcings.scheduler import Component
 
 
 def _load(config_path):
@@ -42,6 +55,317 @@ def _load(config_path):
     return config, state, inputdir
 
 
+def _weight_cache(config):
+    """Build the shared regridding-weight cache from the optional
+    ``weight_cache`` section of config.json, or None if the section is absent
+    or disabled."""
+    settings = config.get("weight_cache")
+    if not settings or not settings.get("enabled", True):
+        return None
+    return wc.WeightCache(
+        settings.get("dir"),
+        max_bytes=int(settings.get("max_gb", wc.DEFAULT_MAX_BYTES / 1024**3) * 1024**3),
+    )
+
+
+def _raw_cache(config):
+    """Build the shared raw-data cache from the optional ``raw_cache``
+    section of config.json, or None if the section is absent or disabled."""
+    settings = config.get("raw_cache")
+    if not settings or not settings.get("enabled", True):
+        return None
+    return rc.RawCache(
+        settings.get("dir"),
+        max_bytes=int(settings.get("max_gb", rc.DEFAULT_MAX_BYTES / 1024**3) * 1024**3),
+        link=settings.get("link", "hardlink"),
+    )
+
+
+def _manifest(config, inputdir):
+    """Open the case's run manifest, recording checksums if
+    ``manifest_checksums`` is set in config.json."""
+    return RunManifest(
+        Path(inputdir) / "extract_forcings" / MANIFEST_NAME,
+        checksums=config.get("conditions", {})
+        .get("outputs", {})
+        .get("manifest_checksums", False),
+    )
+
+
+def _obc_arguments(config, state, inputdir, end_date=None) -> dict:
+    """Return the process_obc_conditions arguments that config.json and the
+    case state determine. end_date overrides the configured one."""
+    conditions = config["conditions"]
+    outputs = conditions["outputs"]
+    extract_forcings_dir = inputdir / "extract_forcings"
+    step = outputs["step"]
+    return dict(
+        start_date=outputs["start_date"],
+        end_date=end_date or outputs["end_date"],
+        boundary_number_conversion=outputs["boundary_number_conversion"],
+        product_name=conditions["inputs"]["product_name"].upper(),
+        function_name=conditions["inputs"]["function_name"],
+        product_info=outputs["information"],
+        function_args=outputs.get("function_args", {}),
+        hgrid_path=state["supergrid_path"],
+        raw_dataset_path=extract_forcings_dir / "raw_data",
+        regridded_dataset_path=extract_forcings_dir / "regridded_data",
+        output_path=inputdir / "ocnice",
+        get_step_days=outputs.get("get_step_days"),
+        regrid_step_days=step if step == "auto" else int(step),
+        union_max_gb=outputs.get("union_download_max_gb"),
+        strip_halo_cells=outputs.get("strip_halo_cells"),
+        memory_budget_gb=outputs.get("memory_budget_gb"),
+    )
+
+
+def _update_config(config_path, update):
+    """Apply update(config) to config.json.
+
+    config.json is re-read and replaced atomically, so nothing else in it is
+    lost and a crash mid-write never leaves it truncated.
+    """
+    config_path = Path(config_path)
+    with open(config_path) as f:
+        config = json.load(f)
+    update(config)
+    tmp_path = config_path.with_name(f".{config_path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(config, f, indent=4)
+    os.replace(tmp_path, config_path)
+
+
+def _record_regrid_plan(config_path, plan):
+    """Store the chosen REGRID plan under conditions.outputs.regrid_plan."""
+
+    def update(config):
+        config["conditions"]["outputs"]["regrid_plan"] = plan
+
+    _update_config(config_path, update)
+
+
+def _record_end_date(config_path, end_date):
+    """Store an extended forcing end date in the conditions inputs and outputs."""
+
+    def update(config):
+        for section in ("inputs", "outputs"):
+            if "end_date" in config["conditions"].get(section, {}):
+                config["conditions"][section]["end_date"] = end_date
+
+    _update_config(config_path, update)
+
+
+def _update_stop_n(caseroot, days, is_non_local=False):
+    """Set the case's STOP_N to the forcing length, as configure_forcings does.
+
+    Runs the case's xmlchange the way visualCaseGen's xmlchange helper does;
+    the helper itself needs a visualCaseGen session, which a command-line run
+    does not have. Raises RuntimeError if the case has no xmlchange or the
+    change is rejected.
+    """
+    cmd = ["./xmlchange", f"STOP_N={days}"]
+    if is_non_local:
+        cmd.append("--non-local")
+    if not (Path(caseroot) / "xmlchange").exists():
+        raise RuntimeError(
+            f"No xmlchange in {caseroot}: run '{' '.join(cmd)}' in the case."
+        )
+    runout = subprocess.run(cmd, cwd=caseroot, capture_output=True, text=True)
+    if runout.returncode != 0:
+        raise RuntimeError(
+            f"Error running {' '.join(cmd)} in {caseroot}:\n"
+            f"{runout.stderr or runout.stdout}"
+        )
+
+
+def _raw_request(product_name, function_name, product_info, function_args, dates=()):
+    """Describe a component's raw downloads as the raw-data cache keys them
+    (see utils.describe_raw_request), without their boxes: those come from
+    the grid, which the fingerprint hashes as a request input."""
+    variables, extra_args = utils.build_forcing_request(product_info, function_args)
+    return utils.describe_raw_request(
+        utils.get_data_access_function(product_name, function_name),
+        dates,
+        None,
+        variables,
+        extra_args,
+    )
+
+
+def _component_inputs(name, config, state, inputdir, end_date):
+    """Return the fingerprint.ComponentInputs of component name."""
+    output_path = inputdir / "ocnice"
+    grids = [state["supergrid_path"], state["vgrid_path"], state["topo_path"]]
+    if name == "bc":
+        arguments = _obc_arguments(config, state, inputdir, end_date)
+        segments = arguments["boundary_number_conversion"]
+        regridded = Path(arguments["regridded_dataset_path"])
+        raw = Path(arguments["raw_dataset_path"])
+        return fingerprint.ComponentInputs(
+            settings={
+                k: arguments.get(k)
+                for k in (
+                    "boundary_number_conversion",
+                    "product_name",
+                    "function_name",
+                    "product_info",
+                    "strip_halo_cells",
+                )
+            }
+            | dict(function_args=utils.content_args(arguments.get("function_args"))),
+            inputs=[arguments["hgrid_path"]],
+            outputs=[
+                output_path / f"forcing_obc_segment_{n:03d}.nc"
+                for n in segments.values()
+            ],
+            intermediates=[
+                *regridded.glob("forcing_obc_segment_*.nc"),
+                *regridded.glob("weights/segment_*"),
+            ],
+            # Raw and regridded files are dated, so new dates only add files
+            coverage=dict(start_date=arguments["start_date"], end_date=end_date),
+            request=dict(
+                raw=_raw_request(
+                    arguments["product_name"],
+                    arguments["function_name"],
+                    arguments["product_info"],
+                    arguments["function_args"],
+                ),
+                boundaries=sorted(segments),
+                strip_halo_cells=arguments.get("strip_halo_cells"),
+            ),
+            request_inputs=[arguments["hgrid_path"]],
+            downloads=[
+                p
+                for b in [*segments, "union"]
+                for p in raw.glob(f"{b}_unprocessed.*.nc")
+            ],
+        )
+    if name == "ic":
+        conditions = config["conditions"]
+        in_place = conditions["outputs"].get("ic_fill_in_place", False)
+        suffixes = [""] if in_place else ["", "_filled"]
+        return fingerprint.ComponentInputs(
+            settings=dict(
+                product_name=conditions["inputs"]["product_name"].upper(),
+                function_name=conditions["inputs"]["function_name"],
+                information=conditions["outputs"]["information"],
+                function_args=utils.content_args(
+                    conditions["outputs"].get("function_args")
+                ),
+                start_date=conditions["outputs"]["start_date"],
+                ic_fill_in_place=in_place,
+            ),
+            inputs=grids,
+            outputs=[
+                output_path / f"init_{n}{suffix}.nc"
+                for n in initial_condition._IC_FILES
+                for suffix in suffixes
+            ],
+            request=_raw_request(
+                conditions["inputs"]["product_name"].upper(),
+                conditions["inputs"]["function_name"],
+                conditions["outputs"]["information"],
+                conditions["outputs"].get("function_args"),
+                dates=[conditions["outputs"]["start_date"]],
+            ),
+            request_inputs=[state["supergrid_path"]],
+            downloads=[
+                inputdir / "extract_forcings" / "raw_data" / "ic_unprocessed.nc"
+            ],
+        )
+    section = config[name]
+    if name == "bgcic":
+        return fingerprint.ComponentInputs(
+            settings=section,
+            inputs=[section["inputs"]["marbl_ic_filepath"]],
+            outputs=[output_path / section["outputs"]["MARBL_TRACERS_IC_FILE"]],
+        )
+    if name == "bgcironforcing":
+        return fingerprint.ComponentInputs(
+            settings=section,
+            inputs=[state["supergrid_path"]],
+            outputs=[
+                output_path / section["outputs"][k]
+                for k in (
+                    "MARBL_FESEDFLUX_FILE",
+                    "MARBL_FEVENTFLUX_FILE",
+                    "MARBL_FESEDFLUXRED_FILE",
+                )
+            ],
+        )
+    if name == "tides":
+        return fingerprint.ComponentInputs(
+            settings=section["inputs"],
+            inputs=[
+                section["inputs"]["tpxo_elevation_filepath"],
+                section["inputs"]["tpxo_velocity_filepath"],
+                *grids,
+            ],
+            outputs=sorted(
+                [
+                    *output_path.glob("tz_segment_*.nc"),
+                    *output_path.glob("tu_segment_*.nc"),
+                ]
+            ),
+        )
+    if name == "chl":
+        return fingerprint.ComponentInputs(
+            settings=section,
+            inputs=[section["inputs"]["chl_processed_filepath"], *grids],
+            outputs=[output_path / section["outputs"]["CHL_FILE"]],
+        )
+    if name == "runoff":
+        prefix = (
+            f"{section['inputs']['rof_grid_name']}_to_"
+            f"{section['inputs']['case_grid_name']}_map"
+        )
+        return fingerprint.ComponentInputs(
+            settings=section["inputs"],
+            inputs=[
+                section["inputs"]["rof_esmf_mesh_filepath"],
+                section["inputs"]["case_esmf_mesh_path"],
+            ],
+            outputs=sorted((inputdir / "mapping").glob(f"{prefix}*")),
+        )
+    if name == "bgcrivernutrients":
+        mapping_file = config["runoff"]["outputs"]["ROF2OCN_LIQ_RMAPNAME"]
+        return fingerprint.ComponentInputs(
+            settings=dict(section, mapping_file=mapping_file),
+            inputs=[
+                section["inputs"]["global_river_nutrients_filepath"],
+                mapping_file,
+                state["supergrid_path"],
+            ],
+            outputs=[output_path / section["outputs"]["RIV_FLUX_FILE"]],
+        )
+    raise ValueError(f"Unknown component '{name}'.")
+
+
+def _run_fingerprinted(name, run, component_inputs, store, manifest):
+    """Run component name unless its fingerprint is unchanged (see fingerprint).
+
+    component_inputs is called when the component starts, after the
+    components it depends on have written their outputs.
+    """
+    spec = component_inputs()
+    current = store.fingerprint(spec)
+    changed = store.changed(name, current)
+    if changed == [] and spec.outputs and all(Path(p).exists() for p in spec.outputs):
+        print(f"[skip] '{name}' is up to date")
+        report.annotate(up_to_date=True)
+        return
+    stale = [part for part in changed or [] if part in fingerprint.CONTENT_PARTS]
+    if stale:
+        deleted = fingerprint.invalidate(spec, manifest, downloads="request" in stale)
+        print(
+            f"[rebuild] '{name}': {', '.join(stale)} changed, "
+            f"removed {len(deleted)} stale file(s)"
+        )
+    run()
+    store.record(name, current)
+
+
 def run_workflow(
     config_path,
     ic=False,
@@ -53,6 +377,12 @@ def run_workflow(
     runoff=False,
     bgcrivernutrients=False,
     preview=False,
+    max_workers=None,
+    pipeline=None,
+    extend_to=None,
+    component_workers=None,
+    raw_cache=None,
+    memory_budget_gb=None,
 ):
     """
     Execute the forcing extraction workflow.
@@ -78,7 +408,33 @@ def run_workflow(
     bgcrivernutrients : bool
         Run BGC river nutrients (always runs after runoff).
     preview : bool
-        Preview task graph without executing.
+        Preview task graph without executing, and print the estimated
+        download size, memory and time of each OBC and initial-condition
+        task (see ``estimate``).
+    max_workers : int, optional
+        Worker pool size for forcing extraction. Defaults to ``max_workers``
+        in ``config.json`` (1 if absent), which may be ``"auto"``.
+    pipeline : bool, optional
+        Overlap the OBC download, regrid and merge phases. Defaults to
+        ``pipeline`` in ``config.json`` (False if absent).
+    extend_to : str or datetime, optional
+        Extend the boundary conditions to this end date: only the dates
+        after the current ``end_date`` are downloaded and regridded, and
+        they are appended to the existing segment files. On success
+        ``end_date`` in ``config.json`` and the case's ``STOP_N`` are
+        updated. Requires ``bc``.
+    component_workers : int or "auto", optional
+        Worker slots shared by components running at the same time. The
+        OBC and initial-condition steps each claim ``max_workers`` slots,
+        every other component one. Defaults to ``component_workers`` in
+        ``config.json`` (1 if absent), which runs the components one at a
+        time in the order above.
+    raw_cache : raw_cache.RawCache, optional
+        Raw-data cache to use instead of the ``raw_cache`` section of
+        ``config.json``, e.g. one shared by the cases of ``run_workflows``.
+    memory_budget_gb : float, optional
+        Memory the ``"auto"`` OBC plan may use. Defaults to
+        ``memory_budget_gb`` in ``config.json``.
     """
     config_path = Path(config_path)
     config, state, inputdir = _load(config_path)
@@ -89,13 +445,43 @@ def run_workflow(
     topo_path = state["topo_path"]
     extract_forcings_dir = inputdir / "extract_forcings"
     raw_data_dir = extract_forcings_dir / "raw_data"
-    regridded_data_dir = extract_forcings_dir / "regridded_data"
     output_path = inputdir / "ocnice"
+    if max_workers is None:
+        max_workers = conditions["outputs"].get("max_workers", 1)
+    executor = conditions["outputs"].get("executor", "thread")
+    if pipeline is None:
+        pipeline = conditions["outputs"].get("pipeline", False)
+    weight_cache = _weight_cache(config)
+    if raw_cache is None:
+        raw_cache = _raw_cache(config)
+    manifest = _manifest(config, inputdir)
+    # Grid, topography and masks, loaded once for every component that needs them
+    context = WorkflowContext(supergrid_path, topo_path, vgrid_path)
+    # Preview estimates of bc and ic, and the past runs that time them
+    previews = {}
+    cost_model = None
+    if preview:
+        cost_model = estimate.CostModel.from_reports(
+            extract_forcings_dir / report.REPORTS_DIR
+        )
 
     if not any([ic, bc, bgcic, bgcironforcing, tides, chl_, runoff, bgcrivernutrients]):
         print("No components selected.")
         return
 
+    date_format = conditions["outputs"].get("date_format", "%Y%m%d")
+    end_date = conditions["outputs"]["end_date"]
+    if extend_to is not None:
+        if not bc:
+            raise ValueError("extend_to extends the boundary conditions: set bc.")
+        current_end = datetime.strptime(end_date, date_format)
+        if pd.to_datetime(extend_to) <= current_end:
+            raise ValueError(
+                f"extend_to ({extend_to}) must be after the current end date "
+                f"({current_end:%Y-%m-%d})."
+            )
+        end_date = pd.to_datetime(extend_to).strftime(date_format)
+
     if bgcrivernutrients and not runoff:
         print(
             "[info] 'bgcrivernutrients' requires the runoff-to-ocean mapping file "
@@ -103,159 +489,217 @@ def run_workflow(
         )
         runoff = True
 
-    timings = {}
-    try:
-        if bc:
-            _t = time.perf_counter()
-            obc.process_obc_conditions(
-                start_date=conditions["outputs"]["start_date"],
-                end_date=conditions["outputs"]["end_date"],
-                boundary_number_conversion=conditions["outputs"][
-                    "boundary_number_conversion"
-                ],
-                product_name=conditions["inputs"]["product_name"].upper(),
-                function_name=conditions["inputs"]["function_name"],
-                product_info=conditions["outputs"]["information"],
-                function_args=conditions["outputs"].get("function_args", {}),
-                hgrid_path=supergrid_path,
-                raw_dataset_path=raw_data_dir,
-                regridded_dataset_path=regridded_data_dir,
-                output_path=output_path,
-                regrid_step_days=int(conditions["outputs"]["step"]),
-                preview=preview,
-            )
-            timings["bc"] = time.perf_counter() - _t
-
-        if ic:
-            _t = time.perf_counter()
-            initial_condition.process_initial_condition(
-                product_name=conditions["inputs"]["product_name"].upper(),
-                function_name=conditions["inputs"]["function_name"],
-                product_information=conditions["outputs"]["information"],
-                start_date=conditions["outputs"]["start_date"],
-                hgrid_path=supergrid_path,
-                vgrid_path=vgrid_path,
-                dataset_varnames=conditions["outputs"]["information"],
-                raw_data_dir=raw_data_dir,
-                output_data_dir=output_path,
-                bathymetry_path=topo_path,
-                preview=preview,
-                function_args=conditions["outputs"].get("function_args", {}),
-            )
-            timings["ic"] = time.perf_counter() - _t
-
-        if bgcic:
-            _t = time.perf_counter()
-            bgc.process_bgc_ic(
-                file_path=config["bgcic"]["inputs"]["marbl_ic_filepath"],
-                output_path=output_path
-                / config["bgcic"]["outputs"]["MARBL_TRACERS_IC_FILE"],
+    def _bc():
+        step = conditions["outputs"]["step"]
+        arguments = _obc_arguments(config, state, inputdir, end_date)
+        if memory_budget_gb is not None:
+            arguments["memory_budget_gb"] = memory_budget_gb
+        regrid_plan = obc.process_obc_conditions(
+            **arguments,
+            preview=preview,
+            max_workers=max_workers,
+            executor=executor,
+            weight_cache=weight_cache,
+            pipeline=pipeline,
+            raw_cache=raw_cache,
+            manifest=manifest,
+            extend=extend_to is not None,
+            cost_model=cost_model,
+        )
+        if preview and regrid_plan:
+            previews["bc"] = regrid_plan["estimate"]
+        if "auto" in (step, max_workers) and not preview and regrid_plan:
+            _record_regrid_plan(config_path, regrid_plan)
+        if extend_to is not None and not preview:
+            _record_end_date(config_path, end_date)
+            start_date = datetime.strptime(
+                conditions["outputs"]["start_date"], date_format
             )
-            timings["bgcic"] = time.perf_counter() - _t
-
-        if bgcironforcing:
-            _t = time.perf_counter()
-            grid = Grid.from_supergrid(supergrid_path)
-            bgc.process_bgc_iron_forcing(
-                nx=grid.nx,
-                ny=grid.ny,
-                MARBL_FESEDFLUX_FILE=config["bgcironforcing"]["outputs"][
-                    "MARBL_FESEDFLUX_FILE"
-                ],
-                MARBL_FEVENTFLUX_FILE=config["bgcironforcing"]["outputs"][
-                    "MARBL_FEVENTFLUX_FILE"
-                ],
-                MARBL_FESEDFLUXRED_FILE=config["bgcironforcing"]["outputs"][
-                    "MARBL_FESEDFLUXRED_FILE"
-                ],
-                inputdir=inputdir,
+            _update_stop_n(
+                config["caseroot"],
+                (datetime.strptime(end_date, date_format) - start_date).days,
+                is_non_local=conditions["inputs"].get("case_is_non_local", False),
             )
-            timings["bgcironforcing"] = time.perf_counter() - _t
 
-        if tides:
-            _t = time.perf_counter()
-            import xarray as xr
+    def _ic():
+        ic_preview = initial_condition.process_initial_condition(
+            product_name=conditions["inputs"]["product_name"].upper(),
+            function_name=conditions["inputs"]["function_name"],
+            product_information=conditions["outputs"]["information"],
+            start_date=conditions["outputs"]["start_date"],
+            hgrid_path=supergrid_path,
+            vgrid_path=vgrid_path,
+            dataset_varnames=conditions["outputs"]["information"],
+            raw_data_dir=raw_data_dir,
+            output_data_dir=output_path,
+            bathymetry_path=topo_path,
+            preview=preview,
+            function_args=conditions["outputs"].get("function_args", {}),
+            raw_cache=raw_cache,
+            manifest=manifest,
+            max_workers=max_workers,
+            fill_in_place=conditions["outputs"].get("ic_fill_in_place", False),
+            fill_tile_levels=conditions["outputs"].get("ic_fill_tile_levels"),
+            context=context,
+            cost_model=cost_model,
+        )
+        if preview:
+            previews["ic"] = ic_preview["estimate"]
+
+    def _bgcic():
+        bgc.process_bgc_ic(
+            file_path=config["bgcic"]["inputs"]["marbl_ic_filepath"],
+            output_path=output_path
+            / config["bgcic"]["outputs"]["MARBL_TRACERS_IC_FILE"],
+        )
 
-            topo_ds = xr.open_dataset(topo_path, decode_times=False)
-            grid = Grid.from_supergrid(supergrid_path)
-            ocn_topo = Topo.from_topo_file(
-                grid, topo_path, min_depth=topo_ds.attrs["min_depth"], git=False
-            )
-            tides_mod.process_tides(
-                ocn_topo=ocn_topo,
-                inputdir=inputdir,
-                supergrid_path=supergrid_path,
-                vgrid_path=vgrid_path,
-                tidal_constituents=config["tides"]["inputs"]["tidal_constituents"],
-                boundaries=config["tides"]["inputs"]["boundaries"],
-                tpxo_elevation_filepath=config["tides"]["inputs"][
-                    "tpxo_elevation_filepath"
-                ],
-                tpxo_velocity_filepath=config["tides"]["inputs"][
-                    "tpxo_velocity_filepath"
-                ],
-            )
-            timings["tides"] = time.perf_counter() - _t
+    def _bgcironforcing():
+        bgc.process_bgc_iron_forcing(
+            nx=context.grid.nx,
+            ny=context.grid.ny,
+            MARBL_FESEDFLUX_FILE=config["bgcironforcing"]["outputs"][
+                "MARBL_FESEDFLUX_FILE"
+            ],
+            MARBL_FEVENTFLUX_FILE=config["bgcironforcing"]["outputs"][
+                "MARBL_FEVENTFLUX_FILE"
+            ],
+            MARBL_FESEDFLUXRED_FILE=config["bgcironforcing"]["outputs"][
+                "MARBL_FESEDFLUXRED_FILE"
+            ],
+            inputdir=inputdir,
+        )
 
-        if chl_:
-            _t = time.perf_counter()
-            import xarray as xr
+    def _tides():
+        tides_mod.process_tides(
+            ocn_topo=context.topo,
+            inputdir=inputdir,
+            supergrid_path=supergrid_path,
+            vgrid_path=vgrid_path,
+            tidal_constituents=config["tides"]["inputs"]["tidal_constituents"],
+            boundaries=config["tides"]["inputs"]["boundaries"],
+            tpxo_elevation_filepath=config["tides"]["inputs"][
+                "tpxo_elevation_filepath"
+            ],
+            tpxo_velocity_filepath=config["tides"]["inputs"]["tpxo_velocity_filepath"],
+        )
 
-            topo_ds = xr.open_dataset(topo_path, decode_times=False)
-            grid = Grid.from_supergrid(supergrid_path)
-            ocn_topo = Topo.from_topo_file(
-                grid, topo_path, min_depth=topo_ds.attrs["min_depth"], git=False
-            )
-            chl.process_chl(
-                ocn_grid=grid,
-                ocn_topo=ocn_topo,
-                inputdir=inputdir,
-                chl_processed_filepath=config["chl"]["inputs"][
-                    "chl_processed_filepath"
-                ],
-                output_filepath=config["chl"]["outputs"]["CHL_FILE"],
-                calendar=config["chl"]["inputs"].get("cf_calendar") or "NOLEAP",
-            )
-            timings["chl"] = time.perf_counter() - _t
-
-        if runoff:
-            _t = time.perf_counter()
-            rof.generate_rof_ocn_map(
-                rof_grid_name=config["runoff"]["inputs"]["rof_grid_name"],
-                rof_esmf_mesh_filepath=config["runoff"]["inputs"][
-                    "rof_esmf_mesh_filepath"
-                ],
-                ocn_mesh_filepath=config["runoff"]["inputs"]["case_esmf_mesh_path"],
-                inputdir=inputdir,
-                grid_name=config["runoff"]["inputs"]["case_grid_name"],
-                rmax=config["runoff"]["inputs"]["rmax"],
-                fold=config["runoff"]["inputs"]["fold"],
-            )
-            timings["runoff"] = time.perf_counter() - _t
-
-        if bgcrivernutrients:
-            _t = time.perf_counter()
-            grid = Grid.from_supergrid(supergrid_path)
-            bgc.process_river_nutrients(
-                ocn_grid=grid,
-                global_river_nutrients_filepath=config["bgcrivernutrients"]["inputs"][
-                    "global_river_nutrients_filepath"
-                ],
-                mapping_file=config["runoff"]["outputs"]["ROF2OCN_LIQ_RMAPNAME"],
-                river_nutrients_nnsm_filepath=output_path
-                / config["bgcrivernutrients"]["outputs"]["RIV_FLUX_FILE"],
-                calendar=config["bgcrivernutrients"]["inputs"].get("cf_calendar")
-                or "noleap",
-            )
-            timings["bgcrivernutrients"] = time.perf_counter() - _t
+    def _chl_():
+        chl.process_chl(
+            ocn_grid=context.grid,
+            ocn_topo=context.topo,
+            inputdir=inputdir,
+            chl_processed_filepath=config["chl"]["inputs"]["chl_processed_filepath"],
+            output_filepath=config["chl"]["outputs"]["CHL_FILE"],
+            calendar=config["chl"]["inputs"].get("cf_calendar") or "NOLEAP",
+        )
+
+    def _runoff():
+        rof.generate_rof_ocn_map(
+            rof_grid_name=config["runoff"]["inputs"]["rof_grid_name"],
+            rof_esmf_mesh_filepath=config["runoff"]["inputs"]["rof_esmf_mesh_filepath"],
+            ocn_mesh_filepath=config["runoff"]["inputs"]["case_esmf_mesh_path"],
+            inputdir=inputdir,
+            grid_name=config["runoff"]["inputs"]["case_grid_name"],
+            rmax=config["runoff"]["inputs"]["rmax"],
+            fold=config["runoff"]["inputs"]["fold"],
+        )
 
-    finally:
-        pass
+    def _bgcrivernutrients():
+        bgc.process_river_nutrients(
+            ocn_grid=context.grid,
+            global_river_nutrients_filepath=config["bgcrivernutrients"]["inputs"][
+                "global_river_nutrients_filepath"
+            ],
+            mapping_file=config["runoff"]["outputs"]["ROF2OCN_LIQ_RMAPNAME"],
+            river_nutrients_nnsm_filepath=output_path
+            / config["bgcrivernutrients"]["outputs"]["RIV_FLUX_FILE"],
+            calendar=config["bgcrivernutrients"]["inputs"].get("cf_calendar")
+            or "noleap",
+            weight_cache=weight_cache,
+        )
+
+    # The OBC and initial-condition pools count against the component budget
+    pool_workers = (os.cpu_count() or 1) if max_workers == "auto" else max_workers
+    selected = {
+        "bc": bc,
+        "ic": ic,
+        "bgcic": bgcic,
+        "bgcironforcing": bgcironforcing,
+        "tides": tides,
+        "chl": chl_,
+        "runoff": runoff,
+        "bgcrivernutrients": bgcrivernutrients,
+    }
+    # Skip up-to-date components and rebuild the invalidated ones
+    fingerprints = fingerprint.FingerprintStore(
+        extract_forcings_dir / fingerprint.FINGERPRINTS_NAME
+    )
+
+    def fingerprinted(name, run):
+        if preview:
+            return run
+        return functools.partial(
+            _run_fingerprinted,
+            name,
+            run,
+            functools.partial(
+                _component_inputs, name, config, state, inputdir, end_date
+            ),
+            fingerprints,
+            manifest,
+        )
 
+    components = [
+        Component(name, fingerprinted(name, run), inputs, outputs, workers)
+        for name, run, inputs, outputs, workers in [
+            ("bc", _bc, (), ("obc_segments",), pool_workers),
+            ("ic", _ic, (), ("initial_condition",), pool_workers),
+            ("bgcic", _bgcic, (), ("bgc_initial_condition",), 1),
+            ("bgcironforcing", _bgcironforcing, (), ("iron_forcing",), 1),
+            ("tides", _tides, (), ("tidal_segments",), 1),
+            ("chl", _chl_, (), ("chlorophyll",), 1),
+            ("runoff", _runoff, (), ("runoff_mapping",), 1),
+            (
+                "bgcrivernutrients",
+                _bgcrivernutrients,
+                ("runoff_mapping",),
+                ("river_nutrients",),
+                1,
+            ),
+        ]
+        if selected[name]
+    ]
+    if component_workers is None:
+        component_workers = conditions["outputs"].get("component_workers", 1)
+    if component_workers == "auto":
+        component_workers = os.cpu_count() or 1
+    run_report = report.RunReport(config=str(config_path))
+    with run_report.record():
+        status = scheduler.run_components(components, max_workers=component_workers)
+    print(scheduler.format_status_table(status))
+    for name, s in status.items():
+        run_report.root.child(name, status=s.status)
+    if not preview:
+        report_path = run_report.write(extract_forcings_dir / report.REPORTS_DIR)
+        print(f"[report] {report_path} (view with 'crocodash report')")
+    else:
+        estimates = {
+            name: previews.get(name, cost_model.components.get(name))
+            for name, s in status.items()
+            if s.status == "done"
+        }
+        print(estimate.format_estimate(estimates, cost_model))
+        quota_gb = conditions["outputs"].get("download_quota_gb")
+        if quota_gb is not None:
+            for problem in estimate.over_quota(estimates, int(quota_gb * 1024**3)):
+                print(f"[warning] {problem}")
+
+    timings = {name: s.seconds for name, s in status.items() if s.status == "done"}
     if timings:
         parts = [f"{k}: {v:.1f}s" for k, v in timings.items()]
         parts.append(f"total: {sum(timings.values()):.1f}s")
         print("[timing] " + "  ".join(parts))
+    scheduler.raise_first_failure(status)
 
     return timings
 
@@ -0,0 +1,410 @@
+"""Cost estimates of OBC and initial-condition processing, for preview mode.
+
+``process_obc_conditions(preview=True)`` and
+``process_initial_condition(preview=True)`` return an ``estimate`` next to
+their date pairs. It lists what each GET chunk, REGRID slice and MERGE will
+cost, so a queue and a memory request can be sized before anything runs.
+
+Sizes come from the product information and the case grid:
+
+- download bytes are the cells of each lat/lon box at the product's
+  ``grid_resolution``, times the variables (``vertical_levels`` each for 3-D
+  ones), the time steps (``time_steps_per_day``) and 4 bytes a value. A
+  product that does not give these is assumed to look like GLORYS, and the
+  estimate lists what it assumed;
+- regrid cells are the model cells along a segment, times the same levels,
+  variables and time steps;
+- working-set memory is a slice's raw bytes times
+  ``planner.REGRID_MEMORY_FACTOR``, as in the auto REGRID plan.
+
+Wall times come from a ``CostModel`` fitted to the run reports of earlier
+runs (see report). Every GET, REGRID, MERGE and FILL span of a run records
+the work it did in its ``work_phase`` and ``work`` attrs: square degrees ×
+days × variables for GET, segment points × days for REGRID and MERGE, model
+cells × levels for the initial condition. The model fits seconds = overhead
++ rate × work to each phase by least squares, so it follows the machine and
+provider the case actually runs on. A phase no report has measured yet gets
+no time.
+"""
+
+import math
+from pathlib import Path
+
+import numpy as np
+import xarray as xr
+from CrocoDash.extract_forcings import planner, report, utils
+
+BYTES_PER_VALUE = 4
+# Assumed when the product information does not give them (GLORYS values)
+DEFAULT_GRID_RESOLUTION = 1 / 12
+DEFAULT_VERTICAL_LEVELS = 50
+DEFAULT_TIME_STEPS_PER_DAY = 1
+# Reports, newest first, the cost model is fitted to
+CALIBRATION_REPORTS = 20
+
+_SEGMENT_LINES = {"north": "nxp", "south": "nxp", "east": "nyp", "west": "nyp"}
+
+
+def product_sizes(product_info: dict) -> dict:
+    """Return the product's resolution, levels and steps per day.
+
+    "assumed" lists the ones taken from the DEFAULT_* values.
+    """
+    sizes, assumed = {}, []
+    for key, default in (
+        ("grid_resolution", DEFAULT_GRID_RESOLUTION),
+        ("vertical_levels", DEFAULT_VERTICAL_LEVELS),
+        ("time_steps_per_day", DEFAULT_TIME_STEPS_PER_DAY),
+    ):
+        if product_info.get(key) is None:
+            assumed.append(key)
+        sizes[key] = product_info.get(key) or default
+    sizes["assumed"] = assumed
+    return sizes
+
+
+def data_variables(product_info: dict) -> tuple:
+    """Return the (3-D, 2-D) variables a forcing request downloads."""
+    variables, _ = utils.build_forcing_request(product_info)
+    surface = [product_info["eta_var_name"]]
+    return [v for v in variables if v not in surface], surface
+
+
+def _values_per_cell(product_info: dict) -> int:
+    """Values per horizontal cell and time step: levels of each 3-D variable, one of each 2-D."""
+    three_d, two_d = data_variables(product_info)
+    return len(three_d) * product_sizes(product_info)["vertical_levels"] + len(two_d)
+
+
+def box_cells(latlon: dict, resolution: float, pad: float = utils.RAW_LATLON_PAD):
+    """Return the source grid cells in latlon grown by pad degrees."""
+    ny = (latlon["lat_max"] - latlon["lat_min"] + 2 * pad) / resolution + 1
+    nx = (latlon["lon_max"] - latlon["lon_min"] + 2 * pad) / resolution + 1
+    return math.ceil(max(ny, 1)) * math.ceil(max(nx, 1))
+
+
+def download_bytes(
+    boxes: list, days: int, product_info: dict, pad: float = utils.RAW_LATLON_PAD
+) -> int:
+    """Return the bytes a request for boxes over days downloads, uncompressed."""
+    sizes = product_sizes(product_info)
+    cells = sum(box_cells(b, sizes["grid_resolution"], pad) for b in boxes)
+    steps = days * sizes["time_steps_per_day"]
+    return int(cells * _values_per_cell(product_info) * steps * BYTES_PER_VALUE)
+
+
+def get_work(boxes: list, days: int, n_variables: int, pad=utils.RAW_LATLON_PAD):
+    """Work of a GET request: square degrees × days × variables."""
+    return sum(utils.latlon_area(b, pad) for b in boxes) * days * n_variables
+
+
+def segment_points(hgrid: xr.Dataset, boundary: str) -> int:
+    """Return the model cells along a boundary segment."""
+    return hgrid.sizes[_SEGMENT_LINES[boundary]] // 2
+
+
+def segment_work(hgrid: xr.Dataset, boundary: str, days: int) -> float:
+    """Work of a REGRID slice or MERGE: segment points × days."""
+    return float(segment_points(hgrid, boundary) * days)
+
+
+def ic_work(hgrid: xr.Dataset, vgrid: xr.Dataset) -> float:
+    """Work of the initial-condition REGRID and FILL: model cells × levels."""
+    return float(_model_cells(hgrid) * vgrid["dz"].size)
+
+
+def _model_cells(hgrid: xr.Dataset) -> int:
+    return (hgrid.sizes["nx"] // 2) * (hgrid.sizes["ny"] // 2)
+
+
+def _fit(samples: list) -> tuple:
+    """Return (overhead, rate) of seconds = overhead + rate × work, both >= 0."""
+    work = np.array([w for w, _ in samples], dtype=float)
+    seconds = np.array([s for _, s in samples], dtype=float)
+    if len(np.unique(work)) > 1:
+        rate, overhead = np.polyfit(work, seconds, 1)
+        if rate >= 0 and overhead >= 0:
+            return float(overhead), float(rate)
+    if work.any():
+        return 0.0, float(work @ seconds / (work @ work))
+    return float(seconds.mean()), 0.0
+
+
+class CostModel:
+    """Expected seconds per phase, fitted to the spans of past run reports.
+
+    fits maps a work_phase to (overhead, rate); components maps a component
+    name to its mean wall time.
+    """
+
+    def __init__(self, fits: dict = None, components: dict = None, n_reports=0):
+        self.fits = fits or {}
+        self.components = components or {}
+        self.n_reports = n_reports
+
+    @classmethod
+    def from_reports(cls, reports_dir, limit: int = CALIBRATION_REPORTS):
+        """Fit the model to the newest limit reports in reports_dir."""
+        paths = sorted(Path(reports_dir).glob("run_*.json"))[-limit:]
+        samples, components = {}, {}
+
+        def walk(node):
+            attrs = node["attrs"]
+            phase = attrs.get("work_phase")
+            # A GET that made no request was a skip or a cache hit
+            fetched = not phase or not phase.endswith("_get")
+            fetched = fetched or node["counters"].get("provider_requests", 0) > 0
+            if phase and attrs.get("work") and fetched:
+                samples.setdefault(phase, []).append((attrs["work"], node["wall_s"]))
+            for c in node["children"]:
+                walk(c)
+
+        for path in paths:
+            data = report.load(path)
+            walk(data["run"])
+            for c in data["run"]["children"]:
+                # Up-to-date components were skipped and did no work
+                attrs = c["attrs"]
+                if attrs.get("status") == "done" and not attrs.get("up_to_date"):
+                    components.setdefault(c["name"], []).append(c["wall_s"])
+        return cls(
+            {phase: _fit(s) for phase, s in samples.items()},
+            {name: float(np.mean(w)) for name, w in components.items()},
+            n_reports=len(paths),
+        )
+
+    def seconds(self, phase: str, work: float):
+        """Return the expected seconds of work in phase, or None if unmeasured."""
+        if phase not in self.fits:
+            return None
+        overhead, rate = self.fits[phase]
+        return overhead + rate * work
+
+
+def _total(values: list):
+    values = [v for v in values if v is not None]
+    return sum(values) if values else None
+
+
+def _phase_wall(seconds: list, workers: int):
+    """Wall time of a phase's tasks shared by workers, or None if unmeasured."""
+    total = _total(seconds)
+    if total is None:
+        return None
+    return total / max(min(workers, len(seconds)), 1)
+
+
+def estimate_obc(
+    boundary_boxes: dict,
+    hgrid: xr.Dataset,
+    get_pairs: list,
+    regrid_pairs: list,
+    product_info: dict,
+    pad: float = utils.RAW_LATLON_PAD,
+    get_workers: int = 1,
+    regrid_workers: int = 1,
+    cost_model: CostModel = None,
+) -> dict:
+    """Estimate every GET chunk, REGRID slice and MERGE of the boundaries.
+
+    boundary_boxes maps each boundary to the lat/lon boxes it is downloaded
+    as, which the access function grows by pad degrees. Returns {"assumed", "boundaries": {boundary: {"get", "regrid",
+    "merge"}}, "totals"}. Seconds are None where cost_model has no fit.
+    """
+    cost_model = cost_model or CostModel()
+    sizes = product_sizes(product_info)
+    n_variables = len(utils.build_forcing_request(product_info)[0])
+    values = _values_per_cell(product_info)
+    per_boundary = {}
+    for boundary, boxes in boundary_boxes.items():
+        points = segment_points(hgrid, boundary)
+        get = []
+        for start, end in get_pairs:
+            days = (end - start).days + 1
+            get.append(
+                dict(
+                    dates=f"{start:%Y-%m-%d}_{end:%Y-%m-%d}",
+                    bytes=download_bytes(boxes, days, product_info, pad),
+                    seconds=cost_model.seconds(
+                        "bc_get", get_work(boxes, days, n_variables, pad)
+                    ),
+                )
+            )
+        regrid = []
+        day_bytes = download_bytes(boxes, 1, product_info, pad)
+        for start, end in regrid_pairs:
+            days = (end - start).days + 1
+            regrid.append(
+                dict(
+                    dates=f"{start:%Y-%m-%d}_{end:%Y-%m-%d}",
+                    cells=points * values * days * sizes["time_steps_per_day"],
+                    memory_bytes=day_bytes * days * planner.REGRID_MEMORY_FACTOR,
+                    seconds=cost_model.seconds(
+                        "bc_regrid", segment_work(hgrid, boundary, days)
+                    ),
+                )
+            )
+        days = (get_pairs[-1][1] - get_pairs[0][0]).days + 1
+        merge = dict(
+            bytes=sum(r["cells"] for r in regrid) * BYTES_PER_VALUE,
+            seconds=cost_model.seconds("bc_merge", segment_work(hgrid, boundary, days)),
+        )
+        per_boundary[boundary] = dict(get=get, regrid=regrid, merge=merge)
+
+    gets = [g for b in per_boundary.values() for g in b["get"]]
+    regrids = [r for b in per_boundary.values() for r in b["regrid"]]
+    merges = [b["merge"] for b in per_boundary.values()]
+    phase_walls = [
+        _phase_wall([g["seconds"] for g in gets], get_workers),
+        _phase_wall([r["seconds"] for r in regrids], regrid_workers),
+        _total([m["seconds"] for m in merges]),
+    ]
+    return dict(
+        assumed=sizes["assumed"],
+        boundaries=per_boundary,
+        totals=dict(
+            download_bytes=sum(g["bytes"] for g in gets),
+            regrid_cells=sum(r["cells"] for r in regrids),
+            output_bytes=sum(m["bytes"] for m in merges),
+            peak_memory_bytes=max((r["memory_bytes"] for r in regrids), default=0)
+            * max(min(regrid_workers, len(regrids)), 1),
+            seconds=None if None in phase_walls else sum(phase_walls),
+        ),
+    )
+
+
+def estimate_ic(
+    hgrid: xr.Dataset,
+    vgrid: xr.Dataset,
+    latlon: dict,
+    days: int,
+    product_info: dict,
+    cost_model: CostModel = None,
+) -> dict:
+    """Estimate the GET, REGRID and FILL of the initial condition.
+
+    latlon and days are those of the raw request. Returns {"assumed", "get",
+    "regrid", "fill", "totals"}; seconds are None where cost_model has no fit.
+    """
+    cost_model = cost_model or CostModel()
+    sizes = product_sizes(product_info)
+    n_variables = len(utils.build_forcing_request(product_info)[0])
+    three_d, two_d = data_variables(product_info)
+    raw_bytes = download_bytes([latlon], days, product_info)
+    work = ic_work(hgrid, vgrid)
+    get = dict(
+        bytes=raw_bytes,
+        seconds=cost_model.seconds("ic_get", get_work([latlon], days, n_variables)),
+    )
+    regrid = dict(
+        cells=_model_cells(hgrid) * (len(three_d) * vgrid["dz"].size + len(two_d)),
+        memory_bytes=raw_bytes * planner.REGRID_MEMORY_FACTOR,
+        seconds=cost_model.seconds("ic_regrid", work),
+    )
+    fill = dict(seconds=cost_model.seconds("ic_fill", work))
+    phases = [get["seconds"], regrid["seconds"], fill["seconds"]]
+    return dict(
+        assumed=sizes["assumed"],
+        get=get,
+        regrid=regrid,
+        fill=fill,
+        totals=dict(
+            download_bytes=raw_bytes,
+            regrid_cells=regrid["cells"],
+            peak_memory_bytes=regrid["memory_bytes"],
+            seconds=None if None in phases else sum(phases),
+        ),
+    )
+
+
+def over_quota(estimates: dict, quota_bytes: int) -> list:
+    """Return a description of every download in estimates larger than quota_bytes.
+
+    estimates maps a component ("bc", "ic") to its estimate_obc or
+    estimate_ic result.
+    """
+    requests = []
+    for boundary, phases in estimates.get("bc", {}).get("boundaries", {}).items():
+        requests += [
+            (f"bc {boundary} GET {g['dates']}", g["bytes"]) for g in phases["get"]
+        ]
+    if "ic" in estimates:
+        requests.append(("ic GET", estimates["ic"]["get"]["bytes"]))
+    return [
+        f"{label}: {report._size(n)} exceeds the {report._size(quota_bytes)} quota"
+        for label, n in requests
+        if n > quota_bytes
+    ]
+
+
+def _seconds(s) -> str:
+    if s is None:
+        return "?"
+    return (
+        f"{s:.0f}s" if s < 120 else f"{s / 60:.0f}m" if s < 7200 else f"{s / 3600:.1f}h"
+    )
+
+
+def format_estimate(estimates: dict, cost_model: CostModel = None) -> str:
+    """Return the estimates of run_workflow's components as a table.
+
+    estimates maps "bc" and "ic" to their estimates and any other component
+    to its expected seconds (or None).
+    """
+    n_reports = cost_model.n_reports if cost_model else 0
+    lines = [
+        f"Estimated cost (times from {n_reports} past run report"
+        f"{'s' if n_reports != 1 else ''}, ? = not measured yet)",
+        f"{'task':<44} {'download':>10} {'cells':>10} {'memory':>10} {'time':>7}",
+    ]
+
+    def row(label, download=None, cells=None, memory=None, seconds=None):
+        lines.append(
+            f"{label:<44} {report._size(download) if download else '':>10} "
+            f"{f'{cells:.3g}' if cells else '':>10} "
+            f"{report._size(memory) if memory else '':>10} {_seconds(seconds):>7}"
+        )
+
+    for name, est in estimates.items():
+        if name == "bc":
+            for boundary, phases in est["boundaries"].items():
+                for g in phases["get"]:
+                    row(
+                        f"bc {boundary} GET {g['dates']}",
+                        g["bytes"],
+                        seconds=g["seconds"],
+                    )
+                for r in phases["regrid"]:
+                    row(
+                        f"bc {boundary} REGRID {r['dates']}",
+                        cells=r["cells"],
+                        memory=r["memory_bytes"],
+                        seconds=r["seconds"],
+                    )
+                row(f"bc {boundary} MERGE", seconds=phases["merge"]["seconds"])
+        elif name == "ic":
+            row("ic GET", est["get"]["bytes"], seconds=est["get"]["seconds"])
+            row(
+                "ic REGRID",
+                cells=est["regrid"]["cells"],
+                memory=est["regrid"]["memory_bytes"],
+                seconds=est["regrid"]["seconds"],
+            )
+            row("ic FILL", seconds=est["fill"]["seconds"])
+        else:
+            row(name, seconds=est)
+        if name in ("bc", "ic"):
+            t = est["totals"]
+            row(
+                f"{name} total",
+                t["download_bytes"],
+                t["regrid_cells"],
+                t["peak_memory_bytes"],
+                t["seconds"],
+            )
+            if est["assumed"]:
+                lines.append(
+                    f"  ({name}: product information has no "
+                    f"{', '.join(est['assumed'])}; assumed GLORYS values)"
+                )
+    return "\n".join(lines)
@@ -0,0 +1,220 @@
+"""Fast fills for boundary segments and initial conditions.
+
+Boundary fill with precomputed gather maps
+------------------------------------------
+
+regional-mom6 fills the NaNs left on a regridded segment (land, cells the
+source grid does not reach) with ``regridding.fill_missing_data``: a forward
+then backward fill along every dimension in turn, time included. Every pass
+moves values by index only, so the whole fill is a gather whose indices
+depend on nothing but where the NaNs are. The land mask of a segment does not
+change over time, which makes the passes along time no-ops and the gather the
+same for every time step.
+
+``fill_missing_data`` here is a drop-in replacement that exploits this. For
+each variable it derives the gather map once from the NaN pattern of one time
+step (covering every depth level and the variable's own staggering) and then
+applies it to the whole time axis with a single NumPy take. Maps are cached
+per process, keyed by the variable and a digest of its NaN pattern, so every
+later slice of the same segment reuses them. A variable whose NaNs move over
+time falls back to the pass-by-pass fill, so the result is always identical
+to regional-mom6's.
+
+Initial-condition fill
+----------------------
+
+The initial condition fills the ocean cells a field is missing by solving
+mom6_forge's Laplace system (``utils.fill_missing_data``) one depth level at
+a time. mom6_forge assembles that sparse system with a Python loop over every
+missing cell, which dominates the fill on large domains. ``fill_missing_levels``
+assembles the same system with array operations and solves the levels on a
+thread pool (SuperLU releases the GIL while it solves). The system, and
+therefore the result, is identical to mom6_forge's bit for bit.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+import xarray as xr
+from CrocoDash import logging
+from CrocoDash.extract_forcings import utils
+
+logger = logging.setup_logger(__name__)
+
+# Gather maps kept per process; a segment has one per variable and NaN pattern
+MAX_CACHED_MAPS = 256
+
+_maps = OrderedDict()
+# For threads of one process that fill at once. REGRID runs its workers in a
+# process pool, and each worker process fills from its own _maps.
+_maps_lock = threading.Lock()
+
+
+def _fill_passes(da: xr.DataArray, dims) -> xr.DataArray:
+    """Forward then backward fill da along each of dims it has, in order."""
+    for d in dims:
+        if d in da.dims:
+            da = da.ffill(d).bfill(d)
+    return da
+
+
+def _gather_map(nan_mask: np.ndarray, dims: tuple, order: tuple) -> np.ndarray:
+    """Return, for each flat position, the flat index it is filled from (-1: none)."""
+    index = np.arange(nan_mask.size, dtype="f8").reshape(nan_mask.shape)
+    index[nan_mask] = np.nan
+    index = _fill_passes(xr.DataArray(index, dims=dims), order).values.ravel()
+    return np.where(np.isnan(index), -1, index).astype(np.int64)
+
+
+def _cached_gather_map(name, nan_mask, dims, order) -> np.ndarray:
+    key = (
+        name,
+        dims,
+        nan_mask.shape,
+        order,
+        hashlib.blake2b(np.packbits(nan_mask).tobytes(), digest_size=16).digest(),
+    )
+    with _maps_lock:
+        if key in _maps:
+            _maps.move_to_end(key)
+            return _maps[key]
+    # Built outside the lock so other threads' lookups don't wait on it
+    gather = _gather_map(nan_mask, dims, order)
+    with _maps_lock:
+        _maps[key] = gather
+        if len(_maps) > MAX_CACHED_MAPS:
+            _maps.popitem(last=False)
+    return gather
+
+
+def _fill_variable(name, da: xr.DataArray, order: tuple, time_dim: str):
+    values = np.asarray(da.values)
+    if not np.issubdtype(values.dtype, np.floating):
+        return da
+    nan = np.isnan(values)
+    if not nan.any():
+        return da
+
+    has_time = time_dim in da.dims
+    axis = da.dims.index(time_dim) if has_time else None
+    steps = np.moveaxis(values, axis, 0) if has_time else values[np.newaxis]
+    steps_nan = np.moveaxis(nan, axis, 0) if has_time else nan[np.newaxis]
+    if not (steps_nan == steps_nan[0]).all():
+        # NaNs move over time, so the passes along time matter
+        return _fill_passes(da, order)
+
+    space_dims = tuple(d for d in da.dims if d != time_dim)
+    gather = _cached_gather_map(
+        name, steps_nan[0], space_dims, tuple(d for d in order if d != time_dim)
+    )
+    flat = steps.reshape(len(steps), -1)
+    filled = np.where(gather >= 0, flat[:, np.maximum(gather, 0)], np.nan)
+    filled = filled.reshape(steps.shape).astype(values.dtype, copy=False)
+    filled = np.moveaxis(filled, 0, axis) if has_time else filled[0]
+    return da.copy(data=filled)
+
+
+def fill_missing_data(ds: xr.Dataset, dim: str = "all", time_dim: str = "time"):
+    """Fill NaNs like ``regional_mom6.regridding.fill_missing_data``, faster.
+
+    Takes and returns the same arguments, so it can be passed as rm6's
+    fill_method. Only ``dim="all"`` uses gather maps; a single dimension is
+    filled pass by pass.
+    """
+    if dim != "all":
+        return ds.ffill(dim=dim, limit=None).bfill(dim=dim, limit=None)
+    order = tuple(ds.dims)
+    filled = ds.copy()
+    for name, da in ds.data_vars.items():
+        filled[name] = _fill_variable(name, da, order, time_dim)
+    return filled
+
+
+# Neighbours of a cell in the order mom6_forge visits them: (dj, di)
+_NEIGHBOURS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+
+
+def _laplace_system(data: np.ndarray, mask: np.ndarray, stabilizer: float):
+    """Assemble mom6_forge's fill system for one 2-D level.
+
+    Returns the NaN-free data, the (j, i) of the cells to fill, and the
+    matrix and right-hand side whose solution are their values. Entries are
+    accumulated in the same order as mom6_forge's loop, so floating-point
+    sums round the same way.
+    """
+    nj, ni = data.shape
+    fdata = np.nan_to_num(data, nan=0.0)
+    ocean = mask > 0
+    missing_j, missing_i = np.nonzero(np.isnan(data) & ocean)
+    n_missing = missing_i.size
+
+    index = np.full(data.shape, -1, dtype=np.int64)
+    index[missing_j, missing_i] = np.arange(n_missing)
+    diagonal = np.zeros(n_missing)
+    b = np.zeros(n_missing)
+    rows, cols = [np.arange(n_missing)], [np.arange(n_missing)]
+    for dj, di in _NEIGHBOURS:
+        j, i = missing_j + dj, missing_i + di
+        inside = (j >= 0) & (j < nj) & (i >= 0) & (i < ni)
+        j, i = np.clip(j, 0, nj - 1), np.clip(i, 0, ni - 1)
+        neighbour = inside & ocean[j, i]
+        diagonal[neighbour] -= 1.0
+        unknown = neighbour & (index[j, i] >= 0)
+        rows.append(np.nonzero(unknown)[0])
+        cols.append(index[j, i][unknown])
+        known = neighbour & ~unknown
+        b[known] -= fdata[j[known], i[known]]
+    b[diagonal >= 0] = 0.0
+
+    values = np.concatenate(
+        [diagonal - stabilizer, np.ones(sum(len(r) for r in rows[1:]))]
+    )
+    A = scipy.sparse.csr_matrix(
+        (values, (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_missing, n_missing),
+    )
+    A.sort_indices()
+    return fdata, missing_j, missing_i, A, b
+
+
+def fill_missing_level(data: np.ndarray, mask: np.ndarray, stabilizer=1.0e-14):
+    """Fill one 2-D level like ``mom6_forge.utils.fill_missing_data``.
+
+    data has NaN where values are missing; mask is 1 over ocean, 0 over land.
+    Returns a masked array, masked over land, as mom6_forge does.
+    """
+    fdata, missing_j, missing_i, A, b = _laplace_system(data, mask, stabilizer)
+    filled = np.ma.array(fdata, mask=(mask == 0))
+    if len(b):
+        filled[missing_j, missing_i] = scipy.sparse.linalg.spsolve(A, b)
+    return filled
+
+
+def fill_missing_levels(
+    data: np.ndarray, mask: np.ndarray, max_workers: int = 1, stabilizer=1.0e-14
+) -> np.ndarray:
+    """Fill every level of data (levels first) over the 2-D mask.
+
+    Each level is filled by fill_missing_level, up to max_workers at once.
+    Returns an array of data's dtype with NaN over land, which is what
+    assigning each level's masked array into an xarray variable gives.
+    """
+    levels = utils.run_tasks(
+        fill_missing_level,
+        [dict(data=level, mask=mask, stabilizer=stabilizer) for level in data],
+        max_workers=max_workers,
+    )
+    filled = np.empty(data.shape, dtype=data.dtype)
+    for out, level in zip(filled, levels):
+        out[...] = level.filled(np.nan)
+    return filled
+
+
+def clear_cache():
+    """Drop this process's cached gather maps."""
+    with _maps_lock:
+        _maps.clear()
@@ -0,0 +1,173 @@
+"""Make-style change detection for forcing components.
+
+Most phases skip an output that already exists, so changing a setting in
+config.json (``tidal_constituents``, ``rmax``/``fold``, ``function_args``,
+...) would otherwise reuse files built from the old one. Each component
+therefore has a fingerprint of everything its outputs depend on:
+
+- settings: the config.json values that change the outputs' content;
+- inputs: the SHA-256 of each input file (grids, TPXO, meshes, ...);
+- versions: the versions of the packages that build the outputs;
+- request: what the raw data downloads ask the provider for;
+- coverage: the dates processed.
+
+The fingerprints are stored in ``extract_forcings/fingerprints.json`` after
+each successful run. On the next run a component whose fingerprint is
+unchanged, and whose outputs all exist, is skipped outright. When the
+settings, inputs, versions or request changed, its outputs (and the
+intermediate files they were built from) are deleted before it runs, so
+nothing stale is reused. Raw downloads depend only on the request (product,
+access function, variables, ``function_args`` and box), so they are deleted
+only when the request changed. A change of coverage alone re-runs the
+component without deleting anything: the OBC files carry their dates in
+their names, so only the missing dates are processed. A component without a
+stored fingerprint, such as one from a run before fingerprints existed, runs
+as usual and is then recorded.
+
+Input files are hashed once and the checksum is reused while their size and
+mtime are unchanged, so large datasets are not re-read on every run.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from importlib import metadata
+from pathlib import Path
+
+from CrocoDash import logging
+from CrocoDash.extract_forcings import utils
+from CrocoDash.extract_forcings.manifest import checksum
+
+logger = logging.setup_logger(__name__)
+
+FINGERPRINTS_NAME = "fingerprints.json"
+# Packages whose code decides the content of the forcing files
+FINGERPRINTED_PACKAGES = ("CrocoDash", "regional_mom6", "mom6_forge")
+# Fingerprint parts whose change invalidates the existing outputs
+CONTENT_PARTS = ("settings", "inputs", "versions", "request")
+
+
+@dataclass
+class ComponentInputs:
+    """What a component's outputs depend on, and what it produces.
+
+    settings: config.json values that change the outputs' content.
+    inputs: input files.
+    outputs: files that must all exist for the component to be skipped.
+    intermediates: files built on the way, deleted with the outputs.
+    coverage: the dates processed, when outputs carry them in their names.
+    request: what the raw downloads ask for, without their dates.
+    request_inputs: files the request is derived from (e.g. the grid its
+        boxes come from).
+    downloads: raw files, deleted only when the request changed.
+    """
+
+    settings: dict
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    intermediates: list = field(default_factory=list)
+    coverage: dict = field(default_factory=dict)
+    request: dict = None
+    request_inputs: list = field(default_factory=list)
+    downloads: list = field(default_factory=list)
+
+
+def _digest(value) -> str:
+    text = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def versions() -> dict:
+    """Return the installed versions of FINGERPRINTED_PACKAGES."""
+    found = {}
+    for package in FINGERPRINTED_PACKAGES:
+        try:
+            found[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            pass
+    return found
+
+
+class FingerprintStore:
+    """The component fingerprints of a case, kept in a JSON file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def _locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return utils.locked_json(self.path)
+
+    def file_hash(self, path) -> str:
+        """Return the SHA-256 of path, or None if it does not exist.
+
+        The checksum is cached by resolved path, size and mtime.
+        """
+        path = Path(path).resolve()
+        if not path.is_file():
+            return None
+        stat = path.stat()
+        with self._locked() as data:
+            cached = data.get("files", {}).get(str(path))
+        if cached and (cached["size"], cached["mtime_ns"]) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            return cached["sha256"]
+        sha256 = checksum(path)
+        with self._locked() as data:
+            data.setdefault("files", {})[str(path)] = dict(
+                size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=sha256
+            )
+        return sha256
+
+    def fingerprint(self, spec: ComponentInputs) -> dict:
+        """Return the digest of each part of spec's fingerprint."""
+        inputs = {str(p): self.file_hash(p) for p in spec.inputs}
+        request_inputs = {str(p): self.file_hash(p) for p in spec.request_inputs}
+        return dict(
+            settings=_digest(spec.settings),
+            inputs=_digest(inputs),
+            versions=_digest(versions()),
+            request=_digest([spec.request, request_inputs]),
+            coverage=_digest(spec.coverage),
+        )
+
+    def changed(self, name: str, fingerprint: dict):
+        """Return the parts of name's fingerprint that changed since it was recorded.
+
+        An empty list means unchanged, None that nothing is recorded. Parts
+        missing from the recorded fingerprint are not compared.
+        """
+        with self._locked() as data:
+            entry = data.get("components", {}).get(name)
+        if entry is None:
+            return None
+        recorded = entry["fingerprint"]
+        return [
+            part
+            for part in fingerprint
+            if part in recorded and recorded[part] != fingerprint[part]
+        ]
+
+    def record(self, name: str, fingerprint: dict):
+        with self._locked() as data:
+            data.setdefault("components", {})[name] = dict(
+                fingerprint=fingerprint, recorded=time.time()
+            )
+
+
+def invalidate(spec: ComponentInputs, manifest=None, downloads=False) -> list:
+    """Delete spec's outputs and intermediates, and its downloads too if
+    downloads is set. Return the deleted paths."""
+    deleted = []
+    paths = [*spec.outputs, *spec.intermediates, *(spec.downloads if downloads else [])]
+    for path in map(Path, paths):
+        if path.is_file():
+            path.unlink()
+            if manifest is not None:
+                manifest.forget(path)
+            deleted.append(path)
+            logger.info(f"Removed stale {path}")
+    return deleted
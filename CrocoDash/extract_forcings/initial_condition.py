@@ -2,18 +2,29 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from CrocoDash import logging
 from CrocoDash.grid import Grid
-from CrocoDash.topo import Topo
-from CrocoDash.extract_forcings import utils
+from CrocoDash.extract_forcings import estimate, fill, report, utils
+from CrocoDash.extract_forcings.context import WorkflowContext
 import dask
+import numpy as np
 import xarray as xr
 import regional_mom6 as rm6
-import mom6_forge as m6b
 import netCDF4
 import pandas as pd
+import contextlib
 import os
+import threading
 
 logger = logging.setup_logger(__name__)
 
+# rm6's setup_initial_condition writes init_<name>.nc for each of these
+_IC_FILES = ("eta", "vel", "tracers")
+# Global attribute marking an IC file whose missing data has been filled
+_FILLED_ATTR = "crocodash_fill"
+# HDF5 is not thread-safe, and xarray only takes its own netCDF locks around
+# array reads and writes, not the metadata reads of opening a file. The
+# concurrent fills take turns opening, loading and writing files.
+_NETCDF_LOCK = threading.Lock()
+
 
 def process_initial_condition(
     product_name: str,
@@ -28,6 +39,13 @@ def process_initial_condition(
     bathymetry_path: str | Path,
     preview: bool = False,
     function_args: dict = None,
+    raw_cache=None,
+    manifest=None,
+    max_workers=1,
+    fill_in_place: bool = False,
+    fill_tile_levels: int = None,
+    context: WorkflowContext = None,
+    cost_model: estimate.CostModel = None,
 ):
     """
     Process the initial condition (t=0) through the data retrieval pipeline.
@@ -43,10 +61,29 @@ def process_initial_condition(
         raw_data_dir: Directory for raw downloaded data.
         output_data_dir: Directory for final MOM6-ready output files.
         bathymetry_path: Path to the bathymetry file.
-        preview: Return metadata dict without executing, default False.
+        preview: Return metadata dict, with the estimated cost under
+            "estimate" (see estimate.estimate_ic), without executing, default
+            False.
         function_args: Overrides for the access function's non-required
             arguments (e.g. `member`), as written to config.json by
             configure_forcings()'s function_overrides.
+        raw_cache: Optional raw_cache.RawCache shared across cases for the
+            raw download.
+        manifest: Optional manifest.RunManifest consulted to skip finished
+            files and updated as each one completes.
+        max_workers: Depth levels filled at once, or ``"auto"`` for one per
+            CPU.
+        fill_in_place: Write the filled fields over init_<name>.nc instead of
+            to separate init_<name>_filled.nc files, so each IC file exists
+            once. The eta, velocity and tracer fills always run concurrently.
+        fill_tile_levels: Fill and write this many depth levels at a time so
+            the fill's memory does not grow with the domain; None loads whole
+            fields.
+        context: Optional context.WorkflowContext supplying the hgrid, vgrid
+            and bathymetry masks already loaded by other components. Built
+            from the paths when omitted.
+        cost_model: Fitted estimate.CostModel giving the preview's expected
+            times; None leaves them out.
     """
     if not os.path.exists(vgrid_path):
         raise FileNotFoundError(
@@ -55,10 +92,15 @@ def process_initial_condition(
     if not isinstance(start_date, datetime):
         start_date = pd.to_datetime(start_date).to_pydatetime()
 
+    if max_workers == "auto":
+        max_workers = os.cpu_count() or 1
     data_access_function = utils.get_data_access_function(product_name, function_name)
 
+    if context is None:
+        context = WorkflowContext(hgrid_path, bathymetry_path, vgrid_path)
+
     # Get lat,lon information for each boundary
-    hgrid = xr.open_dataset(hgrid_path)
+    hgrid = context.hgrid
     boundary_info = Grid.get_bounding_boxes(hgrid)
     latlon_info = boundary_info["ic"]
     output_file = "ic_unprocessed.nc"
@@ -70,105 +112,52 @@ def process_initial_condition(
         product_information, function_args
     )
     if not preview:
-        _download_initial_condition(
-            data_access_function=data_access_function,
-            latlon_info=latlon_info,
-            raw_data_dir=raw_data_dir,
-            start_date_str=start_date_str,
-            end_date_str=end_ic_date_str,
-            variables=variables,
-            extra_args=extra_args,
-        )
+        with report.span("GET"):
+            _download_initial_condition(
+                data_access_function=data_access_function,
+                latlon_info=latlon_info,
+                raw_data_dir=raw_data_dir,
+                start_date_str=start_date_str,
+                end_date_str=end_ic_date_str,
+                variables=variables,
+                extra_args=extra_args,
+                raw_cache=raw_cache,
+                manifest=manifest,
+            )
 
     # Set up required information
     expt = rm6.experiment.create_empty()
     expt.hgrid = hgrid
     expt.mom_input_dir = Path(output_data_dir)
     expt.date_range = [start_date, None]
-    vgrid_from_file = xr.open_dataset(vgrid_path)
-    expt.vgrid = expt._make_vgrid(vgrid_from_file.dz.data)  # renames/changes meta data
+    expt.vgrid = expt._make_vgrid(context.vgrid.dz.data)  # renames/changes meta data
     file_path = Path(raw_data_dir) / "ic_unprocessed.nc"
     if not preview:
-        eta_path = expt.mom_input_dir / "init_eta.nc"
-        if eta_path.exists():
-            if not utils.is_valid_netcdf(eta_path):
-                raise RuntimeError(
-                    f"{eta_path} exists but is not valid NetCDF. Delete it and re-run."
-                )
+        ic_paths = [expt.mom_input_dir / f"init_{n}.nc" for n in _IC_FILES]
+        if all(utils.existing_artifact(p, manifest) for p in ic_paths):
             logger.info(f"Initial condition files already exist. They will be skipped.")
         else:
-            expt.setup_initial_condition(file_path, dataset_varnames, arakawa_grid=None)
-        eta_filled_path = expt.mom_input_dir / "init_eta_filled.nc"
-        if eta_filled_path.exists():
-            if not utils.is_valid_netcdf(eta_filled_path):
-                raise RuntimeError(
-                    f"{eta_filled_path} exists but is not valid NetCDF. Delete it and re-run."
+            with report.span("REGRID"):
+                expt.setup_initial_condition(
+                    file_path, dataset_varnames, arakawa_grid=None
                 )
-            logger.info(
-                f"Initial condition filled files already exist. They will be skipped."
-            )
-        else:
-            # Add the M6b Fill method onto the initial conditions
-            logger.info("Start mom6_forge fill...")
-            # Read in bathymetry
-            grid = Grid.from_supergrid(hgrid_path)
-
-            # Have to get min depth from the file first
-            with xr.open_dataset(bathymetry_path) as ds:
-                min_depth = ds.attrs.get("min_depth")
-            bathymetry = Topo.from_topo_file(
-                grid=grid, topo_file_path=bathymetry_path, min_depth=min_depth
-            )
-
-            # ETA - no depth
-            _fill_missing_and_write(
-                Path(output_data_dir) / "init_eta.nc",
-                Path(output_data_dir) / "init_eta_filled.nc",
-                [
-                    {
-                        "name": "eta_t",
-                        "mask": bathymetry.tmask,
-                        "dims": ("nx", "ny"),
-                        "encoding": {"_FillValue": None},
-                    },
-                ],
-            )
-
-            # Velocity
-            _fill_missing_and_write(
-                Path(output_data_dir) / "init_vel.nc",
-                Path(output_data_dir) / "init_vel_filled.nc",
-                [
-                    {
-                        "name": "u",
-                        "mask": bathymetry.umask,
-                        "dims": ("nxp", "ny", "zl"),
-                        "encoding": {"_FillValue": netCDF4.default_fillvals["f4"]},
-                    },
-                    {
-                        "name": "v",
-                        "mask": bathymetry.vmask,
-                        "dims": ("nx", "nyp", "zl"),
-                        "encoding": {"_FillValue": netCDF4.default_fillvals["f4"]},
-                    },
-                ],
-            )
-
-            # Tracers
-            _fill_missing_and_write(
-                Path(output_data_dir) / "init_tracers.nc",
-                Path(output_data_dir) / "init_tracers_filled.nc",
-                [
-                    {
-                        "name": var,
-                        "mask": bathymetry.tmask,
-                        "dims": ("nx", "ny", "zl"),
-                        "encoding": {"_FillValue": -1e20, "missing_value": -1e20},
-                    }
-                    for var in ["temp", "salt"]
-                ],
+                report.annotate(
+                    work_phase="ic_regrid",
+                    work=estimate.ic_work(hgrid, context.vgrid),
+                )
+            if manifest is not None:
+                for p in ic_paths:
+                    manifest.record(p)
+        with report.span("FILL"):
+            _fill_initial_condition(
+                expt.mom_input_dir,
+                context,
+                manifest=manifest,
+                max_workers=max_workers,
+                in_place=fill_in_place,
+                tile_levels=fill_tile_levels,
+                work=estimate.ic_work(hgrid, context.vgrid),
             )
-            logger.info("...end mom6_forge fill.")
 
     if not preview:
         logger.info(
@@ -179,6 +168,14 @@ def process_initial_condition(
             "date": start_date_str,
             "output_file_names": output_file,
             "output_folder": output_data_dir,
+            "estimate": estimate.estimate_ic(
+                hgrid,
+                context.vgrid,
+                latlon_info,
+                (end_ic_date - start_date).days + 1,
+                product_information,
+                cost_model=cost_model,
+            ),
         }
 
 
@@ -190,7 +187,37 @@ def _download_initial_condition(
     end_date_str: str,
     variables: list[str],
     extra_args: dict,
+    raw_cache=None,
+    manifest=None,
 ):
+    output_file = Path(raw_data_dir) / "ic_unprocessed.nc"
+    union_file = utils.find_covering_raw_file(
+        raw_data_dir,
+        "union",
+        datetime.fromisoformat(start_date_str),
+        datetime.fromisoformat(end_date_str),
+    )
+    if not output_file.exists() and union_file is not None:
+        # The OBC step already downloaded the whole domain for these dates
+        utils.slice_raw_file(
+            union_file, output_file, dates=[start_date_str, end_date_str]
+        )
+        if manifest is not None:
+            manifest.record(output_file)
+        return
+    # Calibrates the preview estimates (see estimate.CostModel)
+    report.annotate(
+        work_phase="ic_get",
+        work=estimate.get_work(
+            [latlon_info],
+            (
+                datetime.fromisoformat(end_date_str)
+                - datetime.fromisoformat(start_date_str)
+            ).days
+            + 1,
+            len(variables),
+        ),
+    )
     with dask.config.set(scheduler="synchronous"):
         utils.fetch_raw_chunk(
             data_access_fn=data_access_function,
@@ -201,10 +228,124 @@ def _download_initial_condition(
             variables=variables,
             name="ic",
             extra_args=extra_args,
+            cache=raw_cache,
+            manifest=manifest,
         )
 
 
-def _fill_missing_and_write(input_path, output_path, var_specs, z_dim="zl"):
+def _fill_initial_condition(
+    output_dir: Path,
+    context: WorkflowContext,
+    manifest=None,
+    max_workers=1,
+    in_place: bool = False,
+    tile_levels: int = None,
+    work: float = None,
+) -> list:
+    """Fill the missing data of the init_<name>.nc files in output_dir.
+
+    The bathymetry masks come from context, loaded only if a fill is needed,
+    and are shared by the eta, velocity and tracer fills, which run
+    concurrently. tile_levels streams each fill in
+    tiles of that many depth levels (see _fill_missing_and_write). Returns
+    the filled files: init_<name>_filled.nc, or init_<name>.nc itself with
+    in_place. work (see estimate.ic_work) is recorded on the current report
+    span when a fill runs.
+    """
+    ic_paths = [output_dir / f"init_{n}.nc" for n in _IC_FILES]
+    if in_place:
+        fill_paths = ic_paths
+        # A filled file that no longer matches its manifest entry has changed
+        # since the fill; fill it again rather than delete the only copy
+        done = all(
+            _is_filled(p) and (manifest is None or manifest.check(p) is not False)
+            for p in ic_paths
+        )
+    else:
+        fill_paths = [output_dir / f"init_{n}_filled.nc" for n in _IC_FILES]
+        done = all(utils.existing_artifact(p, manifest) for p in fill_paths)
+    if done:
+        logger.info(
+            f"Initial condition filled files already exist. They will be skipped."
+        )
+        return fill_paths
+
+    # Add the M6b Fill method onto the initial conditions
+    logger.info("Start mom6_forge fill...")
+    var_specs = _fill_specs(context.masks)
+    utils.run_tasks(
+        _fill_missing_and_write,
+        [
+            dict(
+                input_path=ic_path,
+                output_path=fill_path,
+                var_specs=var_specs[name],
+                max_workers=max_workers,
+                tile_levels=tile_levels,
+            )
+            for name, ic_path, fill_path in zip(_IC_FILES, ic_paths, fill_paths)
+        ],
+        max_workers=len(_IC_FILES),
+        span=lambda task: (Path(task["input_path"]).name,),
+    )
+    if work is not None:
+        report.annotate(work_phase="ic_fill", work=work)
+    logger.info("...end mom6_forge fill.")
+    if manifest is not None:
+        for p in fill_paths:
+            manifest.record(p)
+    return fill_paths
+
+
+def _fill_specs(masks: dict) -> dict:
+    """Return the _fill_missing_and_write var_specs of each IC file."""
+    return {
+        # ETA - no depth
+        "eta": [
+            {
+                "name": "eta_t",
+                "mask": masks["t"],
+                "dims": ("nx", "ny"),
+                "encoding": {"_FillValue": None},
+            },
+        ],
+        "vel": [
+            {
+                "name": "u",
+                "mask": masks["u"],
+                "dims": ("nxp", "ny", "zl"),
+                "encoding": {"_FillValue": netCDF4.default_fillvals["f4"]},
+            },
+            {
+                "name": "v",
+                "mask": masks["v"],
+                "dims": ("nx", "nyp", "zl"),
+                "encoding": {"_FillValue": netCDF4.default_fillvals["f4"]},
+            },
+        ],
+        "tracers": [
+            {
+                "name": var,
+                "mask": masks["t"],
+                "dims": ("nx", "ny", "zl"),
+                "encoding": {"_FillValue": -1e20, "missing_value": -1e20},
+            }
+            for var in ["temp", "salt"]
+        ],
+    }
+
+
+def _is_filled(path: Path) -> bool:
+    """Return whether path is an IC file _fill_missing_and_write has written."""
+    if not utils.is_valid_netcdf(path):
+        return False
+    with netCDF4.Dataset(path) as ds:
+        return _FILLED_ATTR in ds.ncattrs()
+
+
+def _fill_missing_and_write(
+    input_path, output_path, var_specs, z_dim="zl", max_workers=1, tile_levels=None
+):
     """Fill masked-missing data and interpolation gaps for each variable, then write.
 
     var_specs: list of dicts with keys:
@@ -212,22 +353,56 @@ def _fill_missing_and_write(input_path, output_path, var_specs, z_dim="zl"):
         mask: mom6_forge Topo mask array (tmask/umask/vmask) for this variable
         dims: (x_dim, y_dim) or (x_dim, y_dim, z_dim) passed to final_cleanliness_fill
         encoding: netCDF encoding dict for this variable
+    max_workers: depth levels of a variable filled at once.
+    tile_levels: if set, fill and write tile_levels depth levels at a time
+        instead of loading whole variables, so memory is bounded by the tile
+        rather than the domain. The result is the same.
+
+    The fill is mom6_forge's (see fill.fill_missing_levels), with every level
+    of a 3-D variable filled in one call. Only the downward fill of
+    final_cleanliness_fill couples levels, and it carries across tiles.
     """
-    ds = xr.open_dataset(input_path, mask_and_scale=True)
-    encoding = {}
-    for spec in var_specs:
-        name, mask, dims = spec["name"], spec["mask"], spec["dims"]
-        if len(dims) == 3:
-            for z_ind in range(ds[z_dim].shape[0]):
-                ds[name][z_ind] = m6b.utils.fill_missing_data(
-                    ds[name][z_ind].values, mask.values
-                )
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    with _NETCDF_LOCK:
+        src = xr.open_dataset(input_path, mask_and_scale=True)
+    with src:
+        tiled = tile_levels is not None and z_dim in src.dims
+        if tiled:
+            ds = src.chunk({z_dim: tile_levels})
         else:
-            ds[name][:] = m6b.utils.fill_missing_data(ds[name].values, mask.values)
-        ds[name] = final_cleanliness_fill(ds[name], *dims)
-        encoding[name] = spec["encoding"]
-    ds = ds.fillna(0)
-    ds.to_netcdf(output_path, encoding=encoding)
+            with _NETCDF_LOCK:
+                ds = src.load()
+        encoding = {}
+        for spec in var_specs:
+            name, mask, dims = spec["name"], spec["mask"], spec["dims"]
+            if len(dims) == 3:
+                levels = ds[name].transpose(z_dim, ...)
+                if tiled:
+                    filled = levels.data.map_blocks(
+                        fill.fill_missing_levels,
+                        np.asarray(mask),
+                        max_workers=max_workers,
+                        dtype=levels.dtype,
+                    )
+                else:
+                    filled = fill.fill_missing_levels(
+                        levels.values, np.asarray(mask), max_workers=max_workers
+                    )
+                ds[name] = levels.copy(data=filled).transpose(*ds[name].dims)
+            else:
+                ds[name][:] = fill.fill_missing_level(ds[name].values, mask.values)
+            ds[name] = final_cleanliness_fill(ds[name], *dims)
+            encoding[name] = spec["encoding"]
+        ds = ds.fillna(0)
+        ds.attrs[_FILLED_ATTR] = "mom6_forge"
+        # Write under a temporary name so an interrupted fill never leaves a
+        # truncated file that a re-run would skip. output_path may be
+        # input_path. Tiles are filled as they are written, with xarray
+        # serialising the file access itself.
+        with contextlib.nullcontext() if tiled else _NETCDF_LOCK:
+            ds.to_netcdf(tmp_path, encoding=encoding)
+    os.replace(tmp_path, output_path)
 
 
 def final_cleanliness_fill(var, x_dim, y_dim, z_dim=None):
@@ -0,0 +1,147 @@
+"""Per-case run manifest of completed forcing artifacts.
+
+Every phase of the forcing workflow skips files that already exist, so a
+failed run can be resumed. Existence alone is not enough, though: a file
+truncated mid-write still starts with the NetCDF magic bytes and would poison
+every later phase. The manifest (``extract_forcings/run_manifest.json``)
+records each artifact once it is complete, with its size, mtime, the
+parameters that produced it and when it was recorded. Hashing every artifact
+on every run is expensive on large cases, so the SHA-256 checksum is only
+recorded when the manifest is created with ``checksums=True``.
+
+On resume ``check`` compares only the size and mtime with the recorded ones,
+so nothing is reopened. ``verify`` audits every entry, recomputing the
+checksums of those recorded with one.
+Paths are stored relative to the manifest's directory, so a moved input
+directory keeps its manifest.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from CrocoDash import logging
+from CrocoDash.extract_forcings import utils
+
+logger = logging.setup_logger(__name__)
+
+MANIFEST_NAME = "run_manifest.json"
+
+
+def _normalize(params):
+    """Return params as they read back from the JSON manifest."""
+    return json.loads(json.dumps(params, sort_keys=True, default=str))
+
+
+def checksum(path: Path, block_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file, read in blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            h.update(block)
+    return h.hexdigest()
+
+
+class RunManifest:
+    """A JSON record of the artifacts a case's forcing workflow has completed."""
+
+    def __init__(self, path, checksums: bool = False):
+        self.path = Path(path)
+        self.checksums = checksums
+
+    def _key(self, artifact: Path) -> str:
+        return os.path.relpath(Path(artifact).resolve(), self.path.parent.resolve())
+
+    def entries(self) -> dict:
+        """Return a copy of the manifest: relative path → entry."""
+        if not self.path.exists():
+            return {}
+        with utils.locked_json(self.path) as entries:
+            return dict(entries)
+
+    def record(self, artifact, params: dict = None):
+        """Record artifact as complete. Call this only after its final rename."""
+        artifact = Path(artifact)
+        stat = artifact.stat()
+        entry = dict(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            params=_normalize(params),
+            recorded=time.time(),
+        )
+        if self.checksums:
+            entry["sha256"] = checksum(artifact)
+        with utils.locked_json(self.path) as entries:
+            entries[self._key(artifact)] = entry
+
+    def forget(self, artifact):
+        with utils.locked_json(self.path) as entries:
+            entries.pop(self._key(artifact), None)
+
+    def params(self, artifact):
+        """Return the params recorded for artifact, or None."""
+        return self.entries().get(self._key(artifact), {}).get("params")
+
+    def params_match(self, artifact, params: dict = None) -> bool:
+        """Return whether params match the ones recorded for artifact.
+
+        None matches anything.
+        """
+        return params is None or _normalize(params) == self.params(artifact)
+
+    def refresh(self, artifact) -> bool:
+        """Re-record the mtime of an artifact that was touched or copied.
+
+        The artifact counts as unchanged if its size, and its checksum when
+        one was recorded, still match the entry. Returns whether it did.
+        """
+        key = self._key(artifact)
+        entry = self.entries().get(key)
+        if entry is None:
+            return False
+        stat = Path(artifact).stat()
+        if stat.st_size != entry["size"]:
+            return False
+        if "sha256" in entry and checksum(artifact) != entry["sha256"]:
+            return False
+        with utils.locked_json(self.path) as entries:
+            entries[key] = dict(entry, mtime_ns=stat.st_mtime_ns)
+        return True
+
+    def check(self, artifact, params: dict = None):
+        """Return whether artifact is recorded and unchanged.
+
+        True if its size and mtime match the entry (and params, when given,
+        match the recorded ones), False if it is recorded but differs, and
+        None if it is not recorded at all.
+        """
+        entry = self.entries().get(self._key(artifact))
+        if entry is None:
+            return None
+        stat = Path(artifact).stat()
+        return (
+            stat.st_size == entry["size"]
+            and stat.st_mtime_ns == entry["mtime_ns"]
+            and (params is None or _normalize(params) == entry["params"])
+        )
+
+    def verify(self) -> dict:
+        """Audit every entry.
+
+        Entries recorded with a checksum are checked against it; the others
+        only against their size. Returns relative path → problem ("missing",
+        "checksum mismatch" or "size changed") for each bad entry.
+        """
+        problems = {}
+        for key, entry in self.entries().items():
+            artifact = self.path.parent / key
+            if not artifact.exists():
+                problems[key] = "missing"
+            elif "sha256" in entry:
+                if checksum(artifact) != entry["sha256"]:
+                    problems[key] = "checksum mismatch"
+            elif artifact.stat().st_size != entry["size"]:
+                problems[key] = "size changed"
+        return problems
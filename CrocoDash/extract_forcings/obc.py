@@ -5,26 +5,58 @@ Three-phase pipeline per boundary:
 1. GET    — download raw data, chunked by ``get_step`` (default: full range in
              one request). Chunk size is driven by data-provider constraints
              (API limits, download size). Each chunk is written as
-             ``{boundary}_unprocessed.{start}_{end}.nc``.
+             ``{boundary}_unprocessed.{start}_{end}.nc``. All (boundary,
+             chunk) downloads are independent and share one worker pool of
+             ``max_workers``.
 2. REGRID — validate raw coverage from filenames, then open all raw files
              lazily and regrid in ``regrid_step``-sized slices. Chunk size is
              driven by memory and xESMF performance. GET and REGRID chunks are
-             fully independent.
-3. MERGE  — concatenate regridded chunks into ``forcing_obc_segment_NNN.nc``.
+             fully independent. With ``max_workers`` > 1, weights are built
+             once per boundary and the slices run on a process pool.
+3. MERGE  — concatenate regridded chunks into ``forcing_obc_segment_NNN.nc``,
+             streaming them one at a time into a file with an unlimited
+             ``time`` dimension so memory use does not grow with the number
+             of chunks.
 
 Each phase is idempotent: existing output files are detected and skipped,
 so a failed run can be safely re-started.
+
+With ``pipeline=True`` the phases are no longer barriers: a REGRID slice
+starts as soon as the raw chunks covering it are downloaded, and a boundary
+is merged as soon as all its slices are regridded, so downloads and
+regridding overlap instead of alternating.
+
+With ``extend=True`` a longer date range costs only the new dates: GET and
+REGRID run from the day after the merged files end, and MERGE appends the new
+chunks to the existing ``forcing_obc_segment_NNN.nc`` files in place.
 """
 
+import functools
 import os
+import pickle
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import cftime
+import netCDF4 as nc
+import numpy as np
 import pandas as pd
 import regional_mom6 as rm6
 import xarray as xr
 from CrocoDash import logging
-from CrocoDash.extract_forcings import utils
+from CrocoDash.extract_forcings import (
+    estimate,
+    fill,
+    planner,
+    raw_cache as rc,
+    report,
+    utils,
+    weight_cache as wc,
+)
+from CrocoDash.extract_forcings.manifest import RunManifest
 from CrocoDash.grid import Grid
 
 logger = logging.setup_logger(__name__)
@@ -151,42 +183,501 @@ def _validate_coverage(
 # ---------------------------------------------------------------------------
 
 
-def _get_boundary(
+def _get_chunk_requests(
     boundary: str,
     start_date: datetime,
     end_date: datetime,
     get_step_days,
+    latlon: dict,
+    output_dir,
+    variables: list,
+    extra_args: dict,
+    strip: list = None,
+    raw_cache: rc.RawCache = None,
+    manifest: RunManifest = None,
+) -> list:
+    """Return one ``utils.fetch_raw_chunk`` request per get_step_days chunk of a boundary.
+
+    strip: optional strip boxes (see _boundary_strip) requested instead of latlon.
+    raw_cache: optional shared raw-data cache the requests go through.
+    manifest: optional run manifest the requests consult and record into.
+    """
+    requests = []
+    for chunk_start, chunk_end in _make_date_pairs(start_date, end_date, get_step_days):
+        start_str = chunk_start.strftime("%Y-%m-%d")
+        end_str = chunk_end.strftime("%Y-%m-%d")
+        requests.append(
+            dict(
+                dates=[start_str, end_str],
+                latlon=latlon,
+                name=boundary,
+                output_folder=Path(output_dir),
+                output_filename=f"{boundary}_unprocessed.{start_str}_{end_str}.nc",
+                variables=variables,
+                extra_args=extra_args,
+            )
+        )
+        if strip is not None:
+            requests[-1]["strip"] = strip
+        if raw_cache is not None:
+            requests[-1]["cache"] = raw_cache
+        if manifest is not None:
+            requests[-1]["manifest"] = manifest
+    return requests
+
+
+_BOUNDARY_LINES = {
+    "north": {"nyp": -1},
+    "south": {"nyp": 0},
+    "east": {"nxp": -1},
+    "west": {"nxp": 0},
+}
+
+
+def _boundary_strip(hgrid: xr.Dataset, boundary: str, halo: float) -> list:
+    """Return the strip boxes covering a boundary's hgrid points plus halo degrees.
+
+    On a rotated or curvilinear grid a boundary can run diagonally, and its
+    bounding box from Grid.get_bounding_boxes is then mostly cells the
+    segment regridder never touches.
+    """
+    line = _BOUNDARY_LINES[boundary]
+    return utils.strip_boxes(hgrid["x"].isel(line), hgrid["y"].isel(line), halo)
+
+
+def _get_span(request: dict) -> tuple:
+    """Run-report path of a GET request: boundary, phase and dates."""
+    return (request["name"], "GET", "_".join(request["dates"]))
+
+
+def _regrid_span(task: dict) -> tuple:
+    """Run-report path of a REGRID slice task."""
+    return (
+        task["boundary"],
+        "REGRID",
+        f"{task['chunk_start']:%Y-%m-%d}_{task['chunk_end']:%Y-%m-%d}",
+    )
+
+
+def _get_chunk(product_name: str, function_name: str, **request) -> Path:
+    """Download one raw chunk.
+
+    Module-level and keyed by product/function name (rather than taking the
+    access function itself) so it can be shipped to a process pool.
+    """
+    data_access_fn = utils.get_data_access_function(product_name, function_name)
+    start, end = (datetime.fromisoformat(d) for d in request["dates"])
+    if request.get("strip") is not None:
+        boxes, pad = request["strip"], 0.0
+    else:
+        boxes, pad = [request["latlon"]], utils.RAW_LATLON_PAD
+    # Calibrates the preview estimates (see estimate.CostModel)
+    report.annotate(
+        work_phase="bc_get",
+        work=estimate.get_work(
+            boxes, (end - start).days + 1, len(request["variables"]), pad
+        ),
+    )
+    return utils.fetch_raw_chunk(data_access_fn=data_access_fn, **request)
+
+
+def _get_boundaries(
+    boundaries: list,
+    start_date: datetime,
+    end_date: datetime,
+    get_step_days,
     hgrid_path,
     output_dir,
     product_name: str,
     function_name: str,
     variables: list,
     extra_args: dict,
+    max_workers: int = 1,
+    executor: str = "thread",
+    union_max_gb: float = None,
+    product_info: dict = None,
+    coords: list = (),
+    strip_halo: float = None,
+    raw_cache: rc.RawCache = None,
+    manifest: RunManifest = None,
 ) -> list:
-    """Download all raw data for one boundary, chunked by get_step_days."""
-    output_dir = Path(output_dir)
+    """Download all raw data for the given boundaries, chunked by get_step_days.
 
-    data_access_fn = utils.get_data_access_function(product_name, function_name)
+    Every (boundary, chunk) pair is an independent request, so they are all
+    handed to one worker pool of max_workers. Each request keeps
+    fetch_raw_chunk's skip-if-valid behaviour, so a re-run only fetches the
+    chunks that are still missing.
 
-    # Get the bounding box for the specified boundary from the hgrid
-    hgrid = xr.open_dataset(hgrid_path)
-    latlon = Grid.get_bounding_boxes(hgrid)[boundary]
+    If downloading the box covering every boundary and the IC is estimated to
+    take at most union_max_gb (see _union_box), a single union request per
+    chunk is made instead and the boundaries are sliced from it locally (see
+    _get_union). coords are the (x, y) coordinate names to slice on.
 
-    for chunk_start, chunk_end in _make_date_pairs(start_date, end_date, get_step_days):
-        start_str = chunk_start.strftime("%Y-%m-%d")
-        end_str = chunk_end.strftime("%Y-%m-%d")
-        output_filename = f"{boundary}_unprocessed.{start_str}_{end_str}.nc"
-
-        utils.fetch_raw_chunk(
-            data_access_fn=data_access_fn,
-            dates=[start_str, end_str],
-            latlon=latlon,
-            name=boundary,
-            output_folder=output_dir,
-            output_filename=output_filename,
+    Otherwise, strip_halo (degrees) requests only a strip along each boundary
+    (see _boundary_strip) instead of its whole bounding box.
+
+    Every request goes through raw_cache and manifest when they are given.
+    """
+    # Get the bounding box for each boundary from the hgrid
+    hgrid = _load_hgrid(hgrid_path)
+    bounding_boxes = Grid.get_bounding_boxes(hgrid)
+
+    union = _union_box(
+        bounding_boxes, boundaries, start_date, end_date, product_info, union_max_gb
+    )
+    if union is not None:
+        files = _get_union(
+            boundaries=boundaries,
+            bounding_boxes=bounding_boxes,
+            union=union,
+            start_date=start_date,
+            end_date=end_date,
+            get_step_days=get_step_days,
+            output_dir=output_dir,
+            product_name=product_name,
+            function_name=function_name,
             variables=variables,
             extra_args=extra_args,
+            coords=coords,
+            max_workers=max_workers,
+            executor=executor,
+            raw_cache=raw_cache,
+            manifest=manifest,
+        )
+        if files is not None:
+            return files
+
+    tasks = []
+    for boundary in boundaries:
+        logger.info("GET [%s]: %s → %s", boundary, start_date.date(), end_date.date())
+        tasks += [
+            dict(product_name=product_name, function_name=function_name, **request)
+            for request in _get_chunk_requests(
+                boundary=boundary,
+                start_date=start_date,
+                end_date=end_date,
+                get_step_days=get_step_days,
+                latlon=bounding_boxes[boundary],
+                output_dir=output_dir,
+                variables=variables,
+                extra_args=extra_args,
+                strip=(
+                    None
+                    if strip_halo is None
+                    else _boundary_strip(hgrid, boundary, strip_halo)
+                ),
+                raw_cache=raw_cache,
+                manifest=manifest,
+            )
+        ]
+
+    return utils.run_tasks(
+        _get_chunk, tasks, max_workers=max_workers, executor=executor, span=_get_span
+    )
+
+
+def _union_box(
+    bounding_boxes: dict,
+    boundaries: list,
+    start_date: datetime,
+    end_date: datetime,
+    product_info: dict,
+    union_max_gb: float = None,
+):
+    """Return the box to download for every boundary at once, or None.
+
+    The box covers the boundaries and the IC, so the initial condition can be
+    sliced from the same files (see
+    initial_condition._download_initial_condition). It is used only when its
+    estimated download over the whole date range (see estimate.download_bytes)
+    is at most union_max_gb.
+    """
+    if union_max_gb is None:
+        return None
+    union = utils.union_latlon(
+        [bounding_boxes[b] for b in boundaries] + [bounding_boxes["ic"]]
+    )
+    days = (end_date - start_date).days + 1
+    if estimate.download_bytes([union], days, product_info) > union_max_gb * 1024**3:
+        return None
+    return union
+
+
+def _get_union(
+    boundaries: list,
+    bounding_boxes: dict,
+    union: dict,
+    start_date: datetime,
+    end_date: datetime,
+    get_step_days,
+    output_dir,
+    product_name: str,
+    function_name: str,
+    variables: list,
+    extra_args: dict,
+    coords: list,
+    max_workers: int = 1,
+    executor: str = "thread",
+    raw_cache: rc.RawCache = None,
+    manifest: RunManifest = None,
+):
+    """Download one ``union_unprocessed`` file per chunk and slice every
+    boundary's raw file out of it, instead of one request per boundary.
+
+    Only chunks with a boundary file still missing are downloaded. The union
+    files are kept, since the initial condition can be sliced from them too.
+    Returns the boundary raw files, or None if the access function did not
+    produce the union files (e.g. script-type methods), in which case the
+    caller falls back to per-boundary requests.
+    """
+    output_dir = Path(output_dir)
+    union_requests = _get_chunk_requests(
+        boundary="union",
+        start_date=start_date,
+        end_date=end_date,
+        get_step_days=get_step_days,
+        latlon=union,
+        output_dir=output_dir,
+        variables=variables,
+        extra_args=extra_args,
+        raw_cache=raw_cache,
+        manifest=manifest,
+    )
+    slices, union_tasks = [], []
+    for request in union_requests:
+        date_part = request["output_filename"].removeprefix("union_unprocessed.")
+        missing = [
+            output_dir / f"{boundary}_unprocessed.{date_part}"
+            for boundary in boundaries
+            if not utils.existing_artifact(
+                output_dir / f"{boundary}_unprocessed.{date_part}", manifest
+            )
+        ]
+        if missing:
+            union_tasks.append(
+                dict(product_name=product_name, function_name=function_name, **request)
+            )
+            union_file = output_dir / request["output_filename"]
+            slices += [
+                dict(
+                    src_path=union_file,
+                    dest_path=dest,
+                    latlon=bounding_boxes[dest.name.split("_")[0]],
+                    coords=coords,
+                )
+                for dest in missing
+            ]
+
+    logger.info(
+        "GET [union of %s]: %d requests instead of %d",
+        ", ".join(boundaries),
+        len(union_tasks),
+        len(union_tasks) * len(boundaries),
+    )
+    union_files = utils.run_tasks(
+        _get_chunk,
+        union_tasks,
+        max_workers=max_workers,
+        executor=executor,
+        span=_get_span,
+    )
+    if not all(utils.is_valid_netcdf(f) for f in union_files):
+        return None
+    sliced = utils.run_tasks(
+        utils.slice_raw_file,
+        slices,
+        max_workers=max_workers,
+        span=lambda task: (
+            task["dest_path"].name.split("_")[0],
+            "GET",
+            task["dest_path"].stem.split(".")[-1],
+        ),
+    )
+    if manifest is not None:
+        for path in sliced:
+            manifest.record(path)
+    return [
+        output_dir / request["output_filename"].replace("union", boundary, 1)
+        for boundary in boundaries
+        for request in union_requests
+    ]
+
+
+def _open_raw(raw_files: list) -> xr.Dataset:
+    """Lazily open a boundary's raw files as one dataset along time."""
+    return xr.open_mfdataset(
+        [str(f) for f in sorted(raw_files)],
+        combine="nested",
+        concat_dim="time",
+        coords="minimal",
+        parallel=False,
+    )
+
+
+def _load_hgrid(hgrid_path) -> xr.Dataset:
+    """Read the supergrid into memory and close the file."""
+    with xr.open_dataset(hgrid_path) as ds:
+        return ds.load()
+
+
+def _regridded_path(output_folder: Path, seg_id: int, chunk_start, chunk_end) -> Path:
+    start_str = chunk_start.strftime("%Y-%m-%d")
+    end_str = chunk_end.strftime("%Y-%m-%d")
+    return output_folder / f"forcing_obc_segment_{seg_id:03d}_{start_str}_{end_str}.nc"
+
+
+def _existing_regridded_file(dated_output: Path, manifest: RunManifest = None) -> bool:
+    """Return True if a valid regridded slice already exists (raise if corrupt)."""
+    return utils.existing_artifact(dated_output, manifest)
+
+
+def _regrid_slice(
+    boundary: str,
+    seg_id: int,
+    ds_full: xr.Dataset,
+    chunk_start: datetime,
+    chunk_end: datetime,
+    start_date: datetime,
+    hgrid: xr.Dataset,
+    output_folder: Path,
+    dataset_varnames: dict,
+    fill_method,
+    regridders=None,
+    work_folder: Path = None,
+    manifest: RunManifest = None,
+    save_weights_to: Path = None,
+):
+    """Regrid one regrid_step slice of a boundary to its dated output file.
+
+    work_folder is where rm6 writes its undated output before it is renamed
+    into output_folder; slices of the same segment that run concurrently each
+    need their own. The dated output is recorded in manifest once renamed.
+    save_weights_to: where to save the regridders built for this slice. They
+    are saved before the output is renamed into place, so an existing output
+    always comes with its weights.
+    Returns (dated_output, regridders) so the caller can reuse the regridders
+    on the next slice.
+    """
+    work_folder = Path(work_folder or output_folder)
+    dated_output = _regridded_path(output_folder, seg_id, chunk_start, chunk_end)
+    start_str = chunk_start.strftime("%Y-%m-%d")
+    end_str = chunk_end.strftime("%Y-%m-%d")
+
+    kwargs = {}
+    if "calendar" in dataset_varnames:
+        kwargs["calendar"] = dataset_varnames["calendar"]
+        kwargs["time_units"] = dataset_varnames["time_units"]
+
+    tmp_file = work_folder / f"_tmp_{boundary}_{start_str}_{end_str}.nc"
+    # Raw product timestamps (e.g. GLORYS daily means) are stamped at
+    # noon, not midnight — push chunk_end to end-of-day so label-based
+    # .sel() doesn't silently drop the last day's sample at each chunk
+    # boundary. Mirrors make_dates_end_inclusive in raw_data_access.
+    chunk_end_inclusive = chunk_end + timedelta(hours=23, minutes=59, seconds=59)
+    end_str = chunk_end_inclusive.strftime("%Y-%m-%d")
+    ds_full.sel(time=slice(start_str, end_str)).to_netcdf(tmp_file)
+
+    try:
+        seg = rm6.segment(
+            hgrid=hgrid,
+            bathymetry_path=None,
+            outfolder=work_folder,
+            segment_name=f"segment_{seg_id:03d}",
+            orientation=boundary,
+            startdate=start_date,
+            repeat_year_forcing=False,
+        )
+        seg.regrid_velocity_tracers(
+            infile=tmp_file,
+            varnames=dataset_varnames,
+            arakawa_grid=None,
+            rotational_method=rm6.rotation.RotationMethod.EXPAND_GRID,
+            regridding_method="bilinear",
+            fill_method=fill_method,
+            regridders=regridders,
+            calendar=dataset_varnames["cf_calendar"],
+            time_units=dataset_varnames["time_units"],
+            **kwargs,
+        )
+        if save_weights_to is not None:
+            _save_regridders(seg.regridders, save_weights_to)
+        temp_path = work_folder / f"forcing_obc_segment_{seg_id:03d}.nc"
+        os.rename(temp_path, dated_output)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+    if manifest is not None:
+        manifest.record(
+            dated_output,
+            dict(
+                boundary=boundary,
+                seg_id=seg_id,
+                dates=[f"{chunk_start:%Y-%m-%d}", f"{chunk_end:%Y-%m-%d}"],
+            ),
+        )
+
+    if report.current() is not None:
+        report.annotate(
+            work_phase="bc_regrid",
+            work=estimate.segment_work(
+                hgrid, boundary, (chunk_end - chunk_start).days + 1
+            ),
         )
+    logger.info(f"Saved regridded file as {dated_output.name}")
+    return dated_output, seg.regridders
+
+
+_BOUNDARY_EDGES = {
+    "north": {"nyp": slice(-2, None)},
+    "south": {"nyp": slice(0, 2)},
+    "east": {"nxp": slice(-2, None)},
+    "west": {"nxp": slice(0, 2)},
+}
+_SOURCE_COORD_KEYS = (
+    "tracer_x_coord",
+    "tracer_y_coord",
+    "u_x_coord",
+    "u_y_coord",
+    "v_x_coord",
+    "v_y_coord",
+)
+
+
+def _weights_key(
+    hgrid: xr.Dataset, boundary: str, ds_full: xr.Dataset, dataset_varnames: dict
+) -> str:
+    """Fingerprint everything a boundary's regridders depend on, but not the dates.
+
+    That is the hgrid rows/columns along the segment (two of them, since the
+    rotation angle uses the neighbouring row), the source lat/lon the raw data
+    was subset to, the regridding method and the rotation mode.
+    """
+    coords = sorted(
+        {dataset_varnames[k] for k in _SOURCE_COORD_KEYS if k in dataset_varnames}
+    )
+    edge = _BOUNDARY_EDGES[boundary]
+    return wc.fingerprint(
+        hgrid["x"].isel(edge),
+        hgrid["y"].isel(edge),
+        *(ds_full[c] for c in coords),
+        boundary=boundary,
+        source_coords=coords,
+        method="bilinear",
+        rotation="EXPAND_GRID",
+    )
+
+
+def _save_regridders(regridders: dict, weights_path: Path) -> Path:
+    """Pickle regridders to weights_path through a temporary file, so a killed
+    or concurrent writer never leaves a truncated pickle under that name."""
+    weights_path = Path(weights_path)
+    tmp_path = weights_path.with_name(f".{weights_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(regridders, f)
+        os.replace(tmp_path, weights_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return weights_path
 
 
 def _regrid_boundary(
@@ -200,124 +691,861 @@ def _regrid_boundary(
     output_folder,
     dataset_varnames: dict,
     fill_method,
+    weight_cache: wc.WeightCache = None,
+    manifest: RunManifest = None,
 ) -> list:
     """Regrid all raw files for one boundary, sliced by regrid_step_days.
 
     Opens raw files lazily via open_mfdataset, independent of how GET chunked
-    them. Regridder weights are computed once on the first chunk and reused.
-    Each regrid_step slice is written to a temp file (required by the rm6
-    interface), then removed after regridding.
+    them. Regridder weights are computed once on the first chunk and reused,
+    or taken straight from weight_cache when an earlier run already built them
+    for the same grids. Each regrid_step slice is written to a temp file
+    (required by the rm6 interface), then removed after regridding.
     """
     output_folder = Path(output_folder)
     (output_folder / "weights").mkdir(exist_ok=True)
 
-    ds_full = xr.open_mfdataset(
-        [str(f) for f in sorted(raw_files)],
-        combine="nested",
-        concat_dim="time",
-        coords="minimal",
-        parallel=False,
-    )
+    ds_full = _open_raw(raw_files)
 
     regridders = None
     regridded_files = []
+    hgrid = _load_hgrid(hgrid_path)
 
-    kwargs = {}
-    if "calendar" in dataset_varnames:
-        kwargs["calendar"] = dataset_varnames["calendar"]
-        kwargs["time_units"] = dataset_varnames["time_units"]
-    hgrid = xr.open_dataset(hgrid_path)
+    key = None
+    if weight_cache is not None:
+        key = _weights_key(hgrid, boundary, ds_full, dataset_varnames)
+        cached = weight_cache.get(key, ".pkl")
+        if cached is not None:
+            with open(cached, "rb") as f:
+                regridders = pickle.load(f)
+            key = None  # already cached, nothing to add afterwards
 
     for chunk_start, chunk_end in _make_date_pairs(
         start_date, end_date, regrid_step_days
     ):
-        start_str = chunk_start.strftime("%Y-%m-%d")
-        end_str = chunk_end.strftime("%Y-%m-%d")
-        dated_output = (
-            output_folder / f"forcing_obc_segment_{seg_id:03d}_{start_str}_{end_str}.nc"
+        dated_output = _regridded_path(output_folder, seg_id, chunk_start, chunk_end)
+        if not _existing_regridded_file(dated_output, manifest):
+            with report.span(
+                boundary, "REGRID", f"{chunk_start:%Y-%m-%d}_{chunk_end:%Y-%m-%d}"
+            ):
+                dated_output, regridders = _regrid_slice(
+                    boundary=boundary,
+                    seg_id=seg_id,
+                    ds_full=ds_full,
+                    chunk_start=chunk_start,
+                    chunk_end=chunk_end,
+                    start_date=start_date,
+                    hgrid=hgrid,
+                    output_folder=output_folder,
+                    dataset_varnames=dataset_varnames,
+                    fill_method=fill_method,
+                    regridders=regridders,
+                    manifest=manifest,
+                )
+        regridded_files.append(dated_output)
+
+    if key is not None and regridders is not None:
+        weight_cache.put(
+            key,
+            ".pkl",
+            _save_regridders(regridders, _weights_path(output_folder, seg_id)),
         )
+    ds_full.close()
+    return regridded_files
 
-        if dated_output.exists():
-            if not utils.is_valid_netcdf(dated_output):
-                raise RuntimeError(
-                    f"Regridded file {dated_output} exists but is not valid NetCDF. "
-                    "Delete it and re-run."
-                )
-            logger.info(f"Regridded file {dated_output.name} already exists. Skipping.")
-            regridded_files.append(dated_output)
+
+# ---------------------------------------------------------------------------
+# Parallel REGRID engine — weights built once per boundary, slices fanned out
+# ---------------------------------------------------------------------------
+
+
+def _weights_path(output_folder: Path, seg_id: int) -> Path:
+    return output_folder / "weights" / f"segment_{seg_id:03d}_regridders.pkl"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_regridders(weights_path: str, mtime_ns: int) -> dict:
+    """Load a boundary's persisted regridders, once per worker process.
+
+    mtime_ns is part of the cache key so a weights file rewritten by a later
+    run is never served from a stale cache entry.
+    """
+    with open(weights_path, "rb") as f:
+        return pickle.load(f)
+
+
+def _regrid_slice_task(
+    raw_files: list,
+    hgrid_path,
+    weights_path,
+    output_folder,
+    chunk_start: datetime,
+    chunk_end: datetime,
+    seg_id: int,
+    **kwargs,
+) -> Path:
+    """Regrid one slice in a worker, reusing the boundary's weights from disk.
+
+    Each task gets a private work folder, because rm6 writes every slice of a
+    segment to the same undated filename before it is renamed.
+    """
+    output_folder = Path(output_folder)
+    regridders = None
+    if weights_path is not None:
+        regridders = _load_regridders(
+            str(weights_path), Path(weights_path).stat().st_mtime_ns
+        )
+    work_folder = output_folder / (
+        f"_work_{seg_id:03d}_{chunk_start:%Y-%m-%d}_{chunk_end:%Y-%m-%d}"
+    )
+    work_folder.mkdir(exist_ok=True)
+    ds_full = _open_raw(raw_files)
+    try:
+        dated_output, regridders = _regrid_slice(
+            ds_full=ds_full,
+            hgrid=_load_hgrid(hgrid_path),
+            output_folder=output_folder,
+            chunk_start=chunk_start,
+            chunk_end=chunk_end,
+            seg_id=seg_id,
+            regridders=regridders,
+            work_folder=work_folder,
+            # First slice of the boundary: persist its weights for the others
+            save_weights_to=(
+                _weights_path(output_folder, seg_id) if weights_path is None else None
+            ),
+            **kwargs,
+        )
+    finally:
+        ds_full.close()
+        shutil.rmtree(work_folder, ignore_errors=True)
+    return dated_output
+
+
+def _regrid_boundaries(
+    boundary_specs: list,
+    start_date: datetime,
+    end_date: datetime,
+    regrid_step_days: int,
+    hgrid_path,
+    output_folder,
+    dataset_varnames: dict,
+    fill_method,
+    max_workers: int = 1,
+    weight_cache: wc.WeightCache = None,
+    manifest: RunManifest = None,
+) -> dict:
+    """Regrid every boundary, returning {boundary: [regridded files]}.
+
+    boundary_specs is a list of (boundary, seg_id, raw_files). With
+    max_workers <= 1 each boundary goes through _regrid_boundary in turn.
+    Otherwise REGRID runs on a process pool in two waves:
+
+    1. the first pending slice of every boundary, in parallel across
+       boundaries. This builds the boundary's xESMF regridders, which are
+       persisted to ``weights/segment_NNN_regridders.pkl``;
+    2. all remaining (boundary, slice) pairs, each worker loading its
+       boundary's regridders from disk instead of recomputing the weights.
+
+    A boundary whose regridders are already in weight_cache skips the first
+    wave entirely.
+
+    Every slice goes through the same _regrid_slice call as the serial path,
+    so the output files are identical.
+    """
+    output_folder = Path(output_folder)
+    if max_workers is None or max_workers <= 1:
+        regridded_files_by_boundary = {}
+        for boundary, seg_id, raw_files in boundary_specs:
+            logger.info("REGRID [%s]: %d-day slices", boundary, regrid_step_days)
+            regridded_files_by_boundary[boundary] = _regrid_boundary(
+                boundary=boundary,
+                seg_id=seg_id,
+                raw_files=raw_files,
+                start_date=start_date,
+                end_date=end_date,
+                regrid_step_days=regrid_step_days,
+                hgrid_path=hgrid_path,
+                output_folder=output_folder,
+                dataset_varnames=dataset_varnames,
+                fill_method=fill_method,
+                weight_cache=weight_cache,
+                manifest=manifest,
+            )
+        return regridded_files_by_boundary
+
+    (output_folder / "weights").mkdir(exist_ok=True)
+    pairs = _make_date_pairs(start_date, end_date, regrid_step_days)
+    regridded_files_by_boundary = {}
+    first_wave, second_wave = [], []
+    keys_to_cache = {}
+    hgrid = _load_hgrid(hgrid_path)
+    for boundary, seg_id, raw_files in boundary_specs:
+        logger.info(
+            "REGRID [%s]: %d-day slices on %d workers",
+            boundary,
+            regrid_step_days,
+            max_workers,
+        )
+        regridded_files_by_boundary[boundary] = [
+            _regridded_path(output_folder, seg_id, *pair) for pair in pairs
+        ]
+        pending = [
+            pair
+            for pair in pairs
+            if not _existing_regridded_file(
+                _regridded_path(output_folder, seg_id, *pair), manifest
+            )
+        ]
+        tasks = [
+            dict(
+                boundary=boundary,
+                seg_id=seg_id,
+                raw_files=raw_files,
+                chunk_start=chunk_start,
+                chunk_end=chunk_end,
+                start_date=start_date,
+                hgrid_path=hgrid_path,
+                output_folder=output_folder,
+                dataset_varnames=dataset_varnames,
+                fill_method=fill_method,
+                weights_path=_weights_path(output_folder, seg_id),
+                manifest=manifest,
+            )
+            for chunk_start, chunk_end in pending
+        ]
+        if not tasks:
             continue
+        if weight_cache is not None:
+            with _open_raw(raw_files) as ds_full:
+                key = _weights_key(hgrid, boundary, ds_full, dataset_varnames)
+            if weight_cache.materialize(
+                key, ".pkl", _weights_path(output_folder, seg_id)
+            ):
+                second_wave += tasks
+                continue
+            keys_to_cache[seg_id] = key
+        # Weights from an earlier run may belong to a different grid
+        # or product, so always rebuild them on the first pending slice.
+        tasks[0]["weights_path"] = None
+        first_wave.append(tasks[0])
+        second_wave += tasks[1:]
+
+    utils.run_tasks(
+        _regrid_slice_task,
+        first_wave,
+        max_workers=max_workers,
+        executor="process",
+        span=_regrid_span,
+    )
+    for seg_id, key in keys_to_cache.items():
+        weight_cache.put(key, ".pkl", _weights_path(output_folder, seg_id))
+    utils.run_tasks(
+        _regrid_slice_task,
+        second_wave,
+        max_workers=max_workers,
+        executor="process",
+        span=_regrid_span,
+    )
+    return regridded_files_by_boundary
+
+
+# ---------------------------------------------------------------------------
+# Pipelined engine — GET, REGRID and MERGE overlap
+# ---------------------------------------------------------------------------
+
+
+def _run_pipeline(
+    boundary_specs: list,
+    start_date: datetime,
+    end_date: datetime,
+    get_step_days,
+    regrid_step_days: int,
+    hgrid_path,
+    raw_dir,
+    regridded_dir,
+    output_dir,
+    product_name: str,
+    function_name: str,
+    variables: list,
+    extra_args: dict,
+    dataset_varnames: dict,
+    fill_method,
+    max_workers: int = 1,
+    executor: str = "thread",
+    weight_cache: wc.WeightCache = None,
+    strip_halo: float = None,
+    raw_cache: rc.RawCache = None,
+    manifest: RunManifest = None,
+) -> dict:
+    """Run GET → REGRID → MERGE as one producer/consumer pipeline.
+
+    boundary_specs is a list of (boundary, seg_id). Downloads run on a GET
+    pool of max_workers (thread or process, per executor) and regridding on a
+    separate process pool of max_workers, so the network and the CPUs are
+    busy at the same time. A scheduler reacts to each finished task:
+
+    - a REGRID slice is submitted once every GET chunk overlapping it is on
+      disk; the first slice of a boundary builds its weights (or they come
+      from weight_cache) and the rest wait for them, as in _regrid_boundaries;
+    - a boundary is merged once all of its slices are regridded.
+
+    Every task keeps its phase's skip-if-valid check and atomic write, so a
+    failed pipelined run resumes exactly like a phased one. Only the GET
+    chunks needed by slices that are not yet regridded are downloaded. If a
+    task fails, no new work is started, running tasks are allowed to finish,
+    and the first failure is re-raised. Returns {boundary: merged file}.
+    """
+    regridded_dir = Path(regridded_dir)
+    (regridded_dir / "weights").mkdir(exist_ok=True)
+    hgrid = _load_hgrid(hgrid_path)
+    bounding_boxes = Grid.get_bounding_boxes(hgrid)
+    get_pairs = _make_date_pairs(start_date, end_date, get_step_days)
+    regrid_pairs = _make_date_pairs(start_date, end_date, regrid_step_days)
+
+    state = {}
+    for boundary, seg_id in boundary_specs:
+        requests = _get_chunk_requests(
+            boundary=boundary,
+            start_date=start_date,
+            end_date=end_date,
+            get_step_days=get_step_days,
+            latlon=bounding_boxes[boundary],
+            output_dir=raw_dir,
+            variables=variables,
+            extra_args=extra_args,
+            strip=(
+                None
+                if strip_halo is None
+                else _boundary_strip(hgrid, boundary, strip_halo)
+            ),
+            raw_cache=raw_cache,
+            manifest=manifest,
+        )
+        pending = [
+            pair
+            for pair in regrid_pairs
+            if not _existing_regridded_file(
+                _regridded_path(regridded_dir, seg_id, *pair), manifest
+            )
+        ]
+        state[boundary] = dict(
+            seg_id=seg_id,
+            requests=requests,
+            raw_files={},  # GET chunk index -> downloaded file
+            pending=pending,
+            needs={
+                pair: [
+                    i
+                    for i, (g_start, g_end) in enumerate(get_pairs)
+                    if g_start <= pair[1] and g_end >= pair[0]
+                ]
+                for pair in pending
+            },
+            weights="missing",  # -> "building" -> "ready"
+            cache_key=None,
+            in_flight=0,
+            merged=None,
+        )
 
-        tmp_file = output_folder / f"_tmp_{boundary}_{start_str}_{end_str}.nc"
-        # Raw product timestamps (e.g. GLORYS daily means) are stamped at
-        # noon, not midnight — push chunk_end to end-of-day so label-based
-        # .sel() doesn't silently drop the last day's sample at each chunk
-        # boundary. Mirrors make_dates_end_inclusive in raw_data_access.
-        chunk_end_inclusive = chunk_end + timedelta(hours=23, minutes=59, seconds=59)
-        end_str = chunk_end_inclusive.strftime("%Y-%m-%d")
-        ds_full.sel(time=slice(start_str, end_str)).to_netcdf(tmp_file)
-
-        try:
-            seg = rm6.segment(
-                hgrid=hgrid,
-                bathymetry_path=None,
-                outfolder=output_folder,
-                segment_name=f"segment_{seg_id:03d}",
-                orientation=boundary,
-                startdate=start_date,
-                repeat_year_forcing=False,
+    get_pool = utils.EXECUTORS[executor](max_workers=max_workers)
+    regrid_pool = utils.EXECUTORS["process"](max_workers=max_workers)
+    merge_pool = ThreadPoolExecutor(max_workers=1)
+    futures = {}
+
+    def schedule(boundary):
+        st = state[boundary]
+        seg_id = st["seg_id"]
+        weights_path = _weights_path(regridded_dir, seg_id)
+        if (
+            weight_cache is not None
+            and st["weights"] == "missing"
+            and st["cache_key"] is None
+            and st["raw_files"]
+        ):
+            with _open_raw(list(st["raw_files"].values())[:1]) as ds:
+                st["cache_key"] = _weights_key(hgrid, boundary, ds, dataset_varnames)
+            if weight_cache.materialize(st["cache_key"], ".pkl", weights_path):
+                st["weights"] = "ready"
+        for pair in list(st["pending"]):
+            if not all(i in st["raw_files"] for i in st["needs"][pair]):
+                continue
+            if st["weights"] == "building":
+                break
+            build = st["weights"] == "missing"
+            st["weights"] = "building" if build else st["weights"]
+            st["pending"].remove(pair)
+            st["in_flight"] += 1
+            logger.info(
+                "REGRID [%s]: %s → %s", boundary, pair[0].date(), pair[1].date()
             )
-            seg.regrid_velocity_tracers(
-                infile=tmp_file,
-                varnames=dataset_varnames,
-                arakawa_grid=None,
-                rotational_method=rm6.rotation.RotationMethod.EXPAND_GRID,
-                regridding_method="bilinear",
+            fut = report.submit(
+                regrid_pool,
+                "process",
+                (boundary, "REGRID", f"{pair[0]:%Y-%m-%d}_{pair[1]:%Y-%m-%d}"),
+                _regrid_slice_task,
+                boundary=boundary,
+                seg_id=seg_id,
+                raw_files=[st["raw_files"][i] for i in st["needs"][pair]],
+                chunk_start=pair[0],
+                chunk_end=pair[1],
+                start_date=start_date,
+                hgrid_path=hgrid_path,
+                output_folder=regridded_dir,
+                dataset_varnames=dataset_varnames,
                 fill_method=fill_method,
-                regridders=regridders,
-                calendar=dataset_varnames["cf_calendar"],
-                time_units=dataset_varnames["time_units"],
-                **kwargs,
+                weights_path=None if build else weights_path,
+                manifest=manifest,
             )
-            regridders = seg.regridders
-            temp_path = output_folder / f"forcing_obc_segment_{seg_id:03d}.nc"
-            os.rename(temp_path, dated_output)
-        finally:
-            tmp_file.unlink(missing_ok=True)
+            futures[fut] = ("regrid", boundary, build)
+        if not st["pending"] and not st["in_flight"] and st["merged"] is None:
+            regridded_files = _validate_coverage(
+                [_regridded_path(regridded_dir, seg_id, *p) for p in regrid_pairs],
+                lambda f: _parse_regridded_filename_dates(f, seg_id),
+                f"segment {seg_id:03d}",
+                start_date,
+                end_date,
+            )
+            logger.info("MERGE [%s]", boundary)
+            st["merged"] = report.submit(
+                merge_pool,
+                "thread",
+                (boundary, "MERGE"),
+                _merge_boundary,
+                boundary_label=f"{seg_id:03d}",
+                regridded_files=regridded_files,
+                output_folder=str(output_dir),
+                manifest=manifest,
+            )
+            futures[st["merged"]] = ("merge", boundary, None)
+
+    try:
+        for boundary, st in state.items():
+            needed = sorted({i for pair in st["pending"] for i in st["needs"][pair]})
+            logger.info("GET [%s]: %d chunks", boundary, len(needed))
+            for i in needed:
+                fut = report.submit(
+                    get_pool,
+                    executor,
+                    _get_span(st["requests"][i]),
+                    _get_chunk,
+                    product_name=product_name,
+                    function_name=function_name,
+                    **st["requests"][i],
+                )
+                futures[fut] = ("get", boundary, i)
+            schedule(boundary)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for fut in done:
+                phase, boundary, info = futures.pop(fut)
+                result = fut.result()
+                st = state[boundary]
+                if phase == "get":
+                    st["raw_files"][info] = result
+                elif phase == "regrid":
+                    st["in_flight"] -= 1
+                    if info:
+                        st["weights"] = "ready"
+                        if st["cache_key"] is not None:
+                            weight_cache.put(
+                                st["cache_key"],
+                                ".pkl",
+                                _weights_path(regridded_dir, st["seg_id"]),
+                            )
+                if phase != "merge":
+                    schedule(boundary)
+    finally:
+        # Cancel queued work but let running tasks finish their writes
+        for pool in (get_pool, regrid_pool, merge_pool):
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    return {boundary: st["merged"].result() for boundary, st in state.items()}
+
+
+def _create_like(out: nc.Dataset, src: nc.Dataset, time_dim: str):
+    """Copy src's attributes, dimensions and variable definitions into out,
+    making time_dim unlimited, and fill in the time-independent variables."""
+    out.setncatts({k: src.getncattr(k) for k in src.ncattrs()})
+    for name, dim in src.dimensions.items():
+        out.createDimension(name, None if name == time_dim else len(dim))
+    for name, var in src.variables.items():
+        attrs = {k: var.getncattr(k) for k in var.ncattrs()}
+        filters = var.filters() or {}
+        new = out.createVariable(
+            name,
+            var.datatype,
+            var.dimensions,
+            fill_value=attrs.pop("_FillValue", None),
+            zlib=filters.get("zlib", False),
+            complevel=filters.get("complevel", 4),
+            shuffle=filters.get("shuffle", True),
+        )
+        new.set_auto_maskandscale(False)
+        new.setncatts(attrs)
+        if time_dim not in var.dimensions:
+            new[...] = var[...]
+
+
+def _chunk_times(src: nc.Dataset, time_dim: str, units, calendar) -> np.ndarray:
+    """Return src's time values, converted to units/calendar if it uses others."""
+    times = src[time_dim][:]
+    src_units = getattr(src[time_dim], "units", units)
+    if src_units != units:
+        times = cftime.date2num(
+            cftime.num2date(times, src_units, calendar), units, calendar
+        )
+    return np.asarray(times)
 
-        logger.info(f"Saved regridded file as {dated_output.name}")
-        regridded_files.append(dated_output)
 
-    ds_full.close()
-    return regridded_files
+def _append_chunks(
+    out: nc.Dataset, chunk_files: list, time_dim: str, drop_overlap: bool = False
+):
+    """Append chunk_files' time-dependent variables to out along time_dim.
+
+    Each chunk is written one variable at a time after the steps already in
+    out, converting its times to out's units. Times must be strictly
+    increasing, also across the steps already written, unless drop_overlap is
+    set: then a chunk's steps at or before out's last time are dropped, so
+    chunks that overlap what is already there can be appended.
+
+    Returns the number of time steps and bytes appended.
+    """
+    time_vars = {name for name, v in out.variables.items() if time_dim in v.dimensions}
+    units = getattr(out[time_dim], "units", None)
+    calendar = getattr(out[time_dim], "calendar", "standard")
+    n_times = len(out.dimensions[time_dim])
+    last_time = out[time_dim][n_times - 1] if n_times else None
+    n_appended = n_bytes = 0
+
+    for path in chunk_files:
+        with nc.Dataset(path) as src:
+            src.set_auto_maskandscale(False)
+            chunk_vars = {
+                name for name, v in src.variables.items() if time_dim in v.dimensions
+            }
+            if chunk_vars != time_vars:
+                raise ValueError(
+                    f"{Path(path).name} has time-dependent variables "
+                    f"{sorted(chunk_vars)}, expected {sorted(time_vars)}."
+                )
+            times = _chunk_times(src, time_dim, units, calendar)
+            keep = slice(None)
+            if drop_overlap and last_time is not None:
+                keep = slice(np.searchsorted(times, last_time, side="right"), None)
+                times = times[keep]
+            if len(times) == 0:
+                continue
+            if np.any(np.diff(times) <= 0) or (
+                last_time is not None and times[0] <= last_time
+            ):
+                raise ValueError(
+                    f"Time in {Path(path).name} is not strictly increasing "
+                    f"after the previous chunks. Check the regridded files "
+                    f"for overlaps."
+                )
+            last_time = times[-1]
+
+            steps = slice(n_times, n_times + len(times))
+            for name in chunk_vars:
+                var = src[name]
+                index = [slice(None)] * var.ndim
+                src_index = list(index)
+                axis = var.dimensions.index(time_dim)
+                index[axis], src_index[axis] = steps, keep
+                out[name][tuple(index)] = (
+                    times if name == time_dim else var[tuple(src_index)]
+                )
+        n_times += len(times)
+        n_appended += len(times)
+        n_bytes += Path(path).stat().st_size
+    return n_appended, n_bytes
+
+
+def _stream_merge(
+    chunk_files: list,
+    output_path: Path,
+    time_dim: str = "time",
+    drop_overlap: bool = False,
+):
+    """Concatenate chunk_files along time_dim into output_path, one chunk at a time.
+
+    The output is laid out like the first chunk, with time_dim unlimited, and
+    each chunk's time-dependent variables are then appended in order, one
+    variable at a time. Memory is therefore bounded by a single chunk variable
+    however many chunks there are. Time-independent variables and all
+    attributes come from the first chunk. Times must be strictly increasing
+    across chunks (see _append_chunks for drop_overlap); a chunk with
+    different time units is converted to the first chunk's. The merge is
+    written to a temporary name and renamed into place, so an interrupted run
+    never leaves a partial output_path behind.
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    t_start = time.perf_counter()
+    try:
+        with nc.Dataset(chunk_files[0]) as first, nc.Dataset(
+            tmp_path, "w", format=first.data_model
+        ) as out:
+            first.set_auto_maskandscale(False)
+            _create_like(out, first, time_dim)
+            n_times, n_bytes = _append_chunks(
+                out, chunk_files, time_dim, drop_overlap=drop_overlap
+            )
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    elapsed = time.perf_counter() - t_start
+    logger.info(
+        f"Merged {len(chunk_files)} chunks ({n_times} time steps, "
+        f"{n_bytes / 1e6:.1f} MB) into {output_path.name} in {elapsed:.1f}s "
+        f"({n_bytes / 1e6 / max(elapsed, 1e-9):.1f} MB/s)"
+    )
+    return output_path
 
 
-def _merge_boundary(boundary_label: str, regridded_files: list, output_folder) -> Path:
-    """Merge all regridded chunks for one boundary into the final forcing file."""
+def _merge_boundary(
+    boundary_label: str,
+    regridded_files: list,
+    output_folder,
+    manifest: RunManifest = None,
+) -> Path:
+    """Merge all regridded chunks for one boundary into the final forcing file.
+
+    With a manifest, the merged file is recorded with the chunks it was built
+    from, and a merged file built from a different set of chunks is rebuilt.
+    """
     output_folder = Path(output_folder)
     output_path = output_folder / f"forcing_obc_segment_{boundary_label}.nc"
+    params = dict(chunks=[Path(f).name for f in regridded_files])
 
-    if output_path.exists():
-        if not utils.is_valid_netcdf(output_path):
-            raise RuntimeError(
-                f"Merged OBC file {output_path} exists but is not valid NetCDF. "
-                "Delete it and re-run."
-            )
-        logger.info(f"Merged file {output_path.name} already exists. Skipping.")
+    if utils.existing_artifact(output_path, manifest, params):
         return output_path
 
-    ds = xr.open_mfdataset(
-        [str(p) for p in regridded_files],
-        combine="nested",
-        concat_dim="time",
-        coords="minimal",
-        parallel=False,
-    )
-    ds.to_netcdf(output_path)
-    ds.close()
+    _stream_merge(regridded_files, output_path)
+    if manifest is not None:
+        manifest.record(output_path, params)
     logger.info(f"Saved merged boundary at {output_path}")
     return output_path
 
 
+def _merged_end_date(merged_path: Path, time_dim: str = "time") -> datetime:
+    """Return the date of the last time step in a merged segment file."""
+    with nc.Dataset(merged_path) as ds:
+        times = ds[time_dim]
+        if len(times) == 0:
+            raise ValueError(f"{Path(merged_path).name} has no time steps.")
+        last = cftime.num2date(
+            times[-1], times.units, getattr(times, "calendar", "standard")
+        )
+    return datetime(last.year, last.month, last.day)
+
+
+def _extend_boundary(
+    boundary_label: str,
+    regridded_files: list,
+    output_folder,
+    manifest: RunManifest = None,
+    time_dim: str = "time",
+) -> Path:
+    """Append new regridded chunks to an existing merged segment file in place.
+
+    Steps the merged file already holds are dropped from the chunks, so an
+    extension that was already (partly) appended is not duplicated. The
+    manifest entry is updated with the appended chunks. A merged file the
+    manifest no longer matches (an append interrupted part-way) is rebuilt
+    from the chunks recorded for it plus the new ones, as is a file without
+    an unlimited time dimension, which cannot grow in place.
+    """
+    output_path = Path(output_folder) / f"forcing_obc_segment_{boundary_label}.nc"
+    if not output_path.exists():
+        raise FileNotFoundError(
+            f"{output_path} does not exist, so there is nothing to extend. "
+            f"Process the full date range first."
+        )
+    old_chunks = []
+    state = None
+    if manifest is not None:
+        state = manifest.check(output_path)
+        old_chunks = (manifest.params(output_path) or {}).get("chunks", [])
+    new_chunks = [Path(f) for f in regridded_files]
+    # A file not built from recorded chunks cannot be rebuilt from them later
+    params = None
+    if old_chunks:
+        params = dict(
+            chunks=old_chunks + [f.name for f in new_chunks if f.name not in old_chunks]
+        )
+
+    with nc.Dataset(output_path) as ds:
+        unlimited = ds.dimensions[time_dim].isunlimited()
+    if state is False:
+        regridded_dir = new_chunks[0].parent
+        missing = [n for n in old_chunks if not (regridded_dir / n).exists()]
+        if not old_chunks or missing:
+            raise RuntimeError(
+                f"{output_path.name} changed since it was recorded and the "
+                f"regridded chunks it was built from are gone. Delete it and "
+                f"process the full date range again."
+            )
+        logger.info(f"Rebuilding {output_path.name} from its regridded chunks")
+        _stream_merge(
+            [regridded_dir / n for n in old_chunks] + new_chunks,
+            output_path,
+            time_dim,
+            drop_overlap=True,
+        )
+    elif not unlimited:
+        # Reading output_path while its replacement is written is safe
+        _stream_merge(
+            [output_path] + new_chunks, output_path, time_dim, drop_overlap=True
+        )
+    else:
+        t_start = time.perf_counter()
+        with nc.Dataset(output_path, "a") as out:
+            out.set_auto_maskandscale(False)
+            n_times, n_bytes = _append_chunks(
+                out, new_chunks, time_dim, drop_overlap=True
+            )
+        logger.info(
+            f"Appended {n_times} time steps ({n_bytes / 1e6:.1f} MB) to "
+            f"{output_path.name} in {time.perf_counter() - t_start:.1f}s"
+        )
+    if manifest is not None:
+        manifest.record(output_path, params)
+    return output_path
+
+
+# Workers for GET when max_workers is "auto": downloads are network-bound, so
+# the memory plan (made once raw headers exist) does not apply to them
+_AUTO_GET_WORKERS = 4
+# Slice length used in pipelined mode when "auto" has no raw files to plan from
+_DEFAULT_REGRID_STEP_DAYS = 30
+
+
+def _plan_regrid(
+    boundaries: list,
+    raw_path: Path,
+    start_date: datetime,
+    end_date: datetime,
+    memory_budget_gb: float = None,
+    regrid_step_days: int = None,
+    max_workers: int = None,
+):
+    """Plan REGRID slices and workers from the raw files on disk (see planner).
+
+    Uses the first valid raw file of each boundary and plans for the largest.
+    Returns None if no boundary has a raw file yet.
+    """
+    per_day = []
+    for boundary in boundaries:
+        for raw_file in sorted(raw_path.glob(f"{boundary}_unprocessed.*.nc")):
+            if utils.is_valid_netcdf(raw_file):
+                file_start, file_end = _parse_raw_filename_dates(raw_file, boundary)
+                per_day.append(
+                    planner.raw_bytes_per_day(
+                        raw_file, (file_end - file_start).days + 1
+                    )
+                )
+                break
+    if not per_day:
+        return None
+    return planner.plan_regrid(
+        bytes_per_day=max(per_day),
+        total_days=(end_date - start_date).days + 1,
+        n_boundaries=len(boundaries),
+        memory_budget=(
+            None if memory_budget_gb is None else int(memory_budget_gb * 1024**3)
+        ),
+        regrid_step_days=regrid_step_days,
+        max_workers=max_workers,
+    )
+
+
+def _strip_halo(product_info: dict, strip_halo_cells: int = None) -> float:
+    """Return the strip halo in degrees, or None when bounding boxes are downloaded."""
+    if strip_halo_cells is None:
+        return None
+    if "grid_resolution" not in product_info:
+        raise ValueError(
+            "Strip subsetting needs the source grid resolution: set "
+            "'grid_resolution' (degrees) in the product information."
+        )
+    return strip_halo_cells * product_info["grid_resolution"]
+
+
+def _fill_method(product_info: dict):
+    """Return the fill_method rm6 fills regridded segments with."""
+    if product_info.get("boundary_fill_method", "regional_mom6") != "regional_mom6":
+        raise ValueError(
+            f"fill_method '{product_info['boundary_fill_method']}' is not supported."
+        )
+    # Same result as rm6.regridding.fill_missing_data, with the fill computed
+    # once per segment mask instead of on every time step
+    return functools.partial(
+        fill.fill_missing_data, time_dim=product_info.get("time", "time")
+    )
+
+
+def _download_boxes(hgrid: xr.Dataset, boundaries: list, strip_halo: float = None):
+    """Return ({boundary: lat/lon boxes requested}, padding the access function adds)."""
+    if strip_halo is not None:
+        return {b: _boundary_strip(hgrid, b, strip_halo) for b in boundaries}, 0.0
+    bounding_boxes = Grid.get_bounding_boxes(hgrid)
+    return {b: [bounding_boxes[b]] for b in boundaries}, utils.RAW_LATLON_PAD
+
+
+def _preview_estimate(
+    boundaries: list,
+    hgrid_path,
+    start_date: datetime,
+    end_date: datetime,
+    get_pairs: list,
+    product_info: dict,
+    regrid_step_days,
+    max_workers,
+    strip_halo: float = None,
+    memory_budget_gb: float = None,
+    cost_model: estimate.CostModel = None,
+) -> dict:
+    """Estimate the cost of a run for preview (see estimate.estimate_obc).
+
+    "auto" slices and workers are planned from the estimated raw bytes per
+    day, since there are no raw files to read them from.
+    """
+    hgrid = _load_hgrid(hgrid_path)
+    boxes, pad = _download_boxes(hgrid, boundaries, strip_halo)
+    get_workers = _AUTO_GET_WORKERS if max_workers == "auto" else max_workers
+    if "auto" in (regrid_step_days, max_workers):
+        plan = planner.plan_regrid(
+            bytes_per_day=max(
+                estimate.download_bytes(b, 1, product_info, pad) for b in boxes.values()
+            ),
+            total_days=(end_date - start_date).days + 1,
+            n_boundaries=len(boundaries),
+            memory_budget=(
+                None if memory_budget_gb is None else int(memory_budget_gb * 1024**3)
+            ),
+            regrid_step_days=None if regrid_step_days == "auto" else regrid_step_days,
+            max_workers=None if max_workers == "auto" else max_workers,
+        )
+        regrid_step_days = plan["regrid_step_days"]
+        max_workers = plan["max_workers"]
+    return estimate.estimate_obc(
+        boxes,
+        hgrid,
+        get_pairs,
+        _make_date_pairs(start_date, end_date, regrid_step_days),
+        product_info,
+        pad=pad,
+        get_workers=get_workers,
+        regrid_workers=max_workers,
+        cost_model=cost_model,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
@@ -338,6 +1566,17 @@ def process_obc_conditions(
     regrid_step_days: int = 30,
     function_args: dict = None,
     preview: bool = False,
+    max_workers: int = 1,
+    executor: str = "thread",
+    weight_cache: wc.WeightCache = None,
+    pipeline: bool = False,
+    union_max_gb: float = None,
+    strip_halo_cells: int = None,
+    raw_cache: rc.RawCache = None,
+    manifest: RunManifest = None,
+    memory_budget_gb: float = None,
+    extend: bool = False,
+    cost_model: estimate.CostModel = None,
 ):
     """Process boundary conditions through the GET → REGRID → MERGE pipeline.
 
@@ -348,6 +1587,10 @@ def process_obc_conditions(
     range in one request; REGRID defaults to 30-day slices for memory
     efficiency.
 
+    regrid_step_days and max_workers may be ``"auto"``, in which case they are
+    planned after GET from the raw file headers and memory_budget_gb (see
+    planner.plan_regrid). The plan is returned so the caller can record it.
+
     Args:
         start_date: Forcing start date (datetime or any pandas-parseable string).
         end_date: Forcing end date (datetime or any pandas-parseable string).
@@ -360,12 +1603,47 @@ def process_obc_conditions(
         regridded_dataset_path: Directory for per-chunk regridded data.
         output_path: Directory for final, merged MOM6-ready output files.
         get_step_days: GET chunk size in days; None = full range in one request.
-        regrid_step_days: REGRID chunk size in days.
+        regrid_step_days: REGRID chunk size in days, or ``"auto"``.
         function_args: Overrides for the access function's non-required
             arguments (e.g. `member`), as resolved by
             configure_forcings()'s function_overrides.
-        preview: If True, return a dict of expected date pairs without
-            executing any downloads or regridding.
+        preview: If True, return a dict of expected date pairs and their
+            estimated cost (see estimate.estimate_obc) without executing any
+            downloads or regridding.
+        max_workers: Number of GET chunk downloads and REGRID slices (across
+            all boundaries) to run at once; 1 = one at a time. ``"auto"``
+            plans REGRID workers from the memory budget.
+        executor: Worker pool type for GET when max_workers > 1, ``"thread"``
+            or ``"process"``. REGRID is CPU-bound and always uses processes.
+        weight_cache: Shared cross-run cache of regridding weights; None
+            builds the weights from scratch on every run.
+        pipeline: If True, overlap the phases (see _run_pipeline) instead of
+            finishing every download before regridding starts.
+        union_max_gb: Download all boundaries with one request per chunk
+            when that download is estimated at no more than this many GB
+            (see _union_box); None always downloads per boundary. Not used
+            with pipeline.
+        strip_halo_cells: Download only a strip along each boundary, this
+            many source grid cells wide on each side, instead of the
+            boundary's whole bounding box. Needs ``grid_resolution`` (degrees)
+            in product_info. None downloads bounding boxes.
+        raw_cache: Raw-data cache shared across cases; None downloads every
+            chunk this case does not already have.
+        manifest: Run manifest consulted by every phase's skip check and
+            updated as each file completes; None falls back to checking
+            the files' NetCDF magic bytes only.
+        memory_budget_gb: Memory the auto plan may use; None uses most of
+            the memory currently available.
+        extend: Extend existing merged segment files to end_date instead of
+            building them: only the dates after the earliest last date of the
+            merged files are downloaded and regridded, and their chunks are
+            appended to the merged files in place (see _extend_boundary).
+            Always runs the phases one after another.
+        cost_model: Fitted estimate.CostModel giving the preview's expected
+            times; None leaves them out.
+
+    Returns:
+        The REGRID plan dict when anything was ``"auto"``, otherwise None.
     """
     start_date = pd.to_datetime(start_date).to_pydatetime()
     end_date = pd.to_datetime(end_date).to_pydatetime()
@@ -375,43 +1653,148 @@ def process_obc_conditions(
     output_path = Path(output_path)
     boundaries = list(boundary_number_conversion.keys())
 
+    auto_step = regrid_step_days == "auto"
+    auto_workers = max_workers == "auto"
+
+    if extend:
+        merged_ends = []
+        for boundary in boundaries:
+            merged = (
+                output_path
+                / f"forcing_obc_segment_{boundary_number_conversion[boundary]:03d}.nc"
+            )
+            if not merged.exists():
+                raise FileNotFoundError(
+                    f"Cannot extend the {boundary} boundary: {merged} does not "
+                    f"exist. Process the full date range first."
+                )
+            merged_ends.append(_merged_end_date(merged))
+        extend_start = min(merged_ends) + timedelta(days=1)
+        if extend_start > end_date:
+            logger.info(
+                f"Boundary forcing already reaches {end_date:%Y-%m-%d}; "
+                f"nothing to extend."
+            )
+            return None
+        logger.info(
+            f"Extending boundary forcing from {extend_start:%Y-%m-%d} "
+            f"to {end_date:%Y-%m-%d}"
+        )
+        start_date = extend_start
+        pipeline = False
+
+    strip_halo = _strip_halo(product_info, strip_halo_cells)
+
     if preview:
+        get_pairs = _make_date_pairs(start_date, end_date, get_step_days)
         return {
             "boundaries": boundaries,
-            "get_pairs": _make_date_pairs(start_date, end_date, get_step_days),
-            "regrid_pairs": _make_date_pairs(start_date, end_date, regrid_step_days),
+            "get_pairs": get_pairs,
+            "regrid_pairs": (
+                None
+                if auto_step
+                else _make_date_pairs(start_date, end_date, regrid_step_days)
+            ),
+            "estimate": _preview_estimate(
+                boundaries,
+                hgrid_path,
+                start_date,
+                end_date,
+                get_pairs,
+                product_info,
+                regrid_step_days=regrid_step_days,
+                max_workers=max_workers,
+                strip_halo=strip_halo,
+                memory_budget_gb=memory_budget_gb,
+                cost_model=cost_model,
+            ),
         }
 
     variables, extra_args = utils.build_forcing_request(product_info, function_args)
 
-    if product_info.get("boundary_fill_method", "regional_mom6") != "regional_mom6":
-        raise ValueError(
-            f"fill_method '{product_info['boundary_fill_method']}' is not supported."
-        )
-    fill_method = rm6.regridding.fill_missing_data
+    fill_method = _fill_method(product_info)
 
     raw_path.mkdir(exist_ok=True)
     regridded_path.mkdir(exist_ok=True)
     output_path.mkdir(exist_ok=True)
 
-    for boundary in boundaries:
-        seg_id = boundary_number_conversion[boundary]
+    def plan_regrid():
+        return _plan_regrid(
+            boundaries,
+            raw_path,
+            start_date,
+            end_date,
+            memory_budget_gb=memory_budget_gb,
+            regrid_step_days=None if auto_step else regrid_step_days,
+            max_workers=None if auto_workers else max_workers,
+        )
 
-        logger.info("GET [%s]: %s → %s", boundary, start_date.date(), end_date.date())
-        _get_boundary(
-            boundary=boundary,
+    plan = None
+    if pipeline:
+        if auto_step or auto_workers:
+            # REGRID starts before GET ends, so plan from an earlier run's raw
+            # files if there are any
+            plan = plan_regrid()
+            if plan is None:
+                logger.info("No raw files to plan REGRID from yet; using defaults.")
+                plan = dict(
+                    regrid_step_days=(
+                        _DEFAULT_REGRID_STEP_DAYS if auto_step else regrid_step_days
+                    ),
+                    max_workers=(
+                        (os.cpu_count() or 1) if auto_workers else max_workers
+                    ),
+                )
+            regrid_step_days = plan["regrid_step_days"]
+            max_workers = plan["max_workers"]
+        _run_pipeline(
+            boundary_specs=[(b, boundary_number_conversion[b]) for b in boundaries],
             start_date=start_date,
             end_date=end_date,
             get_step_days=get_step_days,
+            regrid_step_days=regrid_step_days,
             hgrid_path=str(hgrid_path),
-            output_dir=str(raw_path),
+            raw_dir=str(raw_path),
+            regridded_dir=str(regridded_path),
+            output_dir=str(output_path),
             product_name=product_name,
             function_name=function_name,
             variables=variables,
             extra_args=extra_args,
+            dataset_varnames=product_info,
+            fill_method=fill_method,
+            max_workers=max_workers,
+            executor=executor,
+            weight_cache=weight_cache,
+            strip_halo=strip_halo,
+            raw_cache=raw_cache,
+            manifest=manifest,
         )
+        logger.info("OBC processing complete.")
+        return plan
+
+    _get_boundaries(
+        boundaries=boundaries,
+        start_date=start_date,
+        end_date=end_date,
+        get_step_days=get_step_days,
+        hgrid_path=str(hgrid_path),
+        output_dir=str(raw_path),
+        product_name=product_name,
+        function_name=function_name,
+        variables=variables,
+        extra_args=extra_args,
+        max_workers=_AUTO_GET_WORKERS if auto_workers else max_workers,
+        executor=executor,
+        union_max_gb=union_max_gb,
+        product_info=product_info,
+        coords=utils.latlon_coord_names(product_info),
+        strip_halo=strip_halo,
+        raw_cache=raw_cache,
+        manifest=manifest,
+    )
 
-    regridded_files_by_boundary = {}
+    boundary_specs = []
     for boundary in boundaries:
         seg_id = boundary_number_conversion[boundary]
         parse_raw_dates = lambda f, boundary=boundary: _parse_raw_filename_dates(
@@ -429,21 +1812,28 @@ def process_obc_conditions(
             start_date,
             end_date,
         )
+        boundary_specs.append((boundary, seg_id, raw_files))
+
+    if auto_step or auto_workers:
+        plan = plan_regrid()
+        regrid_step_days = plan["regrid_step_days"]
+        max_workers = plan["max_workers"]
+
+    regridded_files_by_boundary = _regrid_boundaries(
+        boundary_specs=boundary_specs,
+        start_date=start_date,
+        end_date=end_date,
+        regrid_step_days=regrid_step_days,
+        hgrid_path=str(hgrid_path),
+        output_folder=str(regridded_path),
+        dataset_varnames=product_info,
+        fill_method=fill_method,
+        max_workers=max_workers,
+        weight_cache=weight_cache,
+        manifest=manifest,
+    )
 
-        logger.info("REGRID [%s]: %d-day slices", boundary, regrid_step_days)
-        regridded_files_by_boundary[boundary] = _regrid_boundary(
-            boundary=boundary,
-            seg_id=seg_id,
-            raw_files=raw_files,
-            start_date=start_date,
-            end_date=end_date,
-            regrid_step_days=regrid_step_days,
-            hgrid_path=str(hgrid_path),
-            output_folder=str(regridded_path),
-            dataset_varnames=product_info,
-            fill_method=fill_method,
-        )
-
+    hgrid = _load_hgrid(hgrid_path)
     for boundary in boundaries:
         seg_id = boundary_number_conversion[boundary]
         regridded_files = regridded_files_by_boundary[boundary]
@@ -456,10 +1846,19 @@ def process_obc_conditions(
         )
 
         logger.info("MERGE [%s]", boundary)
-        _merge_boundary(
-            boundary_label=f"{seg_id:03d}",
-            regridded_files=regridded_files,
-            output_folder=str(output_path),
-        )
+        with report.span(boundary, "MERGE"):
+            (_extend_boundary if extend else _merge_boundary)(
+                boundary_label=f"{seg_id:03d}",
+                regridded_files=regridded_files,
+                output_folder=str(output_path),
+                manifest=manifest,
+            )
+            report.annotate(
+                work_phase="bc_merge",
+                work=estimate.segment_work(
+                    hgrid, boundary, (end_date - start_date).days + 1
+                ),
+            )
 
     logger.info("OBC processing complete.")
+    return plan
@@ -0,0 +1,139 @@
+"""Memory-budget planner for OBC regridding.
+
+How many days a REGRID slice can hold, and how many slices can run at once,
+depends on the domain and on the machine: a fixed 30-day slice either runs
+out of memory on a large domain or leaves most of a big node idle on a small
+one. ``plan_regrid`` sizes both from the raw files already downloaded. Their
+headers give the bytes per day of every time-dependent variable (dims ×
+dtype), and a fixed factor covers what regridding holds on top of the raw
+slice (float64 copies, the regridded output and the fill). The budget is
+either given by the user or taken from the memory currently available to
+this process.
+"""
+
+import math
+import os
+from pathlib import Path
+
+import netCDF4 as nc
+from CrocoDash import logging
+
+logger = logging.setup_logger(__name__)
+
+# Conservative estimate of peak regridding memory per byte of raw slice
+REGRID_MEMORY_FACTOR = 4
+# Fraction of the available memory used when no budget is given
+AVAILABLE_MEMORY_FRACTION = 0.7
+# Below this, per-slice overhead (opening files, building the regrid call)
+# outweighs the extra parallelism, so fewer workers get longer slices
+MIN_STEP_DAYS = 5
+
+
+def available_memory() -> int:
+    """Return the bytes of memory this process can still use.
+
+    Reads MemAvailable from /proc/meminfo, capped by a cgroup v2 limit when
+    the process runs in one (as batch jobs usually do). Falls back to the
+    free physical pages reported by sysconf.
+    """
+    available = None
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        pass
+    if available is None:
+        available = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES")
+    try:
+        limit = Path("/sys/fs/cgroup/memory.max").read_text().strip()
+        usage = int(Path("/sys/fs/cgroup/memory.current").read_text())
+        if limit != "max":
+            available = min(available, int(limit) - usage)
+    except (OSError, ValueError):
+        pass
+    return max(available, 0)
+
+
+def raw_bytes_per_day(raw_file, days: int, time_dim: str = "time") -> int:
+    """Return the bytes per day of a raw file's time-dependent variables.
+
+    Only the header is read. days is the number of days the file covers.
+    """
+    with nc.Dataset(raw_file) as ds:
+        n_times = len(ds.dimensions[time_dim])
+        step_bytes = sum(
+            var.dtype.itemsize
+            * math.prod(len(ds.dimensions[d]) for d in var.dimensions if d != time_dim)
+            for name, var in ds.variables.items()
+            if time_dim in var.dimensions and name != time_dim
+        )
+    return math.ceil(step_bytes * n_times / max(days, 1))
+
+
+def plan_regrid(
+    bytes_per_day: int,
+    total_days: int,
+    n_boundaries: int,
+    memory_budget: int = None,
+    regrid_step_days: int = None,
+    max_workers: int = None,
+) -> dict:
+    """Choose the REGRID slice length and worker count that fit the memory budget.
+
+    bytes_per_day: raw bytes per day of the largest boundary, since slices of
+        different boundaries run side by side.
+    memory_budget: bytes; None uses AVAILABLE_MEMORY_FRACTION of
+        available_memory().
+    regrid_step_days, max_workers: values fixed by the user. Whichever is
+        None is planned.
+
+    Workers default to every CPU, reduced when that would force slices under
+    MIN_STEP_DAYS or when fewer fixed-length slices fit, and never more than
+    there are slices. If not even a single
+    day fits, the plan falls back to 1-day slices on one worker.
+    """
+    if memory_budget is None:
+        memory_budget = int(available_memory() * AVAILABLE_MEMORY_FRACTION)
+    slice_day_bytes = max(bytes_per_day * REGRID_MEMORY_FACTOR, 1)
+    days_in_budget = memory_budget // slice_day_bytes
+
+    if regrid_step_days is None:
+        workers = max_workers or os.cpu_count() or 1
+        step = days_in_budget // workers
+        if step < MIN_STEP_DAYS and max_workers is None:
+            workers = max(days_in_budget // MIN_STEP_DAYS, 1)
+            step = days_in_budget // workers
+        step = min(max(step, 1), total_days)
+    else:
+        step = regrid_step_days
+        workers = max_workers or min(
+            max(days_in_budget // step, 1), os.cpu_count() or 1
+        )
+
+    if max_workers is None:
+        workers = min(workers, n_boundaries * math.ceil(total_days / step))
+        if regrid_step_days is None:
+            # Fewer workers than planned leave room for longer slices
+            step = min(max(days_in_budget // workers, 1), total_days)
+            workers = min(workers, n_boundaries * math.ceil(total_days / step))
+    if days_in_budget < 1:
+        logger.warning(
+            f"Even a 1-day REGRID slice ({slice_day_bytes / 1024**3:.1f} GB) "
+            f"exceeds the memory budget of {memory_budget / 1024**3:.1f} GB."
+        )
+
+    plan = dict(
+        regrid_step_days=int(step),
+        max_workers=int(workers),
+        bytes_per_day=int(bytes_per_day),
+        memory_budget_gb=round(memory_budget / 1024**3, 2),
+    )
+    logger.info(
+        f"REGRID plan: {plan['regrid_step_days']}-day slices on "
+        f"{plan['max_workers']} workers ({bytes_per_day / 1024**2:.1f} MB/day raw, "
+        f"{plan['memory_budget_gb']} GB budget)"
+    )
+    return plan
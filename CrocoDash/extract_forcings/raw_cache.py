@@ -0,0 +1,186 @@
+"""Content-addressed raw-data cache shared across cases.
+
+Sibling cases over the same region and period request exactly the same raw
+chunks. Each request is therefore keyed by a fingerprint of the access
+function, variables, lat/lon box (or strip), date range and extra arguments
+(which carry the user's ``function_args``), so the chunk is downloaded once
+and then linked into every case's ``raw_data`` directory.
+
+The cache directory holds one ``<key>.nc`` file per entry plus an
+``index.json`` recording what each entry is, its size and when it was last
+used. The index is only read and written under an exclusive lock (see
+``utils.locked_json``), so concurrent cases and worker processes can share
+one cache. Like ``WeightCache``, the cache is capped at ``max_bytes`` and
+evicts the least recently used entries first. Evicting an entry never breaks
+a case that hardlinked or copied it; a symlinked case keeps a dangling link.
+"""
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+from CrocoDash import logging
+from CrocoDash.extract_forcings import utils
+from CrocoDash.extract_forcings.weight_cache import fingerprint
+
+logger = logging.setup_logger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "crocodash" / "raw"
+DEFAULT_MAX_BYTES = 100 * 1024**3
+LINK_MODES = ("hardlink", "symlink", "copy")
+INDEX_NAME = "index.json"
+
+
+def request_key(request: dict) -> str:
+    """Return the cache key for a request description (see utils.describe_raw_request)."""
+    return fingerprint(**request)
+
+
+def _link(src: Path, dest: Path, mode: str):
+    """Place src at dest as a hardlink, symlink or copy.
+
+    A hardlink across filesystems is impossible, so it falls back to a copy.
+    """
+    if mode == "symlink":
+        os.symlink(src, dest)
+        return
+    if mode == "hardlink":
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass
+    shutil.copyfile(src, dest)
+
+
+class RawCache:
+    """A directory of raw chunks named by request key, with an index and LRU size cap."""
+
+    def __init__(
+        self,
+        cache_dir=None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        link: str = "hardlink",
+    ):
+        if link not in LINK_MODES:
+            raise ValueError(
+                f"Unknown link mode '{link}', expected one of {LINK_MODES}"
+            )
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.link = link
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.nc"
+
+    def _locked_index(self):
+        """Open the index for reading and updating under an exclusive lock."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        return utils.locked_json(self.cache_dir / INDEX_NAME)
+
+    def entries(self) -> dict:
+        """Return a copy of the index: key → {request, size, created, last_used}."""
+        if not (self.cache_dir / INDEX_NAME).exists():
+            return {}
+        with self._locked_index() as index:
+            return dict(index)
+
+    def materialize(self, request: dict, dest_path) -> bool:
+        """Link the cached entry for request to dest_path. Returns False on a miss."""
+        key = request_key(request)
+        dest_path = Path(dest_path)
+        with self._locked_index() as index:
+            path = self.path(key)
+            if key not in index or not utils.is_valid_netcdf(path):
+                return False
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            # dest_path may hold an outdated file that is only replaced now
+            tmp_path = dest_path.with_name(f".{dest_path.name}.{os.getpid()}.tmp")
+            _link(path, tmp_path, self.link)
+            os.replace(tmp_path, dest_path)
+            index[key]["last_used"] = time.time()
+        logger.info(f"Reusing cached raw data for {dest_path.name}")
+        return True
+
+    def put(self, request: dict, src_path) -> Path:
+        """Add src_path to the cache as the result of request, then enforce the size cap.
+
+        src_path is hardlinked in when possible, so caching a freshly
+        downloaded chunk costs no extra disk space.
+        """
+        key = request_key(request)
+        path = self.path(key)
+        with self._locked_index() as index:
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            _link(Path(src_path), tmp_path, "hardlink")
+            os.replace(tmp_path, path)
+            now = time.time()
+            index[key] = dict(
+                request=request,
+                size=path.stat().st_size,
+                created=now,
+                last_used=now,
+            )
+            self._evict(index, self.max_bytes, keep=key)
+        return path
+
+    def _evict(self, index: dict, max_bytes: int, keep=None) -> list:
+        """Drop least recently used entries from index until it fits in max_bytes."""
+        removed = []
+        total = sum(entry["size"] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= index[key]["size"]
+            self._remove(index, key)
+            removed.append(key)
+        return removed
+
+    def _remove(self, index: dict, key: str):
+        self.path(key).unlink(missing_ok=True)
+        index.pop(key, None)
+        logger.info(f"Evicted cached raw data {key[:12]}")
+
+    def prune(self, max_bytes: int = None, older_than_days: float = None) -> list:
+        """Remove entries unused for older_than_days, then shrink to max_bytes.
+
+        Either limit may be None to skip it. Returns the removed keys.
+        """
+        removed = []
+        with self._locked_index() as index:
+            if older_than_days is not None:
+                cutoff = time.time() - older_than_days * 86400
+                for key in [k for k, e in index.items() if e["last_used"] < cutoff]:
+                    self._remove(index, key)
+                    removed.append(key)
+            if max_bytes is not None:
+                removed += self._evict(index, max_bytes)
+        return removed
+
+    def verify(self, remove: bool = False) -> dict:
+        """Check every entry is present, complete and valid NetCDF.
+
+        Returns key → problem for each bad entry, and files in the cache
+        directory the index does not know about. With remove=True, bad
+        entries and unknown files are deleted.
+        """
+        problems = {}
+        with self._locked_index() as index:
+            for key, entry in index.items():
+                path = self.path(key)
+                if not path.exists():
+                    problems[key] = "missing"
+                elif path.stat().st_size != entry["size"]:
+                    problems[key] = "size mismatch"
+                elif not utils.is_valid_netcdf(path):
+                    problems[key] = "not valid NetCDF"
+            for path in self.cache_dir.glob("*.nc"):
+                if path.stem not in index:
+                    problems[path.stem] = "not in index"
+            if remove:
+                for key in problems:
+                    self._remove(index, key)
+        return problems
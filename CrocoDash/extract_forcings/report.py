@@ -0,0 +1,549 @@
+"""Hierarchical timing and resource report of a workflow run.
+
+``run_workflow`` records a ``RunReport``: a tree of spans, run → component →
+boundary → GET/REGRID/MERGE → chunk. Each span has its wall time and the CPU
+time, bytes read and written, and provider requests of the work done inside
+it, and the peak resident memory of the process while it ran. The report is
+written as JSON to ``extract_forcings/reports/`` and printed with
+``crocodash report``. ``crocodash report diff A B`` aligns the spans of two
+reports and flags those that got slower, used more memory or did more I/O
+than a threshold allows (see ``diff_reports``).
+
+Code deep in the pipeline does not need a report object. ``span`` and
+``count`` attach to whichever span is current in the calling context, and do
+nothing when no report is being recorded (e.g. when ``process_obc_conditions``
+is called directly). ``span`` takes a path, so concurrent tasks of the same
+boundary and phase land under shared group spans. A group's figures are
+aggregated from its children.
+
+How the figures are measured:
+
+- CPU time and bytes are counted per thread (``time.thread_time`` and
+  ``/proc/thread-self/io``), excluding nested spans of the same thread, so
+  concurrent spans do not count each other's work. Work a library hands to
+  its own threads (dask, BLAS) is only in the run's total, which is measured
+  for the whole process.
+- Tasks run on a process pool are measured for their whole worker process,
+  which runs one task at a time, and sent back with the result (see
+  ``submit``).
+- Peak RSS is sampled for the whole process every ``RSS_SAMPLE_SECONDS``.
+  It therefore includes whatever else ran at the same time.
+"""
+
+import contextvars
+import json
+import os
+import platform
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+
+REPORT_FORMAT = 1
+REPORTS_DIR = "reports"
+RSS_SAMPLE_SECONDS = 0.2
+# Packages whose versions are recorded, to tell runs before and after an upgrade apart
+VERSIONED_PACKAGES = (
+    "CrocoDash",
+    "regional_mom6",
+    "mom6_forge",
+    "xesmf",
+    "xarray",
+    "numpy",
+)
+
+_current = contextvars.ContextVar("crocodash_report_span", default=None)
+_tree_lock = threading.RLock()
+
+
+def _read_io(path) -> tuple:
+    """Return (bytes read, bytes written) through read/write calls, or zeros."""
+    try:
+        with open(path) as f:
+            fields = dict(line.split(":") for line in f)
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+
+def _rss() -> int:
+    """Return the resident memory of this process in bytes, or 0."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _process_cpu() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class _Probe:
+    """Reads the counters of the calling thread, or of the whole process."""
+
+    def __init__(self, whole_process: bool):
+        self.whole_process = whole_process
+
+    def read(self) -> tuple:
+        if self.whole_process:
+            return (_process_cpu(), *_read_io("/proc/self/io"))
+        return (time.thread_time(), *_read_io("/proc/thread-self/io"))
+
+
+class _RssSampler:
+    """Samples the process RSS into every open span on a daemon thread."""
+
+    def __init__(self):
+        self._open = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, span):
+        with self._lock:
+            span.peak_rss = max(span.peak_rss, _rss())
+            self._open.add(span)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def remove(self, span):
+        with self._lock:
+            span.peak_rss = max(span.peak_rss, _rss())
+            self._open.discard(span)
+
+    def _run(self):
+        while True:
+            time.sleep(RSS_SAMPLE_SECONDS)
+            rss = _rss()
+            with self._lock:
+                if not self._open:
+                    self._thread = None
+                    return
+                for span in self._open:
+                    span.peak_rss = max(span.peak_rss, rss)
+
+
+_sampler = _RssSampler()
+
+
+class Span:
+    """One node of a report: a measured piece of work, or a group of them."""
+
+    def __init__(self, name: str, parent: "Span" = None, **attrs):
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.children = {}
+        self.measured = False
+        self.start = self.end = None
+        self.cpu = 0.0
+        self.read_bytes = self.written_bytes = 0
+        self.peak_rss = 0
+        self.counters = {}
+        self._thread = None
+        self._nested = (0.0, 0, 0)
+        # Measured for the whole process, so nested spans are already included
+        self._inclusive = False
+
+    def child(self, name: str, **attrs) -> "Span":
+        """Return the child called name, creating it if needed."""
+        with _tree_lock:
+            if name not in self.children:
+                self.children[name] = Span(name, parent=self)
+            node = self.children[name]
+            node.attrs.update(attrs)
+            return node
+
+    def count(self, name: str, n: int = 1):
+        with _tree_lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def measure(self, whole_process: bool = False):
+        """Measure the work done inside the block as this span's own."""
+        probe = _Probe(whole_process)
+        self.measured = True
+        self._inclusive = whole_process
+        self._thread = None if whole_process else threading.get_native_id()
+        self._nested = (0.0, 0, 0)
+        self.start = time.time()
+        before = probe.read()
+        _sampler.add(self)
+        try:
+            yield self
+        finally:
+            after = probe.read()
+            self.end = time.time()
+            _sampler.remove(self)
+            delta = tuple(a - b for a, b in zip(after, before))
+            own = tuple(d - n for d, n in zip(delta, self._nested))
+            self.cpu, self.read_bytes, self.written_bytes = own
+            self.cpu = max(self.cpu, 0.0)
+            # The enclosing span of the same thread must not count this again
+            ancestor = self.parent
+            while ancestor is not None and self._thread is not None:
+                if ancestor.measured and ancestor._thread == self._thread:
+                    with _tree_lock:
+                        ancestor._nested = tuple(
+                            a + d for a, d in zip(ancestor._nested, delta)
+                        )
+                    break
+                ancestor = ancestor.parent
+
+    def to_dict(self) -> dict:
+        """Return the span and its children with aggregated figures."""
+        with _tree_lock:
+            children = [
+                c if isinstance(c, dict) else c.to_dict()
+                for c in self.children.values()
+            ]
+        starts = [c["start"] for c in children if c["start"] is not None]
+        ends = [c["start"] + c["wall_s"] for c in children if c["start"] is not None]
+        if self.measured:
+            start, wall = self.start, (self.end or time.time()) - self.start
+        elif starts:
+            start, wall = min(starts), max(ends) - min(starts)
+        else:
+            start, wall = None, 0.0
+        counters = dict(self.counters)
+        for c in children:
+            for name, n in c["counters"].items():
+                counters[name] = counters.get(name, 0) + n
+        totals = {"cpu_s": self.cpu, "read_bytes": self.read_bytes}
+        totals["written_bytes"] = self.written_bytes
+        if not self._inclusive:
+            for key in totals:
+                totals[key] += sum(c[key] for c in children)
+        return dict(
+            name=self.name,
+            attrs=self.attrs,
+            start=start,
+            wall_s=round(wall, 4),
+            cpu_s=round(totals["cpu_s"], 4),
+            peak_rss_bytes=max(
+                [self.peak_rss] + [c["peak_rss_bytes"] for c in children]
+            ),
+            read_bytes=totals["read_bytes"],
+            written_bytes=totals["written_bytes"],
+            counters=counters,
+            children=children,
+        )
+
+
+def current() -> Span:
+    """Return the span work in this context is recorded under, or None."""
+    return _current.get()
+
+
+@contextmanager
+def span(*path: str, **attrs):
+    """Measure the block as the span at path under the current span.
+
+    Intermediate path elements are group spans shared with other calls.
+    attrs are stored on the innermost span. Does nothing when no report is
+    being recorded.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    for name in path[:-1]:
+        parent = parent.child(name)
+    node = parent.child(path[-1], **attrs)
+    token = _current.set(node)
+    try:
+        with node.measure():
+            yield node
+    finally:
+        _current.reset(token)
+
+
+def count(name: str, n: int = 1):
+    """Add n to the counter called name of the current span, if any."""
+    node = _current.get()
+    if node is not None:
+        node.count(name, n)
+
+
+def annotate(**attrs):
+    """Store attrs on the current span, if any."""
+    node = _current.get()
+    if node is not None:
+        with _tree_lock:
+            node.attrs.update(attrs)
+
+
+def _run_detached(fn, path, kwargs):
+    """Run fn(**kwargs) in a worker process under a span of its own.
+
+    Returns the result and the span as a dict, for the parent to attach.
+    """
+    root = Span(path[-1])
+    token = _current.set(root)
+    try:
+        with root.measure(whole_process=True):
+            result = fn(**kwargs)
+    finally:
+        _current.reset(token)
+    return result, root.to_dict()
+
+
+def _attach(parent: Span, path, record: dict):
+    for name in path[:-1]:
+        parent = parent.child(name)
+    with _tree_lock:
+        parent.children[path[-1]] = record
+
+
+def submit(pool, executor: str, path, fn, /, **kwargs) -> Future:
+    """Submit fn(**kwargs) to pool, recorded as the span at path.
+
+    executor is the pool's kind, ``"thread"`` or ``"process"``. Thread tasks
+    run in a copy of the caller's context under span(*path). Process tasks
+    are measured in the worker and their span is attached to the caller's
+    when they finish. The returned future resolves to fn's result either way.
+    Without a current report, or without a path, this is pool.submit.
+    """
+    parent = _current.get()
+    if parent is None or path is None:
+        return pool.submit(fn, **kwargs)
+    path = tuple(path)
+    if executor != "process":
+
+        def run():
+            with span(*path):
+                return fn(**kwargs)
+
+        return pool.submit(contextvars.copy_context().run, run)
+
+    outer = Future()
+    # Hold the span's place so children stay in submission order
+    slot = parent
+    for name in path[:-1]:
+        slot = slot.child(name)
+    slot.child(path[-1])
+
+    def done(inner):
+        try:
+            result, record = inner.result()
+        except BaseException as e:
+            outer.set_exception(e)
+            return
+        _attach(parent, path, record)
+        outer.set_result(result)
+
+    pool.submit(_run_detached, fn, path, kwargs).add_done_callback(done)
+    return outer
+
+
+def _versions() -> dict:
+    versions = {}
+    for package in VERSIONED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            pass
+    return versions
+
+
+class RunReport:
+    """The report of one run_workflow call.
+
+    Use ``record()`` around the run: spans opened inside it, in this thread
+    or in tasks submitted through ``submit``, are recorded under ``root``.
+    """
+
+    def __init__(self, name: str = "run", **attrs):
+        self.root = Span(name, **attrs)
+        self.created = datetime.now()
+
+    @contextmanager
+    def record(self):
+        token = _current.set(self.root)
+        try:
+            with self.root.measure(whole_process=True):
+                yield self
+        finally:
+            _current.reset(token)
+
+    def to_dict(self) -> dict:
+        return dict(
+            format=REPORT_FORMAT,
+            created=self.created.isoformat(timespec="seconds"),
+            host=platform.node(),
+            cpus=os.cpu_count(),
+            versions=_versions(),
+            run=self.root.to_dict(),
+        )
+
+    def write(self, reports_dir) -> Path:
+        """Write the report as run_<created>.json in reports_dir and return its path."""
+        reports_dir = Path(reports_dir)
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        path = reports_dir / f"run_{self.created:%Y%m%dT%H%M%S}.json"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+def load(path) -> dict:
+    """Read a report written by RunReport.write."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def latest(reports_dir) -> Path:
+    """Return the newest report in reports_dir, or None."""
+    reports = sorted(Path(reports_dir).glob("run_*.json"))
+    return reports[-1] if reports else None
+
+
+# Relative increase past which report diff flags a span, per metric group
+DIFF_THRESHOLDS = {"time": 0.25, "memory": 0.2, "io": 0.25}
+# Smaller absolute changes are noise and never flagged
+DIFF_FLOORS = {"time": 1.0, "memory": 64 * 1024**2, "io": 64 * 1024**2}
+_DIFF_METRICS = {
+    "wall_s": "time",
+    "cpu_s": "time",
+    "peak_rss_bytes": "memory",
+    "read_bytes": "io",
+    "written_bytes": "io",
+}
+
+
+def flatten(data: dict, depth: int = None) -> dict:
+    """Return {"run / bc / east ...": span} for every span down to depth."""
+    spans = {}
+
+    def add(node, prefix, level):
+        path = f"{prefix} / {node['name']}" if prefix else node["name"]
+        spans[path] = node
+        if depth is None or level < depth:
+            for c in node["children"]:
+                add(c, path, level + 1)
+
+    add(data["run"], "", 0)
+    return spans
+
+
+def diff_reports(
+    a: dict, b: dict, depth: int = 1, thresholds: dict = None, floors: dict = None
+) -> list:
+    """Compare the spans of report b against report a, down to depth.
+
+    Spans are aligned by path. A metric regressed when b exceeds a by more
+    than thresholds[group] (a fraction) and by more than floors[group] in
+    absolute terms. The groups are "time" (wall and CPU seconds), "memory"
+    (peak RSS bytes) and "io" (bytes read and written); missing entries
+    take DIFF_THRESHOLDS and DIFF_FLOORS.
+
+    Returns one dict per span and metric: path, metric, a, b, change (the
+    relative change, None without a baseline) and regressed. Spans in only
+    one report have a or b None and never count as regressions.
+    """
+    thresholds = {**DIFF_THRESHOLDS, **(thresholds or {})}
+    floors = {**DIFF_FLOORS, **(floors or {})}
+    spans_a, spans_b = flatten(a, depth), flatten(b, depth)
+    rows = []
+    for path in list(spans_a) + [p for p in spans_b if p not in spans_a]:
+        node_a, node_b = spans_a.get(path), spans_b.get(path)
+        for metric, group in _DIFF_METRICS.items():
+            value_a = None if node_a is None else node_a[metric]
+            value_b = None if node_b is None else node_b[metric]
+            change = None
+            regressed = False
+            if value_a is not None and value_b is not None:
+                if value_a:
+                    change = (value_b - value_a) / value_a
+                regressed = value_b - value_a > floors[group] and value_b > value_a * (
+                    1 + thresholds[group]
+                )
+            rows.append(
+                dict(
+                    path=path,
+                    metric=metric,
+                    a=value_a,
+                    b=value_b,
+                    change=change,
+                    regressed=regressed,
+                )
+            )
+    return rows
+
+
+def format_diff(a: dict, b: dict, rows: list, all_rows: bool = False) -> str:
+    """Return the diff as a table of the changed metrics.
+
+    Only regressions and spans found in one report are listed, unless
+    all_rows is set. Package versions that differ are listed first.
+    """
+    lines = [f"A: {a['created']} on {a['host']}", f"B: {b['created']} on {b['host']}"]
+    for package in sorted(set(a["versions"]) | set(b["versions"])):
+        va, vb = a["versions"].get(package), b["versions"].get(package)
+        if va != vb:
+            lines.append(f"{package}: {va} -> {vb}")
+
+    def show(metric, value):
+        if value is None:
+            return "-"
+        return f"{value:.1f}s" if metric.endswith("_s") else _size(value)
+
+    lines.append(f"{'span':<44} {'metric':<15} {'A':>10} {'B':>10} {'change':>8}")
+    for row in rows:
+        one_sided = row["a"] is None or row["b"] is None
+        if not (all_rows or row["regressed"] or one_sided):
+            continue
+        if one_sided and row["metric"] != "wall_s":
+            continue
+        change = "" if row["change"] is None else f"{row['change']:+.0%}"
+        flag = "  REGRESSED" if row["regressed"] else ""
+        flag = "  only in " + ("B" if row["a"] is None else "A") if one_sided else flag
+        lines.append(
+            f"{row['path']:<44} {row['metric']:<15} {show(row['metric'], row['a']):>10} "
+            f"{show(row['metric'], row['b']):>10} {change:>8}{flag}"
+        )
+    n = sum(row["regressed"] for row in rows)
+    lines.append(f"{n} regressed metric{'s' if n != 1 else ''}")
+    return "\n".join(lines)
+
+
+def _size(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def format_report(data: dict, depth: int = None) -> str:
+    """Return the report as an indented table, down to depth levels below the run."""
+    header = (
+        f"{'span':<44} {'wall':>9} {'cpu':>9} {'peak rss':>10} "
+        f"{'read':>10} {'written':>10} {'requests':>8}"
+    )
+    lines = [
+        f"Report of {data['created']} on {data['host']} ({data['cpus']} CPUs)",
+        header,
+    ]
+
+    def add(node, level):
+        status = node["attrs"].get("status")
+        label = "  " * level + node["name"] + (f" [{status}]" if status else "")
+        lines.append(
+            f"{label:<44} {node['wall_s']:>8.1f}s {node['cpu_s']:>8.1f}s "
+            f"{_size(node['peak_rss_bytes']):>10} {_size(node['read_bytes']):>10} "
+            f"{_size(node['written_bytes']):>10} "
+            f"{node['counters'].get('provider_requests', 0):>8}"
+        )
+        if depth is None or level < depth:
+            for c in node["children"]:
+                add(c, level + 1)
+
+    add(data["run"], 0)
+    return "\n".join(lines)
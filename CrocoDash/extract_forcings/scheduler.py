@@ -0,0 +1,153 @@
+"""Dependency-aware scheduler for the forcing components of a workflow run.
+
+Each component of ``run_workflow`` (OBC, initial condition, tides, ...) is a
+``Component`` that declares the artifacts it reads and writes. A component
+waits only for the components producing its inputs. Today that is just the
+river nutrients, which read the runoff mapping file. Everything else can run
+side by side.
+
+``run_components`` runs ready components on a thread pool, in declaration
+order, under a budget of worker slots. A component claims ``workers`` slots,
+its own internal parallelism (the OBC and initial-condition pools), capped at
+the budget. It starts only once that many slots are free, so a component using
+the whole budget runs alone. With a budget of one slot, components run one at
+a time in declaration order, exactly as the old sequential driver did.
+
+A failed component does not stop the others. Components that depend on it are
+skipped, and once everything has finished the first error is re-raised.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+from CrocoDash import logging, netcdf_locks
+from CrocoDash.extract_forcings import report
+
+logger = logging.setup_logger(__name__)
+
+
+@dataclass
+class Component:
+    """One unit of a workflow run.
+
+    name: component name, as in run_workflow's flags.
+    run: callable taking no arguments that processes the component.
+    inputs: artifacts the component reads that other components produce.
+    outputs: artifacts the component produces.
+    workers: worker slots the component occupies while it runs.
+    """
+
+    name: str
+    run: Callable
+    inputs: tuple = ()
+    outputs: tuple = ()
+    workers: int = 1
+
+
+@dataclass
+class ComponentStatus:
+    """The outcome of a component: "done", "failed" or "skipped"."""
+
+    status: str
+    seconds: float = 0.0
+    error: BaseException = field(default=None, repr=False)
+    reason: str = ""
+
+
+def dependencies(components: list) -> dict:
+    """Return each component's name mapped to the names it must wait for."""
+    producers = {}
+    for c in components:
+        for artifact in c.outputs:
+            producers.setdefault(artifact, []).append(c.name)
+    return {
+        c.name: {p for a in c.inputs for p in producers.get(a, []) if p != c.name}
+        for c in components
+    }
+
+
+def run_components(components: list, max_workers: int = 1) -> dict:
+    """Run components concurrently as their dependencies allow.
+
+    max_workers is the budget of worker slots shared by running components.
+    Returns each component's ComponentStatus, in declaration order. Failures
+    are recorded rather than raised (see raise_first_failure).
+    """
+    budget = max(int(max_workers or 1), 1)
+    waits_for = dependencies(components)
+    pending = list(components)
+    status = {}
+    running = {}
+    used = 0
+
+    def start(component):
+        t0 = time.perf_counter()
+        component.run()
+        return time.perf_counter() - t0
+
+    # Components read and write NetCDF side by side (see netcdf_locks)
+    with netcdf_locks.ordered_locks(), ThreadPoolExecutor(max_workers=budget) as pool:
+        while pending or running:
+            for c in list(pending):
+                blocked = waits_for[c.name] - status.keys()
+                failed = [
+                    n
+                    for n in waits_for[c.name]
+                    if n in status and status[n].status != "done"
+                ]
+                if failed:
+                    pending.remove(c)
+                    status[c.name] = ComponentStatus(
+                        "skipped", reason=f"needs {', '.join(sorted(failed))}"
+                    )
+                    logger.warning(f"Skipping '{c.name}': {failed[0]} did not finish")
+                    continue
+                claim = min(max(c.workers, 1), budget)
+                if blocked or used + claim > budget:
+                    continue
+                pending.remove(c)
+                used += claim
+                # Recorded as the component's span when a report is active
+                future = report.submit(pool, "thread", (c.name,), start, component=c)
+                running[future] = (c, claim)
+            if not running:
+                # Only reachable through a dependency cycle
+                for c in pending:
+                    status[c.name] = ComponentStatus(
+                        "skipped", reason="dependency cycle"
+                    )
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                c, claim = running.pop(future)
+                used -= claim
+                if future.exception() is None:
+                    status[c.name] = ComponentStatus("done", future.result())
+                else:
+                    status[c.name] = ComponentStatus(
+                        "failed",
+                        error=future.exception(),
+                        reason=str(future.exception()),
+                    )
+                    logger.error(f"'{c.name}' failed: {future.exception()!r}")
+
+    return {c.name: status[c.name] for c in components}
+
+
+def format_status_table(status: dict) -> str:
+    """Return a per-component status table for printing."""
+    width = max([len("component")] + [len(n) for n in status])
+    lines = [f"{'component':<{width}}  {'status':<8}  {'time':>8}  note"]
+    for name, s in status.items():
+        seconds = f"{s.seconds:.1f}s" if s.status == "done" else "-"
+        lines.append(f"{name:<{width}}  {s.status:<8}  {seconds:>8}  {s.reason}")
+    return "\n".join(lines)
+
+
+def raise_first_failure(status: dict):
+    """Re-raise the error of the first failed component, if any."""
+    for s in status.values():
+        if s.status == "failed":
+            raise s.error
@@ -0,0 +1,339 @@
+"""Boundary-condition processing as a task list, for HPC job arrays.
+
+``crocodash process`` normally runs the whole OBC pipeline in one Python
+process, so a multi-decade extraction is one long job on one node.
+``write_tasks`` instead splits it into independent tasks and writes them to
+``extract_forcings/tasks.json``:
+
+- one GET per (boundary, download chunk of ``get_step_days``);
+- one REGRID per (boundary, slice of ``step`` days);
+- one MERGE per boundary.
+
+Each task lists the tasks it depends on, and ``run_task`` runs a single one,
+so every task can be an element of a PBS or Slurm job array::
+
+    crocodash process --config config.json --task $SLURM_ARRAY_TASK_ID
+
+Tasks are numbered stage by stage, and a stage depends only on earlier ones:
+
+0. GET;
+1. the first REGRID slice of each boundary, which builds the boundary's
+   regridding weights;
+2. the other REGRID slices, which load those weights;
+3. MERGE.
+
+Submitting one array per stage, each held until the previous one has
+succeeded (``--dependency=afterok`` or ``-W depend=afterok``), therefore
+respects every dependency. A task refuses to start while a dependency's
+output is missing, and a task whose output already exists is skipped, so an
+array can be resubmitted after a partial failure. Each task runs the same
+functions as ``process_obc_conditions``, so the files are identical.
+
+``run_local`` runs a whole task list on a local process pool in dependency
+order, to test a task list before submitting it.
+"""
+
+import functools
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import xarray as xr
+from CrocoDash import logging
+from CrocoDash.extract_forcings import driver, estimate, obc, planner, scheduler, utils
+from CrocoDash.grid import Grid
+
+logger = logging.setup_logger(__name__)
+
+TASKS_NAME = "tasks.json"
+TASKS_FORMAT = 1
+STAGES = ("GET", "REGRID (weights)", "REGRID", "MERGE")
+
+
+def default_path(config_path) -> Path:
+    """Return where the task list of the case with config_path is written."""
+    return Path(config_path).parent / TASKS_NAME
+
+
+def _regrid_step(arguments: dict, boxes: dict, pad: float, total_days: int) -> int:
+    """Resolve an "auto" REGRID step for tasks that each run one slice.
+
+    With memory_budget_gb the longest slice one worker fits in the budget is
+    planned from the estimated raw bytes per day (see estimate). Without it
+    the node a task lands on is unknown, so the pipelined default is used.
+    """
+    if arguments["regrid_step_days"] != "auto":
+        return int(arguments["regrid_step_days"])
+    if arguments.get("memory_budget_gb") is None:
+        return obc._DEFAULT_REGRID_STEP_DAYS
+    plan = planner.plan_regrid(
+        bytes_per_day=max(
+            estimate.download_bytes(b, 1, arguments["product_info"], pad)
+            for b in boxes.values()
+        ),
+        total_days=total_days,
+        n_boundaries=len(boxes),
+        memory_budget=int(arguments["memory_budget_gb"] * 1024**3),
+        max_workers=1,
+    )
+    return plan["regrid_step_days"]
+
+
+def build_tasks(arguments: dict) -> dict:
+    """Return the task list of the OBC run described by arguments.
+
+    arguments are process_obc_conditions arguments (see
+    driver._obc_arguments). Returns a dict with the run's dates and step
+    sizes and its "tasks", each with id, stage, kind, boundary, seg_id,
+    dates, depends (task ids) and outputs (paths).
+    """
+    start = pd.to_datetime(arguments["start_date"]).to_pydatetime()
+    end = pd.to_datetime(arguments["end_date"]).to_pydatetime()
+    raw_dir = Path(arguments["raw_dataset_path"])
+    regridded_dir = Path(arguments["regridded_dataset_path"])
+    output_dir = Path(arguments["output_path"])
+    boundaries = arguments["boundary_number_conversion"]
+    with xr.open_dataset(arguments["hgrid_path"]) as hgrid:
+        boxes, pad = obc._download_boxes(
+            hgrid,
+            list(boundaries),
+            obc._strip_halo(
+                arguments["product_info"], arguments.get("strip_halo_cells")
+            ),
+        )
+    get_pairs = obc._make_date_pairs(start, end, arguments.get("get_step_days"))
+    regrid_step = _regrid_step(arguments, boxes, pad, (end - start).days + 1)
+    regrid_pairs = obc._make_date_pairs(start, end, regrid_step)
+
+    stages = {stage: [] for stage in range(len(STAGES))}
+    for boundary, seg_id in boundaries.items():
+        gets = [
+            dict(
+                stage=0,
+                kind="GET",
+                dates=(s, e),
+                outputs=[
+                    raw_dir / f"{boundary}_unprocessed.{s:%Y-%m-%d}_{e:%Y-%m-%d}.nc"
+                ],
+            )
+            for s, e in get_pairs
+        ]
+        regrids = [
+            dict(
+                stage=1 if i == 0 else 2,
+                kind="REGRID",
+                dates=(s, e),
+                # Raw chunks overlapping the slice, and the weights it reuses
+                depends=[g for g in gets if g["dates"][0] <= e and g["dates"][1] >= s],
+                outputs=[obc._regridded_path(regridded_dir, seg_id, s, e)],
+            )
+            for i, (s, e) in enumerate(regrid_pairs)
+        ]
+        for r in regrids[1:]:
+            r["depends"].append(regrids[0])
+        merge = dict(
+            stage=3,
+            kind="MERGE",
+            dates=(start, end),
+            depends=regrids,
+            outputs=[output_dir / f"forcing_obc_segment_{seg_id:03d}.nc"],
+        )
+        for task in gets + regrids + [merge]:
+            task.update(boundary=boundary, seg_id=seg_id)
+            stages[task["stage"]].append(task)
+
+    tasks = [task for stage in stages.values() for task in stage]
+    for i, task in enumerate(tasks):
+        task["id"] = i
+    return dict(
+        format=TASKS_FORMAT,
+        start_date=f"{start:%Y-%m-%d}",
+        end_date=f"{end:%Y-%m-%d}",
+        get_step_days=arguments.get("get_step_days"),
+        regrid_step_days=regrid_step,
+        tasks=[
+            dict(
+                id=task["id"],
+                stage=task["stage"],
+                kind=task["kind"],
+                boundary=task["boundary"],
+                seg_id=task["seg_id"],
+                dates=[f"{d:%Y-%m-%d}" for d in task["dates"]],
+                depends=[d["id"] for d in task.get("depends", [])],
+                outputs=[str(p) for p in task["outputs"]],
+            )
+            for task in tasks
+        ],
+    )
+
+
+def write_tasks(config_path, path=None) -> Path:
+    """Write the OBC task list of a case and return its path.
+
+    path defaults to tasks.json next to config.json.
+    """
+    config_path = Path(config_path).resolve()
+    config, state, inputdir = driver._load(config_path)
+    data = build_tasks(driver._obc_arguments(config, state, inputdir))
+    data["config"] = str(config_path)
+    path = Path(path or default_path(config_path))
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_tasks(path) -> dict:
+    """Read a task list written by write_tasks."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def task_name(task: dict) -> str:
+    return f"{task['id']} {task['boundary']} {task['kind']} {'_'.join(task['dates'])}"
+
+
+def _run_get(task, data, arguments, manifest, raw_cache):
+    variables, extra_args = utils.build_forcing_request(
+        arguments["product_info"], arguments["function_args"]
+    )
+    with xr.open_dataset(arguments["hgrid_path"]) as hgrid:
+        boxes = Grid.get_bounding_boxes(hgrid)
+        halo = obc._strip_halo(
+            arguments["product_info"], arguments.get("strip_halo_cells")
+        )
+        strip = (
+            None if halo is None else obc._boundary_strip(hgrid, task["boundary"], halo)
+        )
+    (request,) = obc._get_chunk_requests(
+        boundary=task["boundary"],
+        start_date=datetime.fromisoformat(task["dates"][0]),
+        end_date=datetime.fromisoformat(task["dates"][1]),
+        get_step_days=None,
+        latlon=boxes[task["boundary"]],
+        output_dir=arguments["raw_dataset_path"],
+        variables=variables,
+        extra_args=extra_args,
+        strip=strip,
+        raw_cache=raw_cache,
+        manifest=manifest,
+    )
+    obc._get_chunk(arguments["product_name"], arguments["function_name"], **request)
+
+
+def _run_regrid(task, data, arguments, manifest, raw_cache):
+    regridded_dir = Path(arguments["regridded_dataset_path"])
+    weights_path = obc._weights_path(regridded_dir, task["seg_id"])
+    # A stage-1 slice is only done once the weights it builds exist too
+    if obc._existing_regridded_file(Path(task["outputs"][0]), manifest) and (
+        task["stage"] != 1 or weights_path.exists()
+    ):
+        return
+    (regridded_dir / "weights").mkdir(parents=True, exist_ok=True)
+    if task["stage"] == 1 or not weights_path.exists():
+        # Weights from an earlier run may belong to a different grid or product
+        weights_path = None
+    tasks = data["tasks"]
+    obc._regrid_slice_task(
+        raw_files=[
+            Path(tasks[d]["outputs"][0])
+            for d in task["depends"]
+            if tasks[d]["kind"] == "GET"
+        ],
+        hgrid_path=arguments["hgrid_path"],
+        weights_path=weights_path,
+        output_folder=regridded_dir,
+        chunk_start=datetime.fromisoformat(task["dates"][0]),
+        chunk_end=datetime.fromisoformat(task["dates"][1]),
+        seg_id=task["seg_id"],
+        boundary=task["boundary"],
+        start_date=datetime.fromisoformat(data["start_date"]),
+        dataset_varnames=arguments["product_info"],
+        fill_method=obc._fill_method(arguments["product_info"]),
+        manifest=manifest,
+    )
+
+
+def _run_merge(task, data, arguments, manifest, raw_cache):
+    obc._merge_boundary(
+        boundary_label=f"{task['seg_id']:03d}",
+        regridded_files=[Path(data["tasks"][d]["outputs"][0]) for d in task["depends"]],
+        output_folder=arguments["output_path"],
+        manifest=manifest,
+    )
+
+
+_RUNNERS = {"GET": _run_get, "REGRID": _run_regrid, "MERGE": _run_merge}
+
+
+def run_task(task_file, task_id: int):
+    """Run task task_id of the task list in task_file.
+
+    Raises RuntimeError if a task it depends on has not finished.
+    """
+    data = load_tasks(task_file)
+    task = data["tasks"][int(task_id)]
+    unfinished = [
+        d
+        for d in task["depends"]
+        if not all(utils.is_valid_netcdf(p) for p in data["tasks"][d]["outputs"])
+    ]
+    if unfinished:
+        raise RuntimeError(
+            f"Task {task_name(task)} depends on unfinished tasks "
+            f"{', '.join(str(d) for d in unfinished)}."
+        )
+    config, state, inputdir = driver._load(data["config"])
+    arguments = driver._obc_arguments(config, state, inputdir, data["end_date"])
+    manifest = driver._manifest(config, inputdir)
+    logger.info(f"Task {task_name(task)}")
+    _RUNNERS[task["kind"]](task, data, arguments, manifest, driver._raw_cache(config))
+
+
+def _run_in_pool(pool, task_file, task_id):
+    return pool.submit(run_task, str(task_file), task_id).result()
+
+
+def run_local(task_file, max_workers: int = 1, executor: str = "process") -> dict:
+    """Run every task of task_file on a local pool of max_workers, in dependency order.
+
+    Returns each task's scheduler.ComponentStatus, keyed by task name. A
+    failed task's dependents are skipped (see scheduler.run_components).
+    """
+    data = load_tasks(task_file)
+    names = {t["id"]: task_name(t) for t in data["tasks"]}
+    with utils.EXECUTORS[executor](max_workers=max_workers) as pool:
+        components = [
+            scheduler.Component(
+                names[t["id"]],
+                functools.partial(_run_in_pool, pool, task_file, t["id"]),
+                inputs=tuple(names[d] for d in t["depends"]),
+                outputs=(names[t["id"]],),
+            )
+            for t in data["tasks"]
+        ]
+        return scheduler.run_components(components, max_workers=max_workers)
+
+
+def format_tasks(data: dict, path) -> str:
+    """Return a summary of a task list: the task ids of each stage and how to submit them."""
+    lines = [
+        f"{len(data['tasks'])} tasks in {path} "
+        f"({data['start_date']} to {data['end_date']}, "
+        f"{data['regrid_step_days']}-day REGRID slices)"
+    ]
+    for stage, label in enumerate(STAGES):
+        ids = [t["id"] for t in data["tasks"] if t["stage"] == stage]
+        if ids:
+            lines.append(f"  stage {stage} {label:<17} tasks {ids[0]}-{ids[-1]}")
+    command = f"crocodash process --config {data['config']} --task <id>"
+    if Path(path) != default_path(data["config"]):
+        command += f" --task-file {path}"
+    lines.append(
+        "Submit one job array per stage, each after the previous one succeeds; "
+        f"every element runs '{command}'."
+    )
+    return "\n".join(lines)
@@ -1,15 +1,47 @@
+import fcntl
+import inspect
+import json
+import math
 import os
 import re
+import shutil
+import numpy as np
+import xarray as xr
 from pathlib import Path
 from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from CrocoDash import logging
+from CrocoDash import logging, netcdf_locks
+from CrocoDash.extract_forcings import report
 from CrocoDash.raw_data_access.registry import ProductRegistry
 
 logger = logging.setup_logger(__name__)
 
 _NETCDF_MAGIC = (b"\x89HDF", b"CDF\x01", b"CDF\x02")
 
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+# Degrees the raw data access functions pad every requested lat/lon box by
+RAW_LATLON_PAD = 1.0
+
+# Access-function arguments that tune how data is transferred, not what is
+# fetched. They are left out of the raw-cache keys and component fingerprints.
+TRANSFER_ARGS = frozenset(
+    {
+        "chunk_days",
+        "split_variables",
+        "max_concurrent_requests",
+        "retries",
+        "backoff_seconds",
+    }
+)
+
+
+def content_args(args: dict) -> dict:
+    """Return args without the TRANSFER_ARGS."""
+    return {k: v for k, v in (args or {}).items() if k not in TRANSFER_ARGS}
+
 
 def parse_dataset_folder(
     folder: str | Path, input_dataset_regex: str, date_format: str
@@ -85,6 +117,68 @@ def is_valid_netcdf(path: Path) -> bool:
         return False
 
 
+@contextmanager
+def locked_json(path: Path):
+    """Yield the dict stored in the JSON file at path for reading and updating.
+
+    An exclusive lock on a sibling ``.<name>.lock`` file is held throughout,
+    so threads, worker processes and concurrent runs can share the file. If
+    the dict changed it is written back through a temporary file and an
+    atomic rename on exit.
+    """
+    path = Path(path)
+    with open(path.with_name(f".{path.name}.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        data = json.loads(path.read_text()) if path.exists() else {}
+        before = json.dumps(data, sort_keys=True, default=str)
+        yield data
+        after = json.dumps(data, indent=2, sort_keys=True, default=str)
+        if json.dumps(json.loads(after), sort_keys=True) != before:
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(after)
+            os.replace(tmp_path, path)
+
+
+def existing_artifact(path: Path, manifest=None, params: dict = None) -> bool:
+    """Return True if path is a finished artifact a re-run can skip.
+
+    With a manifest.RunManifest, a recorded file is trusted as long as its
+    size and mtime still match, without reopening it. A recorded file that
+    was only touched or copied (same size, and same checksum when one was
+    recorded) is kept and its entry refreshed. A recorded file that has
+    changed otherwise (e.g. truncated by a crashed copy), or that was produced
+    with different params, is rebuilt: it is left in place and False is
+    returned, and the rebuild replaces it once the new file is complete.
+    Files the manifest does not know about, such as those from runs before it
+    existed, fall back to the magic-byte check and are recorded if they pass.
+
+    Raises RuntimeError if an unrecorded file is not valid NetCDF.
+    """
+    path = Path(path)
+    if not path.exists():
+        return False
+    if manifest is not None:
+        status = manifest.check(path, params)
+        if status is False and manifest.params_match(path, params):
+            status = manifest.refresh(path)
+        if status:
+            logger.info(f"{path.name} already exists. Skipping.")
+            return True
+        if status is False:
+            logger.warning(
+                f"{path.name} does not match its run manifest entry. Rebuilding it."
+            )
+            return False
+    if not is_valid_netcdf(path):
+        raise RuntimeError(
+            f"{path} exists but is not valid NetCDF. Delete it and re-run."
+        )
+    if manifest is not None:
+        manifest.record(path, params)
+    logger.info(f"{path.name} already exists. Skipping.")
+    return True
+
+
 def get_data_access_function(product_name: str, function_name: str):
     """Load the product registry and return the raw access function for (product_name, function_name)."""
     ProductRegistry.load()
@@ -123,6 +217,31 @@ def build_forcing_request(
     return variables, extra_args
 
 
+def describe_raw_request(
+    data_access_fn,
+    dates: list,
+    latlon: dict,
+    variables: list,
+    extra_args: dict,
+    strip: list = None,
+) -> dict:
+    """Return a JSON-compatible description of what a fetch_raw_chunk request downloads.
+
+    It is what the raw-data cache is keyed on and what the run manifest
+    records as a raw file's parameters. The boundary name is left out on
+    purpose: it only names the output file, so the east boundary of one case
+    can be served by the same box fetched for another case.
+    """
+    return dict(
+        function=f"{data_access_fn.__module__}.{data_access_fn.__qualname__}",
+        dates=list(dates),
+        latlon=None if strip is not None else latlon,
+        strip=strip,
+        variables=sorted(variables),
+        extra_args=content_args(extra_args),
+    )
+
+
 def fetch_raw_chunk(
     data_access_fn,
     dates: list,
@@ -132,38 +251,337 @@ def fetch_raw_chunk(
     variables: list,
     extra_args: dict,
     name=None,
+    strip: list = None,
+    cache=None,
+    manifest=None,
 ) -> Path:
     """Download one raw data chunk, skipping if a valid output file already exists.
 
     Shared by obc.py and initial_condition.py — both fetch a chunk of raw data
     for a given date range and bounding box, and both need to be idempotent
     across re-runs.
+
+    The access function writes into a private ``.partial_<stem>`` folder and
+    its output is renamed into output_folder only once it returns, so an
+    interrupted download never leaves a truncated file under the final name.
+
+    strip: optional list of already-padded lat/lon boxes (see strip_boxes)
+    to request instead of latlon. Each box is fetched separately and the
+    pieces are merged into output_file (see _fetch_strip).
+
+    cache: optional raw_cache.RawCache shared across cases. A cached result of
+    the same request is linked into place instead of downloading, and a new
+    download is added to the cache.
+
+    manifest: optional manifest.RunManifest. The skip check consults it (see
+    existing_artifact) and the finished file is recorded in it.
     """
     output_file = Path(output_folder) / output_filename
+    request = describe_raw_request(
+        data_access_fn, dates, latlon, variables, extra_args, strip
+    )
 
-    if output_file.exists():
-        if not is_valid_netcdf(output_file):
-            raise RuntimeError(
-                f"{output_file} exists but is not valid NetCDF. Delete it and re-run."
-            )
-        logger.info(f"{output_file.name} already exists. Skipping.")
+    if existing_artifact(output_file, manifest, request):
         return output_file
 
-    data_access_fn(
-        dates=dates,
-        lat_min=latlon["lat_min"],
-        lat_max=latlon["lat_max"],
-        lon_min=latlon["lon_min"],
-        lon_max=latlon["lon_max"],
-        output_folder=output_folder,
-        output_filename=output_file.name,
-        variables=variables,
-        name=name,
-        **extra_args,
+    if cache is not None and cache.materialize(request, output_file):
+        report.count("raw_cache_hits")
+    else:
+        if strip is not None:
+            _fetch_strip(
+                data_access_fn,
+                dates=dates,
+                strip=strip,
+                output_file=output_file,
+                variables=variables,
+                extra_args=extra_args,
+                name=name,
+            )
+        else:
+            _fetch_box(
+                data_access_fn,
+                dates=dates,
+                latlon=latlon,
+                output_file=output_file,
+                variables=variables,
+                extra_args=extra_args,
+                name=name,
+            )
+        # Access functions that only write a script leave nothing worth caching
+        if cache is not None and is_valid_netcdf(output_file):
+            cache.put(request, output_file)
+
+    if manifest is not None and is_valid_netcdf(output_file):
+        manifest.record(output_file, request)
+    return output_file
+
+
+def _fetch_box(
+    data_access_fn,
+    dates: list,
+    latlon: dict,
+    output_file: Path,
+    variables: list,
+    extra_args: dict,
+    name=None,
+):
+    """Call the access function for one lat/lon box inside a private folder,
+    then rename what it wrote into output_file's folder."""
+    partial_dir = output_file.with_name(f".partial_{output_file.stem}")
+    partial_dir.mkdir(exist_ok=True)
+    # Finished parts of an earlier failed chunked download (see
+    # datasets.utils.download_in_parts) are handed back to the access function
+    parts_dir = f".parts_{output_file.stem}"
+    if (output_file.parent / parts_dir).is_dir():
+        shutil.rmtree(partial_dir / parts_dir, ignore_errors=True)
+        os.replace(output_file.parent / parts_dir, partial_dir / parts_dir)
+    try:
+        report.count("provider_requests")
+        data_access_fn(
+            dates=dates,
+            lat_min=latlon["lat_min"],
+            lat_max=latlon["lat_max"],
+            lon_min=latlon["lon_min"],
+            lon_max=latlon["lon_max"],
+            output_folder=partial_dir,
+            output_filename=output_file.name,
+            variables=variables,
+            name=name,
+            **extra_args,
+        )
+        # Script-type access functions may write other files; move those too,
+        # and the requested file last
+        for path in sorted(
+            partial_dir.iterdir(), key=lambda p: p.name == output_file.name
+        ):
+            os.replace(path, output_file.parent / path.name)
+    except Exception:
+        if (partial_dir / parts_dir).is_dir():
+            os.replace(partial_dir / parts_dir, output_file.parent / parts_dir)
+        raise
+    finally:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+
+
+def strip_boxes(lons, lats, halo: float) -> list:
+    """Cover the points of a boundary segment with a few small lat/lon boxes.
+
+    The points are split into n contiguous runs and each run gets its own box,
+    grown by halo degrees on every side. A segment spanning X by Y degrees
+    needs about n * (X/n + 2*halo) * (Y/n + 2*halo) square degrees, which is
+    smallest at n = sqrt(X*Y) / (2*halo). A straight north-south or east-west
+    segment therefore stays one box, while a diagonal one is split so it no
+    longer drags in its whole bounding box.
+    """
+    lons, lats = np.asarray(lons).ravel(), np.asarray(lats).ravel()
+    span_x, span_y = np.ptp(lons), np.ptp(lats)
+    n = int(round(math.sqrt(span_x * span_y) / (2 * halo))) if halo > 0 else 1
+    n = min(max(n, 1), max(len(lons) - 1, 1))
+    edges = np.linspace(0, len(lons) - 1, n + 1).round().astype(int)
+    return [
+        {
+            "lat_min": float(lats[i0 : i1 + 1].min() - halo),
+            "lat_max": float(lats[i0 : i1 + 1].max() + halo),
+            "lon_min": float(lons[i0 : i1 + 1].min() - halo),
+            "lon_max": float(lons[i0 : i1 + 1].max() + halo),
+        }
+        for i0, i1 in zip(edges[:-1], edges[1:])
+    ]
+
+
+def _fetch_strip(
+    data_access_fn,
+    dates: list,
+    strip: list,
+    output_file: Path,
+    variables: list,
+    extra_args: dict,
+    name=None,
+) -> Path:
+    """Fetch every box of a strip and merge them into output_file.
+
+    Boxes already include their halo, so access functions that take a ``pad``
+    argument are asked not to add their own. The merged file lies on the union
+    of the pieces' coordinates, and the cells no box covered are left as
+    compressed fill values. Tiles and the merge go through temporary names,
+    so a valid output_file is always complete.
+    """
+    pad_kwargs = (
+        {"pad": 0} if "pad" in inspect.signature(data_access_fn).parameters else {}
     )
+    tiles = []
+    try:
+        for i, box in enumerate(strip):
+            tile = output_file.with_name(f".{output_file.stem}.tile{i:03d}.nc")
+            report.count("provider_requests")
+            data_access_fn(
+                dates=dates,
+                lat_min=box["lat_min"],
+                lat_max=box["lat_max"],
+                lon_min=box["lon_min"],
+                lon_max=box["lon_max"],
+                output_folder=output_file.parent,
+                output_filename=tile.name,
+                variables=variables,
+                name=name,
+                **pad_kwargs,
+                **extra_args,
+            )
+            if not is_valid_netcdf(tile):
+                raise RuntimeError(
+                    f"Strip subsetting needs an access function that writes "
+                    f"NetCDF files, but {tile.name} was not written."
+                )
+            tiles.append(tile)
+
+        if len(tiles) == 1:
+            os.replace(tiles[0], output_file)
+        else:
+            pieces = [xr.open_dataset(t) for t in tiles]
+            merged = xr.merge(pieces, compat="no_conflicts", join="outer")
+            tmp_path = output_file.with_name(f".{output_file.name}.tmp")
+            merged.to_netcdf(
+                tmp_path,
+                encoding={v: {"zlib": True, "complevel": 1} for v in merged.data_vars},
+            )
+            for piece in pieces:
+                piece.close()
+            os.replace(tmp_path, output_file)
+    finally:
+        for tile in tiles:
+            tile.unlink(missing_ok=True)
+    logger.info(f"Fetched {output_file.name} as a {len(strip)}-box strip")
     return output_file
 
 
+def union_latlon(boxes: list) -> dict:
+    """Return the smallest lat/lon box containing every box in boxes."""
+    return {
+        "lat_min": min(b["lat_min"] for b in boxes),
+        "lat_max": max(b["lat_max"] for b in boxes),
+        "lon_min": min(b["lon_min"] for b in boxes),
+        "lon_max": max(b["lon_max"] for b in boxes),
+    }
+
+
+def latlon_area(latlon: dict, pad: float = RAW_LATLON_PAD) -> float:
+    """Area in square degrees of the box actually downloaded for latlon."""
+    return (latlon["lat_max"] - latlon["lat_min"] + 2 * pad) * (
+        latlon["lon_max"] - latlon["lon_min"] + 2 * pad
+    )
+
+
+def latlon_coord_names(product_info: dict) -> list:
+    """Return the distinct (x, y) coordinate name pairs a forcing product uses."""
+    pairs = []
+    for grid in ("tracer", "u", "v"):
+        pair = (
+            product_info.get(f"{grid}_x_coord"),
+            product_info.get(f"{grid}_y_coord"),
+        )
+        if None not in pair and pair not in pairs:
+            pairs.append(pair)
+    return pairs
+
+
+def slice_raw_file(
+    src_path,
+    dest_path,
+    latlon: dict = None,
+    coords: list = (),
+    dates: list = None,
+    pad: float = RAW_LATLON_PAD,
+) -> Path:
+    """Write the part of a raw file that one smaller request would have downloaded.
+
+    latlon/coords select the padded lat/lon box on every 1-D (x, y) coordinate
+    pair in coords; longitudes are compared modulo 360 so either convention
+    works. dates ([start, end], end inclusive of its whole day) selects along
+    time. The slice is written to a temporary name and renamed into place, so
+    a valid dest_path is always complete.
+    """
+    dest_path = Path(dest_path)
+    with xr.open_dataset(src_path) as ds:
+        if latlon is not None:
+            for x, y in coords:
+                if x not in ds.coords or ds[x].ndim != 1 or ds[y].ndim != 1:
+                    continue
+                width = latlon["lon_max"] - latlon["lon_min"] + 2 * pad
+                in_lon = (ds[x] - (latlon["lon_min"] - pad)) % 360 <= width
+                in_lat = (ds[y] >= latlon["lat_min"] - pad) & (
+                    ds[y] <= latlon["lat_max"] + pad
+                )
+                ds = ds.isel({x: np.flatnonzero(in_lon), y: np.flatnonzero(in_lat)})
+        if dates is not None:
+            end = datetime.fromisoformat(str(dates[1])) + timedelta(
+                hours=23, minutes=59, seconds=59
+            )
+            ds = ds.sel(time=slice(str(dates[0]), end.isoformat()))
+        tmp_path = dest_path.with_name(f".{dest_path.name}.tmp")
+        ds.to_netcdf(tmp_path)
+    os.replace(tmp_path, dest_path)
+    logger.info(f"Sliced {dest_path.name} from {Path(src_path).name}")
+    return dest_path
+
+
+def find_covering_raw_file(folder, name: str, start: datetime, end: datetime):
+    """Return a ``{name}_unprocessed.{start}_{end}.nc`` file in folder whose
+    date range covers [start, end], or None."""
+    for path in sorted(Path(folder).glob(f"{name}_unprocessed.*.nc")):
+        try:
+            file_start, file_end = (
+                datetime.fromisoformat(d)
+                for d in path.stem.removeprefix(f"{name}_unprocessed.").split("_")
+            )
+        except ValueError:
+            continue
+        if file_start <= start and end <= file_end and is_valid_netcdf(path):
+            return path
+    return None
+
+
+def run_tasks(
+    fn, tasks: list, max_workers: int = 1, executor: str = "thread", span=None
+) -> list:
+    """Call ``fn(**task)`` for every task dict, optionally on a worker pool.
+
+    max_workers <= 1 runs the tasks serially in the calling process, exactly
+    like a plain loop. Otherwise tasks are submitted to a ``"thread"`` or
+    ``"process"`` pool (see EXECUTORS); with ``"process"``, fn and the task
+    values must be picklable. Results are returned in task order. If any task
+    fails, the remaining tasks are still allowed to finish (so no output file is
+    abandoned mid-write) and the first failure is then re-raised.
+
+    span, if given, maps a task to the run-report path it is recorded under
+    (see report.span).
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"Unknown executor '{executor}'. Expected one of {list(EXECUTORS)}."
+        )
+    if max_workers is None or max_workers <= 1 or len(tasks) <= 1:
+        if span is None:
+            return [fn(**task) for task in tasks]
+        results = []
+        for task in tasks:
+            with report.span(*span(task)):
+                results.append(fn(**task))
+        return results
+
+    with netcdf_locks.ordered_locks(), EXECUTORS[executor](
+        max_workers=min(max_workers, len(tasks))
+    ) as pool:
+        futures = [
+            report.submit(pool, executor, span and span(task), fn, **task)
+            for task in tasks
+        ]
+    # Leaving the context manager waits for every future, so all tasks are done.
+    errors = [f.exception() for f in futures if f.exception() is not None]
+    if errors:
+        raise errors[0]
+    return [f.result() for f in futures]
+
+
 def check_date_continuity(boundary_file_list: dict):
     """
     Check for overlaps or missing dates between consecutive files.
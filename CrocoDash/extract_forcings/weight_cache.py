@@ -0,0 +1,130 @@
+"""Content-addressed, cross-run cache for regridding weights.
+
+Regridding weights depend only on the source and target grids and on how the
+regridding is done, never on the dates being processed. Entries are therefore
+keyed by a ``fingerprint`` of the grid coordinates plus the regridding
+parameters (method, rotation mode, ...), so a re-run that only changes the
+date range finds its weights already built.
+
+The cache lives in one shared directory (by default ``DEFAULT_CACHE_DIR``),
+so sibling cases over the same region reuse each other's weights. It is capped
+at ``max_bytes``; when a new entry pushes it over, the least recently used
+entries are evicted. Every cache hit refreshes an entry's mtime, which is what
+"recently used" means here.
+
+Cached OBC weights are pickles, and loading a pickle can run arbitrary code.
+The cache directory is therefore created private (mode 0700), and a
+directory that is not owned by the current user, or that others can write
+to, is not used: lookups miss and nothing is stored in it.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+from CrocoDash import logging
+
+logger = logging.setup_logger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "crocodash" / "weights"
+DEFAULT_MAX_BYTES = 10 * 1024**3
+
+
+def fingerprint(*arrays, **params) -> str:
+    """Return a hex digest identifying a set of coordinate arrays and parameters.
+
+    arrays: coordinate arrays (numpy or xarray); their dtype, shape and values
+        all contribute to the key.
+    params: JSON-serialisable settings (method, rotation mode, ...).
+    """
+    h = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(np.asarray(array))
+        h.update(f"{array.dtype.str}{array.shape}".encode())
+        h.update(array.tobytes())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class WeightCache:
+    """A directory of weight files named by fingerprint, with an LRU size cap."""
+
+    def __init__(self, cache_dir=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+
+    def _trusted(self) -> bool:
+        """Create the cache directory if needed and return whether only the
+        current user can write to it."""
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        stat = self.cache_dir.stat()
+        if stat.st_uid == os.getuid() and not stat.st_mode & 0o022:
+            return True
+        logger.warning(
+            f"Not using the weight cache {self.cache_dir}: it must be owned by "
+            "you and not writable by others (chmod 700)"
+        )
+        return False
+
+    def path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str):
+        """Return the cached file for key (marking it as recently used), or None."""
+        path = self.path(key, suffix)
+        if not path.exists() or not self._trusted():
+            return None
+        os.utime(path)
+        logger.info(f"Reusing cached regridding weights {path.name}")
+        return path
+
+    def put(self, key: str, suffix: str, src_path) -> Path:
+        """Copy src_path into the cache under key, then enforce the size cap.
+
+        The copy goes through a temporary name and an atomic rename so that a
+        concurrent reader never sees a partially written entry. Returns None
+        when the cache directory is not private.
+        """
+        if not self._trusted():
+            return None
+        path = self.path(key, suffix)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+        return path
+
+    def materialize(self, key: str, suffix: str, dest_path) -> bool:
+        """Copy the cached entry for key to dest_path. Returns False on a miss."""
+        path = self.get(key, suffix)
+        if path is None:
+            return False
+        Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, dest_path)
+        return True
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits in max_bytes.
+
+        keep: an entry that must survive (typically the one just added).
+        """
+        entries = sorted(
+            (
+                p
+                for p in self.cache_dir.iterdir()
+                if p.is_file() and not p.name.startswith(".")
+            ),
+            key=lambda p: p.stat().st_mtime,
+        )
+        total = sum(p.stat().st_size for p in entries)
+        for p in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and p == Path(keep):
+                continue
+            total -= p.stat().st_size
+            p.unlink(missing_ok=True)
+            logger.info(f"Evicted cached regridding weights {p.name}")
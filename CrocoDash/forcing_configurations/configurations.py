@@ -592,6 +592,10 @@ class ConditionsConfigurator(BaseConfigurator):
             "function_args",
             comment="Resolved (defaults + overrides) args for the download function",
         ),
+        InputValueParam(
+            "case_is_non_local",
+            comment="Case is non-local, used when extract_forcings updates STOP_N",
+        ),
     ]
 
     output_params = [
@@ -633,7 +637,10 @@ class ConditionsConfigurator(BaseConfigurator):
         ConfigOutputParam("start_date", comment="Forcing start date"),
         ConfigOutputParam("end_date", comment="Forcing end date"),
         ConfigOutputParam("information", comment="Product variable-name metadata"),
-        ConfigOutputParam("step", comment="Chunk size (days) for forcing extraction"),
+        ConfigOutputParam(
+            "step",
+            comment="Chunk size (days) for forcing extraction, or 'auto' to plan it from memory",
+        ),
         ConfigOutputParam(
             "boundary_number_conversion",
             comment="Boundary name -> MOM6 segment number",
@@ -645,6 +652,53 @@ class ConditionsConfigurator(BaseConfigurator):
             "function_args",
             comment="Resolved (defaults + overrides) args for the download function",
         ),
+        ConfigOutputParam(
+            "max_workers",
+            comment="Worker pool size for forcing extraction (1 = serial, 'auto' to plan it from memory)",
+        ),
+        ConfigOutputParam(
+            "get_step_days",
+            comment="Days of boundary data per download request (null downloads the whole range at once)",
+        ),
+        ConfigOutputParam(
+            "memory_budget_gb",
+            comment="Memory the 'auto' regrid plan may use (null for most of the available memory)",
+        ),
+        ConfigOutputParam(
+            "executor", comment="Worker pool type for forcing extraction"
+        ),
+        ConfigOutputParam(
+            "union_download_max_gb",
+            comment="Download all boundaries and the IC in one request when that download is estimated at most this many GB (null: per boundary)",
+        ),
+        ConfigOutputParam(
+            "pipeline",
+            comment="Overlap OBC download, regrid and merge instead of running them in turn",
+        ),
+        ConfigOutputParam(
+            "strip_halo_cells",
+            comment="Download only a strip this many source cells wide along each boundary (null for bounding boxes)",
+        ),
+        ConfigOutputParam(
+            "ic_fill_in_place",
+            comment="Write the filled initial condition over init_*.nc instead of separate init_*_filled.nc files",
+        ),
+        ConfigOutputParam(
+            "component_workers",
+            comment="Worker slots shared by forcing components running at once (1 runs them one at a time)",
+        ),
+        ConfigOutputParam(
+            "ic_fill_tile_levels",
+            comment="Fill the initial condition this many depth levels at a time to bound memory (null loads whole fields)",
+        ),
+        ConfigOutputParam(
+            "download_quota_gb",
+            comment="Warn in preview when a single estimated download is larger than this (null: no check)",
+        ),
+        ConfigOutputParam(
+            "manifest_checksums",
+            comment="Record the SHA-256 of every finished file in the run manifest, for RunManifest.verify",
+        ),
     ]
 
     def __init__(
@@ -657,6 +711,7 @@ class ConditionsConfigurator(BaseConfigurator):
         start_date=None,
         end_date=None,
         function_args=None,
+        case_is_non_local=False,
     ):
         if date_range is not None:
             start_date = date_range[0].strftime(self._DATE_FORMAT)
@@ -669,6 +724,7 @@ class ConditionsConfigurator(BaseConfigurator):
             function_name=function_name,
             compset=compset,
             function_args=function_args or {},
+            case_is_non_local=case_is_non_local,
         )
 
     def validate_args(self, **kwargs):
@@ -726,6 +782,18 @@ class ConditionsConfigurator(BaseConfigurator):
         )
         self.set_output_param("preview", False)
         self.set_output_param("function_args", self.get_input_param("function_args"))
+        self.set_output_param("max_workers", 1)
+        self.set_output_param("get_step_days", None)
+        self.set_output_param("memory_budget_gb", None)
+        self.set_output_param("executor", "thread")
+        self.set_output_param("pipeline", False)
+        self.set_output_param("union_download_max_gb", None)
+        self.set_output_param("strip_halo_cells", None)
+        self.set_output_param("component_workers", 1)
+        self.set_output_param("ic_fill_in_place", False)
+        self.set_output_param("ic_fill_tile_levels", None)
+        self.set_output_param("download_quota_gb", None)
+        self.set_output_param("manifest_checksums", False)
 
         # ---- static initial condition / OBC params ----
         self.set_output_param("INIT_LAYERS_FROM_Z_FILE", "True")
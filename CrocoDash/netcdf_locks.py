@@ -0,0 +1,76 @@
+"""A consistent lock order for xarray's netCDF4 backend.
+
+xarray guards netCDF4 access with a ``CombinedLock`` of its netCDF-C and HDF5
+locks, plus a per-file lock when writing. ``CombinedLock`` de-duplicates its
+locks through a set, so the order it acquires them in depends on their hashes:
+in some processes reads take the HDF5 lock first while writes take the
+netCDF-C lock first. A thread reading a NetCDF file while another writes one
+can then each hold one lock and wait forever for the other. The forcing
+workflow reads and writes NetCDF from worker threads (thread-pool downloads,
+``tasks.run_local``, union slicing, concurrent IC fills), so this can hang a
+run.
+
+``ordered_locks`` makes ``CombinedLock`` keep its locks in the order they
+are given, and puts the shared netCDF4 lock in a fixed order, so every read
+and write acquires the netCDF-C lock before the HDF5 lock. It patches xarray
+only while the block runs. The functions that start worker threads
+(``scheduler.run_components``, ``utils.run_tasks``, ``download_in_parts``)
+wrap their pools in it, which covers ``run_workflow``, ``run_workflows`` and
+``tasks.run_local``.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from xarray.backends import locks, netCDF4_
+
+_state_lock = threading.Lock()
+_users = 0
+_saved = None
+
+
+def _ordered_init(self, combined):
+    # Same de-duplication as xarray, but keeping the order the locks come in
+    self.locks = tuple(dict.fromkeys(combined))
+
+
+def _order_locks():
+    """Patch xarray and return the original CombinedLock init and shared lock
+    order, for _restore."""
+    init = locks.CombinedLock.__init__
+    locks.CombinedLock.__init__ = _ordered_init
+    shared = netCDF4_.NETCDF4_PYTHON_LOCK
+    if not isinstance(shared, locks.CombinedLock):
+        return init, None
+    shared_locks = shared.locks
+    shared.locks = tuple(sorted(shared_locks, key=lambda lock: lock is locks.HDF5_LOCK))
+    return init, shared_locks
+
+
+def _restore(init, shared_locks):
+    locks.CombinedLock.__init__ = init
+    if shared_locks is not None:
+        netCDF4_.NETCDF4_PYTHON_LOCK.locks = shared_locks
+
+
+@contextmanager
+def ordered_locks():
+    """Make xarray acquire its netCDF-C and HDF5 locks in one fixed order
+    while the block runs.
+
+    Blocks may be nested and entered from several threads at once; xarray is
+    restored when the last one exits.
+    """
+    global _users, _saved
+    with _state_lock:
+        if _users == 0:
+            _saved = _order_locks()
+        _users += 1
+    try:
+        yield
+    finally:
+        with _state_lock:
+            _users -= 1
+            if _users == 0:
+                _restore(*_saved)
+                _saved = None
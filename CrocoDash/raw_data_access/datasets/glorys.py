@@ -11,7 +11,9 @@ from pathlib import Path
 import pandas as pd
 from CrocoDash.raw_data_access.datasets.utils import (
     convert_lons_to_180_range,
+    download_in_parts,
     make_dates_end_inclusive,
+    split_date_range,
 )
 from CrocoDash.raw_data_access.base import *
 
@@ -41,6 +43,9 @@ class GLORYS(ForcingProduct):
     depth_coord = "depth"
     tracer_var_names = {"temp": "thetao", "salt": "so"}
     calendar = GREGORIAN
+    grid_resolution = 1 / 12  # degrees
+    vertical_levels = 50
+    time_steps_per_day = 1  # daily means
 
     @accessmethod(
         description="Gathers GLORYS data from RDA on computers with access to glade/rda",
@@ -66,9 +71,12 @@ class GLORYS(ForcingProduct):
             "so",
             "thetao",
         ],
+        pad=1,
     ) -> xr.Dataset:
         """
         Gather GLORYS Data on Derecho Computers from the campaign storage and return the dataset sliced to the llc and urc coordinates at the specific dates
+
+        pad: degrees added on every side of the requested box
         """
         dates = pd.date_range(start=dates[0], end=dates[1]).to_pydatetime().tolist()
         path = Path(output_folder) / output_filename
@@ -93,19 +101,19 @@ class GLORYS(ForcingProduct):
 
         if lon_min * lon_max > 0:
             dataset = ds.sel(
-                latitude=slice(lat_min - 1, lat_max + 1),
-                longitude=slice(lon_min - 1, lon_max + 1),
+                latitude=slice(lat_min - pad, lat_max + pad),
+                longitude=slice(lon_min - pad, lon_max + pad),
             )
         else:
             dataset = xr.concat(
                 [
                     ds.sel(
-                        latitude=slice(lat_min - 1, lat_max + 1),
-                        **{"longitude": slice(lon_min - 1, 360)},
+                        latitude=slice(lat_min - pad, lat_max + pad),
+                        **{"longitude": slice(lon_min - pad, 360)},
                     ),
                     ds.sel(
-                        latitude=slice(lat_min - 1, lat_max + 1),
-                        **{"longitude": slice(-180, lon_max + 1)},
+                        latitude=slice(lat_min - pad, lat_max + pad),
+                        **{"longitude": slice(-180, lon_max + pad)},
                     ),
                 ],
                 dim="longitude",
@@ -129,25 +137,76 @@ class GLORYS(ForcingProduct):
         output_folder=None,
         output_filename=None,
         variables=["zos", "uo", "vo", "so", "thetao"],
+        pad=1,
+        chunk_days=31,
+        split_variables=False,
+        max_concurrent_requests=4,
+        retries=3,
+        backoff_seconds=10,
     ):
         """
         Using the copernucismarine api, query GLORYS data (any dates)
+
+        pad: degrees added on every side of the requested box
+        chunk_days, split_variables: requests longer than chunk_days (or with
+        several variables, if split_variables) are split into sub-requests,
+        downloaded max_concurrent_requests at a time and stitched into
+        output_filename. A failed sub-request is retried up to retries times
+        with exponential backoff, without repeating the others.
         """
-        start_datetime, end_datetime = make_dates_end_inclusive(dates)
         dataset_id = "cmems_mod_glo_phy_my_0.083deg_P1D-m"
-        response = copernicusmarine.subset(
-            dataset_id=dataset_id,
-            minimum_longitude=lon_min - 1,
-            maximum_longitude=lon_max + 1,
-            minimum_latitude=lat_min - 1,
-            maximum_latitude=lat_max + 1,
-            start_datetime=start_datetime,
-            end_datetime=end_datetime,
-            variables=variables,
-            output_directory=output_folder,
-            output_filename=output_filename,
+        box = dict(
+            minimum_longitude=lon_min - pad,
+            maximum_longitude=lon_max + pad,
+            minimum_latitude=lat_min - pad,
+            maximum_latitude=lat_max + pad,
+        )
+        path = Path(output_folder) / output_filename
+        parts = {
+            f"{piece[0]}_{piece[1]}_{'-'.join(sorted(group))}": (piece, group)
+            for piece in split_date_range(dates, chunk_days)
+            for group in ([[v] for v in variables] if split_variables else [variables])
+        }
+        if len(parts) == 1:
+            start_datetime, end_datetime = make_dates_end_inclusive(dates)
+            copernicusmarine.subset(
+                dataset_id=dataset_id,
+                **box,
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+                variables=variables,
+                output_directory=output_folder,
+                output_filename=output_filename,
+            )
+            return path
+
+        def fetch(part, part_path):
+            start_datetime, end_datetime = make_dates_end_inclusive(part[0])
+            copernicusmarine.subset(
+                dataset_id=dataset_id,
+                **box,
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+                variables=part[1],
+                output_directory=part_path.parent,
+                output_filename=part_path.name,
+                overwrite=True,
+                disable_progress_bar=True,
+            )
+
+        GLORYS.logger.info(
+            f"Downloading Glorys data to {path} in {len(parts)} parts, "
+            f"{max_concurrent_requests} at a time"
+        )
+        return download_in_parts(
+            fetch,
+            parts,
+            path,
+            max_concurrent_requests=max_concurrent_requests,
+            retries=retries,
+            backoff_seconds=backoff_seconds,
+            log=GLORYS.logger,
         )
-        return Path(output_folder) / output_filename
 
     @accessmethod(
         description="	Generates bash script for direct CLI run with the copernicusmarine package",
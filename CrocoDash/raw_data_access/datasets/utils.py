@@ -1,5 +1,15 @@
 import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import pandas as pd
+import xarray as xr
+from CrocoDash import netcdf_locks
+from CrocoDash.logging import setup_logger
+
+logger = setup_logger(__name__)
 
 
 def make_dates_end_inclusive(dates):
@@ -39,3 +49,84 @@ def write_bash_curl_script(url, script_name, output_folder, output_filename):
         f.write("\n".join(script_lines))
     os.chmod(full_script_path, 0o755)  # Make it executable
     return full_script_path
+
+
+def split_date_range(dates, chunk_days: int) -> list:
+    """Split the inclusive (start, end) dates into consecutive (start, end)
+    pieces of at most chunk_days days, as "%Y-%m-%d" strings."""
+    days = pd.date_range(
+        pd.Timestamp(dates[0]).normalize(), pd.Timestamp(dates[-1]).normalize()
+    )
+    chunk_days = max(1, int(chunk_days))
+    return [
+        (
+            days[i].strftime("%Y-%m-%d"),
+            days[min(i + chunk_days, len(days)) - 1].strftime("%Y-%m-%d"),
+        )
+        for i in range(0, len(days), chunk_days)
+    ]
+
+
+def download_in_parts(
+    fetch,
+    parts: dict,
+    output_path,
+    max_concurrent_requests: int = 1,
+    retries: int = 0,
+    backoff_seconds: float = 0.0,
+    log=logger,
+) -> Path:
+    """Download parts concurrently and stitch them into output_path.
+
+    parts maps a name to a sub-request (any description of it, e.g. its dates
+    and variables), and fetch(part, path) downloads one to path. The name
+    must identify the part's content, such as ``<start>_<end>_<variables>``:
+    it names the part's file. Up to max_concurrent_requests parts are fetched
+    at once. A part that fails is retried up to retries times, waiting
+    backoff_seconds * 2**attempt in between, while the other parts go on. The
+    parts are kept in a ``.parts_<stem>`` folder next to output_path until all
+    of them succeeded, so calling again after a failure fetches only the
+    missing ones; files of parts no longer requested (after the request was
+    split differently) are ignored. The parts are then combined by
+    coordinates (time, variables) into output_path.
+    """
+    output_path = Path(output_path)
+    parts_dir = output_path.with_name(f".parts_{output_path.stem}")
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    paths = [parts_dir / f"part_{name}.nc" for name in parts]
+
+    def fetch_part(part, path):
+        if path.exists():
+            return path
+        tmp = path.with_name(f"{path.stem}.tmp.nc")
+        for attempt in range(retries + 1):
+            try:
+                fetch(part, tmp)
+                break
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                wait = backoff_seconds * 2**attempt
+                log.warning(
+                    f"Part {part} failed ({e}), retry {attempt + 1}/{retries} in {wait:g}s"
+                )
+                time.sleep(wait)
+        os.replace(tmp, path)
+        return path
+
+    workers = max(1, min(int(max_concurrent_requests), len(parts)))
+    with netcdf_locks.ordered_locks(), ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(fetch_part, *args) for args in zip(parts.values(), paths)
+        ]
+    errors = [f.exception() for f in futures if f.exception() is not None]
+    if errors:
+        log.error(f"{len(errors)} of {len(parts)} parts failed; kept in {parts_dir}")
+        raise errors[0]
+
+    tmp = output_path.with_name(f".{output_path.name}.tmp")
+    with xr.open_mfdataset(paths, combine="by_coords") as ds:
+        ds.to_netcdf(tmp)
+    os.replace(tmp, output_path)
+    shutil.rmtree(parts_dir)
+    return output_path
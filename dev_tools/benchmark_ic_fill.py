@@ -0,0 +1,75 @@
+"""Benchmark the initial-condition fill against mom6_forge's per-level loop.
+
+Builds a synthetic multi-level field with a land mask and missing ocean
+cells, fills it level by level with ``mom6_forge.utils.fill_missing_data``
+(the path ``_fill_missing_and_write`` used to take) and with
+``fill.fill_missing_levels``, checks the results are identical and prints
+both timings.
+
+    python dev_tools/benchmark_ic_fill.py --levels 10 --ny 300 --nx 300 --workers 4
+
+The per-level loop is slow enough that --skip-reference is useful for
+realistic sizes (e.g. 75 levels on 1000x1000); the batched fill is then
+timed alone.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from mom6_forge import utils as m6b_utils
+
+from CrocoDash.extract_forcings import fill
+
+
+def synthetic_field(levels, ny, nx, seed=0):
+    """Return (data, mask): smooth data with NaN over land and in patches of
+    missing ocean that grow with depth, and a 0/1 land-sea mask."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:ny, 0:nx]
+    mask = ((x - nx / 3) ** 2 + (y - ny / 2) ** 2 > (min(nx, ny) / 5) ** 2).astype(
+        float
+    )
+    data = np.empty((levels, ny, nx), dtype="f4")
+    for k in range(levels):
+        data[k] = np.sin(x / 17 + k) * np.cos(y / 23) + rng.normal(0, 0.01, (ny, nx))
+        data[k][mask == 0] = np.nan
+        data[k][rng.random((ny, nx)) < 0.05 + 0.3 * k / max(levels, 1)] = np.nan
+    return data, mask
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, default=10)
+    parser.add_argument("--ny", type=int, default=300)
+    parser.add_argument("--nx", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--skip-reference", action="store_true")
+    args = parser.parse_args()
+
+    data, mask = synthetic_field(args.levels, args.ny, args.nx)
+    print(
+        f"{args.levels} levels of {args.ny}x{args.nx}, "
+        f"{int(np.isnan(data).sum() - args.levels * (mask == 0).sum())} "
+        f"missing ocean cells"
+    )
+
+    t = time.perf_counter()
+    batched = fill.fill_missing_levels(data, mask, max_workers=args.workers)
+    t_batched = time.perf_counter() - t
+    print(f"fill_missing_levels ({args.workers} workers): {t_batched:8.2f}s")
+
+    if not args.skip_reference:
+        t = time.perf_counter()
+        reference = np.stack(
+            [m6b_utils.fill_missing_data(level, mask).filled(np.nan) for level in data]
+        ).astype(data.dtype)
+        t_reference = time.perf_counter() - t
+        print(f"mom6_forge per level:            {t_reference:8.2f}s")
+        print(f"speed-up: {t_reference / t_batched:.1f}x")
+        np.testing.assert_array_equal(batched, reference)
+        print("results identical")
+
+
+if __name__ == "__main__":
+    main()
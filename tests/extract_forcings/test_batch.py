@@ -0,0 +1,128 @@
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from CrocoDash.extract_forcings import batch, driver, obc
+from CrocoDash.extract_forcings.raw_cache import RawCache
+
+
+@pytest.fixture
+def two_cases(tmp_path, get_rect_grid):
+    """Two cases on the same grid, differing only in their end date."""
+    hgrid_path = tmp_path / "hgrid.nc"
+    get_rect_grid.write_supergrid(hgrid_path)
+    cases = {}
+    for name, end_date in [("case_a", "20200120"), ("case_b", "20200110")]:
+        inputdir = tmp_path / name / "input"
+        (inputdir / "extract_forcings").mkdir(parents=True)
+        config = {
+            "caseroot": str(tmp_path / name),
+            "weight_cache": {"dir": str(tmp_path / "weights")},
+            "conditions": {
+                "inputs": {
+                    "product_name": "GLORYS",
+                    "function_name": "get_glorys_data_from_rda",
+                },
+                "outputs": {
+                    "start_date": "20200101",
+                    "end_date": end_date,
+                    "date_format": "%Y%m%d",
+                    "information": {
+                        "u_var_name": "uo",
+                        "v_var_name": "vo",
+                        "eta_var_name": "zos",
+                        "tracer_var_names": {"temp": "thetao", "salt": "so"},
+                    },
+                    "boundary_number_conversion": {"east": 1, "south": 2},
+                    "step": 5,
+                    "get_step_days": 10,
+                    "max_workers": 1,
+                },
+            },
+        }
+        state = {
+            "inputdir": str(inputdir),
+            "supergrid_path": str(hgrid_path),
+            "vgrid_path": str(tmp_path / "vgrid.nc"),
+            "topo_path": str(tmp_path / "topo.nc"),
+        }
+        cases[inputdir / "extract_forcings" / "config.json"] = (config, state, inputdir)
+    return cases
+
+
+def test_run_workflows_shares_downloads_and_weights(tmp_path, two_cases):
+    fetched = []
+    runs = []
+    lock = threading.Lock()
+
+    def fake_get_chunk(product_name, function_name, **request):
+        fetched.append((request["name"], tuple(request["dates"])))
+
+    def fake_run_workflow(config_path, **kwargs):
+        with lock:
+            runs.append(("start", Path(config_path).parts[-4], kwargs))
+        with lock:
+            runs.append(("end", Path(config_path).parts[-4], kwargs))
+
+    with (
+        patch.object(driver, "_load", side_effect=lambda p: two_cases[Path(p)]),
+        patch.object(obc, "_get_chunk", side_effect=fake_get_chunk),
+        patch.object(driver, "run_workflow", side_effect=fake_run_workflow),
+    ):
+        status = batch.run_workflows(
+            list(two_cases),
+            components=["bc", "tides"],
+            max_workers=2,
+            memory_budget_gb=8,
+            raw_cache=RawCache(tmp_path / "cache"),
+        )
+
+    assert {s.status for s in status.values()} == {"done"}
+    # case_b's first 10 days are case_a's first chunk: fetched once
+    assert sorted(fetched) == sorted(
+        (boundary, dates)
+        for boundary in ("east", "south")
+        for dates in [("2020-01-01", "2020-01-10"), ("2020-01-11", "2020-01-20")]
+    )
+    # Same grid and product: case_b waits for case_a's weights
+    assert [(event, case) for event, case, _ in runs] == [
+        ("start", "case_a"),
+        ("end", "case_a"),
+        ("start", "case_b"),
+        ("end", "case_b"),
+    ]
+    kwargs = runs[0][2]
+    assert kwargs["bc"] is True and "tides" not in kwargs
+    assert kwargs["max_workers"] == 1
+    assert kwargs["memory_budget_gb"] == 4
+    assert kwargs["raw_cache"].cache_dir == tmp_path / "cache"
+
+
+def test_run_workflows_rejects_unknown_components(two_cases):
+    with pytest.raises(ValueError, match="Unknown components"):
+        batch.run_workflows(list(two_cases), components=["bc", "waves"])
+
+
+def test_run_workflows_shares_union_downloads(tmp_path, two_cases):
+    fetched = []
+    for config, _, _ in two_cases.values():
+        config["conditions"]["outputs"]["union_download_max_gb"] = 100.0
+
+    def fake_get_chunk(product_name, function_name, **request):
+        fetched.append((request["name"], tuple(request["dates"])))
+
+    with (
+        patch.object(driver, "_load", side_effect=lambda p: two_cases[Path(p)]),
+        patch.object(obc, "_get_chunk", side_effect=fake_get_chunk),
+        patch.object(driver, "run_workflow"),
+    ):
+        batch.run_workflows(
+            list(two_cases), components=["bc"], raw_cache=RawCache(tmp_path / "cache")
+        )
+
+    assert sorted(fetched) == [
+        ("union", ("2020-01-01", "2020-01-10")),
+        ("union", ("2020-01-11", "2020-01-20")),
+    ]
@@ -123,6 +123,17 @@ def test_process_config_flag(mock_run, tmp_path):
     assert call_kwargs["config_path"] == config_path
 
 
+@patch("CrocoDash.extract_forcings.driver.run_workflow")
+def test_process_jobs_flag(mock_run, tmp_path):
+    """--jobs is forwarded to run_workflow as max_workers."""
+    config_path = tmp_path / "config.json"
+    _write_config(config_path)
+
+    run_main(["process", "--config", str(config_path), "--bc", "--jobs", "4"])
+
+    assert mock_run.call_args.kwargs["max_workers"] == 4
+
+
 @patch("CrocoDash.extract_forcings.driver.run_workflow")
 @patch("CrocoDash.extract_forcings.driver.resolve_components")
 @patch("CrocoDash.case_state.read")
@@ -202,3 +213,26 @@ def test_process_preview_from_config(mock_read, mock_resolve, mock_run, tmp_path
 
     call_kwargs = mock_run.call_args.kwargs
     assert call_kwargs["preview"] is True
+
+
+@patch("CrocoDash.extract_forcings.batch.run_workflows")
+@patch("CrocoDash.case_state.read")
+def test_process_many_runs_every_case(mock_read, mock_run, tmp_path):
+    for name in ("a", "b"):
+        ef_dir = tmp_path / name / "input" / "extract_forcings"
+        ef_dir.mkdir(parents=True)
+        _write_config(ef_dir / "config.json")
+    mock_read.side_effect = lambda caseroot: {
+        "inputdir": str(tmp_path / caseroot.name / "input")
+    }
+    mock_run.return_value = {}
+
+    run_main(
+        ["process-many", str(tmp_path / "a"), str(tmp_path / "b")]
+        + ["--all", "--skip", "tides", "--jobs", "8"]
+    )
+
+    args, kwargs = mock_run.call_args
+    assert [p.parts[-4] for p in args[0]] == ["a", "b"]
+    assert "tides" not in kwargs["components"] and "bc" in kwargs["components"]
+    assert kwargs["max_workers"] == 8
@@ -131,7 +131,12 @@ def _make_config(caseroot="/case", extra_keys=None):
                 "start_date": "20200101",
                 "end_date": "20200109",
                 "date_format": "%Y%m%d",
-                "information": {},
+                "information": {
+                    "u_var_name": "uo",
+                    "v_var_name": "vo",
+                    "eta_var_name": "zos",
+                    "tracer_var_names": {"temp": "thetao", "salt": "so"},
+                },
                 "boundary_number_conversion": {"north": 1, "south": 2},
                 "step": "7",
                 "preview": False,
@@ -238,6 +243,52 @@ def test_run_workflow_runoff_calls_rof_module(mock_cs, mock_rof, tmp_path):
     mock_rof.generate_rof_ocn_map.assert_called_once()
 
 
+@patch("CrocoDash.extract_forcings.driver.bgc")
+@patch("CrocoDash.extract_forcings.driver.case_state")
+def test_run_workflow_skips_up_to_date_and_rebuilds_changed_components(
+    mock_cs, mock_bgc, tmp_path, capsys
+):
+    marbl_ic = tmp_path / "marbl_source.nc"
+    marbl_ic.write_text("v1")
+    output = tmp_path / "ocnice" / "marbl_ic.nc"
+    output.parent.mkdir()
+    config = _make_config(
+        extra_keys={
+            "bgcic": {
+                "inputs": {"marbl_ic_filepath": str(marbl_ic)},
+                "outputs": {"MARBL_TRACERS_IC_FILE": "marbl_ic.nc"},
+            }
+        }
+    )
+    mock_cs.read.return_value = _make_state(tmp_path)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+
+    def process_bgc_ic(file_path, output_path):
+        # A rebuild never sees the stale output
+        assert not output_path.exists()
+        output_path.write_text(Path(file_path).read_text())
+
+    mock_bgc.process_bgc_ic.side_effect = process_bgc_ic
+
+    run_workflow(config_path=config_path, bgcic=True)
+    run_workflow(config_path=config_path, bgcic=True)
+    assert mock_bgc.process_bgc_ic.call_count == 1
+    assert "[skip] 'bgcic' is up to date" in capsys.readouterr().out
+
+    marbl_ic.write_text("v2")
+    run_workflow(config_path=config_path, bgcic=True)
+    assert mock_bgc.process_bgc_ic.call_count == 2
+    assert "'bgcic': inputs changed" in capsys.readouterr().out
+    assert output.read_text() == "v2"
+
+    config["bgcic"]["inputs"]["comment"] = "new setting"
+    config_path.write_text(json.dumps(config))
+    run_workflow(config_path=config_path, bgcic=True)
+    assert mock_bgc.process_bgc_ic.call_count == 3
+    assert "'bgcic': settings changed" in capsys.readouterr().out
+
+
 @patch("CrocoDash.extract_forcings.driver.initial_condition")
 @patch("CrocoDash.extract_forcings.driver.obc")
 @patch("CrocoDash.extract_forcings.driver.case_state")
@@ -254,3 +305,226 @@ def test_run_workflow_returns_timings(
 
     assert isinstance(result, dict)
     assert "ic" in result
+
+
+@patch("CrocoDash.extract_forcings.driver.obc")
+@patch("CrocoDash.extract_forcings.driver.case_state")
+def test_run_workflow_max_workers_from_config_and_override(mock_cs, mock_obc, tmp_path):
+    config = _make_config()
+    config["conditions"]["outputs"]["max_workers"] = 3
+    mock_cs.read.return_value = _make_state(tmp_path)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+
+    run_workflow(config_path=config_path, bc=True)
+    assert mock_obc.process_obc_conditions.call_args.kwargs["max_workers"] == 3
+
+    run_workflow(config_path=config_path, bc=True, max_workers=8)
+    assert mock_obc.process_obc_conditions.call_args.kwargs["max_workers"] == 8
+
+
+@patch("CrocoDash.extract_forcings.driver.obc")
+@patch("CrocoDash.extract_forcings.driver.case_state")
+def test_run_workflow_records_auto_regrid_plan(mock_cs, mock_obc, tmp_path):
+    config = _make_config()
+    config["conditions"]["outputs"].update(
+        step="auto", max_workers="auto", memory_budget_gb=16
+    )
+    mock_cs.read.return_value = _make_state(tmp_path)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+    plan = {"regrid_step_days": 12, "max_workers": 4}
+    mock_obc.process_obc_conditions.return_value = plan
+
+    run_workflow(config_path=config_path, bc=True)
+
+    kwargs = mock_obc.process_obc_conditions.call_args.kwargs
+    assert kwargs["regrid_step_days"] == "auto"
+    assert kwargs["max_workers"] == "auto"
+    assert kwargs["memory_budget_gb"] == 16
+    recorded = json.loads(config_path.read_text())
+    assert recorded["conditions"]["outputs"]["regrid_plan"] == plan
+    assert recorded["conditions"]["outputs"]["step"] == "auto"
+
+
+@patch("CrocoDash.extract_forcings.driver.subprocess")
+@patch("CrocoDash.extract_forcings.driver.obc")
+@patch("CrocoDash.extract_forcings.driver.case_state")
+def test_run_workflow_extend_to_updates_end_date_and_stop_n(
+    mock_cs, mock_obc, mock_subprocess, tmp_path
+):
+    caseroot = tmp_path / "case"
+    caseroot.mkdir()
+    (caseroot / "xmlchange").touch()
+    config = _make_config(caseroot=str(caseroot))
+    config["conditions"]["inputs"]["end_date"] = "20200109"
+    mock_cs.read.return_value = _make_state(tmp_path)
+    mock_subprocess.run.return_value.returncode = 0
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+
+    with pytest.raises(ValueError, match="must be after"):
+        run_workflow(config_path=config_path, bc=True, extend_to="2020-01-05")
+
+    run_workflow(config_path=config_path, bc=True, extend_to="2020-02-01")
+
+    kwargs = mock_obc.process_obc_conditions.call_args.kwargs
+    assert kwargs["extend"] is True
+    assert kwargs["end_date"] == "20200201"
+    recorded = json.loads(config_path.read_text())
+    assert recorded["conditions"]["outputs"]["end_date"] == "20200201"
+    assert recorded["conditions"]["inputs"]["end_date"] == "20200201"
+    mock_subprocess.run.assert_called_once_with(
+        ["./xmlchange", "STOP_N=31"], cwd=str(caseroot), capture_output=True, text=True
+    )
+
+
+def test_update_stop_n_fails_loudly(tmp_path):
+    from CrocoDash.extract_forcings.driver import _update_stop_n
+
+    with pytest.raises(RuntimeError, match="No xmlchange"):
+        _update_stop_n(tmp_path, 31)
+
+    script = tmp_path / "xmlchange"
+    script.write_text('#!/bin/sh\necho "$@" > args\necho rejected >&2\nexit 1\n')
+    script.chmod(0o755)
+    with pytest.raises(RuntimeError, match="rejected"):
+        _update_stop_n(tmp_path, 31, is_non_local=True)
+    assert (tmp_path / "args").read_text() == "STOP_N=31 --non-local\n"
+
+
+@patch("CrocoDash.extract_forcings.context.Topo")
+@patch("CrocoDash.extract_forcings.context.Grid")
+@patch("CrocoDash.extract_forcings.driver.chl")
+@patch("CrocoDash.extract_forcings.driver.tides_mod")
+@patch("CrocoDash.extract_forcings.driver.bgc")
+@patch("CrocoDash.extract_forcings.driver.case_state")
+def test_run_workflow_loads_grid_and_topo_once(
+    mock_cs, mock_bgc, mock_tides, mock_chl, mock_grid, mock_topo, tmp_path
+):
+    import xarray as xr
+
+    config = _make_config(
+        extra_keys={
+            "bgcironforcing": {
+                "outputs": {
+                    "MARBL_FESEDFLUX_FILE": "fesed.nc",
+                    "MARBL_FEVENTFLUX_FILE": "fevent.nc",
+                    "MARBL_FESEDFLUXRED_FILE": "fesedred.nc",
+                }
+            },
+            "tides": {
+                "inputs": {
+                    "tidal_constituents": ["M2"],
+                    "boundaries": ["north"],
+                    "tpxo_elevation_filepath": "h.nc",
+                    "tpxo_velocity_filepath": "u.nc",
+                }
+            },
+            "chl": {
+                "inputs": {"chl_processed_filepath": "chl_in.nc"},
+                "outputs": {"CHL_FILE": "chl.nc"},
+            },
+        }
+    )
+    state = _make_state(tmp_path)
+    xr.Dataset(attrs={"min_depth": 9.5}).to_netcdf(state["topo_path"])
+    mock_cs.read.return_value = state
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+
+    run_workflow(config_path=config_path, bgcironforcing=True, tides=True, chl_=True)
+
+    mock_grid.from_supergrid.assert_called_once_with(state["supergrid_path"])
+    mock_topo.from_topo_file.assert_called_once_with(
+        mock_grid.from_supergrid.return_value,
+        state["topo_path"],
+        min_depth=9.5,
+        git=False,
+    )
+    topo = mock_topo.from_topo_file.return_value
+    assert mock_tides.process_tides.call_args.kwargs["ocn_topo"] is topo
+    assert mock_chl.process_chl.call_args.kwargs["ocn_topo"] is topo
+
+
+def test_workflow_context_requires_min_depth(tmp_path):
+    import xarray as xr
+    from CrocoDash.extract_forcings.context import WorkflowContext
+
+    topo_path = tmp_path / "topo.nc"
+    xr.Dataset().to_netcdf(topo_path)
+    ctx = WorkflowContext(tmp_path / "hgrid.nc", topo_path, tmp_path / "vgrid.nc")
+    with pytest.raises(KeyError, match="min_depth"):
+        ctx.min_depth
+
+
+@patch("CrocoDash.extract_forcings.driver.rof")
+@patch("CrocoDash.extract_forcings.driver.bgc")
+@patch("CrocoDash.extract_forcings.driver.case_state")
+def test_run_workflow_runs_remaining_components_after_a_failure(
+    mock_cs, mock_bgc, mock_rof, tmp_path, capsys
+):
+    config = _make_config(
+        extra_keys={
+            "bgcic": {
+                "inputs": {"marbl_ic_filepath": "/some/file.nc"},
+                "outputs": {"MARBL_TRACERS_IC_FILE": "marbl_ic.nc"},
+            },
+            "runoff": {
+                "inputs": {
+                    "rof_grid_name": "GLOFAS",
+                    "rof_esmf_mesh_filepath": "mesh.nc",
+                    "case_esmf_mesh_path": "ocn_mesh.nc",
+                    "case_grid_name": "test",
+                    "rmax": 20,
+                    "fold": 40,
+                },
+                "outputs": {"ROF2OCN_LIQ_RMAPNAME": "map.nc"},
+            },
+            "bgcrivernutrients": {
+                "inputs": {"global_river_nutrients_filepath": "nutrients.nc"},
+                "outputs": {"RIV_FLUX_FILE": "riv_flux.nc"},
+            },
+        }
+    )
+    config["conditions"]["outputs"]["component_workers"] = 2
+    mock_cs.read.return_value = _make_state(tmp_path)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+    mock_rof.generate_rof_ocn_map.side_effect = RuntimeError("no mesh")
+
+    with pytest.raises(RuntimeError, match="no mesh"):
+        run_workflow(
+            config_path=config_path, bgcic=True, runoff=True, bgcrivernutrients=True
+        )
+
+    mock_bgc.process_bgc_ic.assert_called_once()
+    mock_bgc.process_river_nutrients.assert_not_called()
+    out = capsys.readouterr().out
+    assert "bgcrivernutrients  skipped" in out
+    assert "[timing] bgcic:" in out
+
+
+@patch("CrocoDash.extract_forcings.driver.obc")
+@patch("CrocoDash.extract_forcings.driver.case_state")
+def test_run_workflow_writes_run_report(mock_cs, mock_obc, tmp_path):
+    from CrocoDash.extract_forcings import report
+
+    def process_obc_conditions(**kwargs):
+        with report.span("east", "GET", "2020-01-01_2020-01-09"):
+            report.count("provider_requests")
+
+    mock_obc.process_obc_conditions.side_effect = process_obc_conditions
+    mock_cs.read.return_value = _make_state(tmp_path)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(_make_config()))
+
+    run_workflow(config_path=config_path, bc=True)
+
+    path = report.latest(tmp_path / "extract_forcings" / "reports")
+    run = report.load(path)["run"]
+    (bc,) = run["children"]
+    assert bc["attrs"] == {"status": "done"}
+    assert bc["children"][0]["children"][0]["children"][0]["counters"] == {
+        "provider_requests": 1
+    }
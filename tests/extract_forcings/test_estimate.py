@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from CrocoDash.extract_forcings import estimate
+
+PRODUCT_INFO = {
+    "u_var_name": "uo",
+    "v_var_name": "vo",
+    "eta_var_name": "zos",
+    "tracer_var_names": {"temp": "thetao", "salt": "so"},
+    "grid_resolution": 1 / 12,
+    "vertical_levels": 50,
+    "time_steps_per_day": 1,
+}
+
+
+def _span(name, children=(), wall_s=0.0, requests=0, **attrs):
+    return dict(
+        name=name,
+        attrs=attrs,
+        wall_s=wall_s,
+        counters={"provider_requests": requests} if requests else {},
+        children=list(children),
+    )
+
+
+def _write_report(reports_dir, stamp, children):
+    reports_dir.mkdir(exist_ok=True)
+    data = dict(run=_span("run", children))
+    (reports_dir / f"run_{stamp}.json").write_text(json.dumps(data))
+
+
+def test_download_bytes_from_product_metadata():
+    box = {"lat_min": 10.0, "lat_max": 11.0, "lon_min": 20.0, "lon_max": 21.0}
+    # 13 x 13 cells, 4 variables on 50 levels plus zos, 2 daily steps
+    assert estimate.download_bytes([box], 2, PRODUCT_INFO, pad=0.0) == (
+        13 * 13 * (4 * 50 + 1) * 2 * 4
+    )
+    # Padding grows the box by a degree on every side
+    assert estimate.download_bytes([box], 1, PRODUCT_INFO) == 37 * 37 * 201 * 4
+
+    sizes = estimate.product_sizes({**PRODUCT_INFO, "vertical_levels": None})
+    assert sizes["vertical_levels"] == estimate.DEFAULT_VERTICAL_LEVELS
+    assert sizes["assumed"] == ["vertical_levels"]
+
+
+def test_cost_model_fits_past_reports(tmp_path):
+    reports_dir = tmp_path / "reports"
+    for i, (work, seconds) in enumerate([(100.0, 12.0), (300.0, 32.0)]):
+        get = _span(
+            "2020-01-01_2020-01-31",
+            wall_s=seconds,
+            requests=1,
+            work_phase="bc_get",
+            work=work,
+        )
+        # A chunk that was already on disk made no request and is ignored
+        skipped = _span("2020-02-01_2020-02-29", wall_s=0.01, **get["attrs"])
+        bc = _span("bc", [_span("east", [_span("GET", [get, skipped])])], 60.0)
+        bc["attrs"]["status"] = "done"
+        _write_report(reports_dir, f"2020010{i}T000000", [bc])
+
+    model = estimate.CostModel.from_reports(reports_dir)
+    assert model.n_reports == 2
+    overhead, rate = model.fits["bc_get"]
+    assert overhead == pytest.approx(2.0)
+    assert rate == pytest.approx(0.1)
+    assert model.seconds("bc_get", 200.0) == pytest.approx(22.0)
+    assert model.seconds("bc_regrid", 200.0) is None
+    assert model.components == {"bc": 60.0}
+
+    assert estimate.CostModel.from_reports(tmp_path / "none").fits == {}
@@ -0,0 +1,185 @@
+import numpy as np
+import pytest
+import xarray as xr
+import regional_mom6 as rm6
+from mom6_forge import utils as m6b_utils
+
+from CrocoDash.extract_forcings import fill
+from CrocoDash.extract_forcings.initial_condition import (
+    _fill_missing_and_write,
+    final_cleanliness_fill,
+)
+
+
+def _segment(times=6, levels=4, cells=20, seed=0):
+    rng = np.random.default_rng(seed)
+    temp = rng.random((times, levels, 1, cells))
+    land = rng.random((levels, 1, cells)) < 0.3
+    land[:, :, :4] = True
+    land[-1] = True  # filled from the level above
+    temp[:, land] = np.nan
+    eta = rng.random((times, 1, cells + 1))
+    eta[:, :, -3:] = np.nan
+    return xr.Dataset(
+        {
+            "temp_segment_001": (
+                ("time", "nz_segment_001_temp", "ny_segment_001", "nx_segment_001"),
+                temp,
+            ),
+            "eta_segment_001": (("time", "ny_segment_001", "nxq_segment_001"), eta),
+            "lon_segment_001": ("nx_segment_001", np.arange(cells, dtype="f8")),
+        },
+        coords={"time": np.arange(times)},
+    )
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    fill.clear_cache()
+    yield
+    fill.clear_cache()
+
+
+def test_fill_matches_regional_mom6():
+    ds = _segment()
+    expected = rm6.regridding.fill_missing_data(ds.copy(), dim="all")
+    xr.testing.assert_identical(fill.fill_missing_data(ds), expected)
+    xr.testing.assert_identical(
+        fill.fill_missing_data(ds, dim="nx_segment_001"),
+        rm6.regridding.fill_missing_data(ds.copy(), dim="nx_segment_001"),
+    )
+
+
+def test_gather_maps_are_reused_across_slices(monkeypatch):
+    calls = []
+    build = fill._gather_map
+    monkeypatch.setattr(
+        fill, "_gather_map", lambda *args: calls.append(args[1]) or build(*args)
+    )
+
+    fill.fill_missing_data(_segment(seed=0))
+    # Another slice of the same segment: same land, different values
+    later = _segment(seed=0)
+    later["temp_segment_001"] += 1
+    later["eta_segment_001"] += 1
+    xr.testing.assert_identical(
+        fill.fill_missing_data(later),
+        rm6.regridding.fill_missing_data(later.copy(), dim="all"),
+    )
+    assert len(calls) == 2  # one per variable with NaNs, built once
+
+
+def test_gather_map_cache_is_shared_across_threads(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(fill, "MAX_CACHED_MAPS", 3)
+    segments = [_segment(seed=seed % 4) for seed in range(32)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        filled = list(pool.map(fill.fill_missing_data, segments))
+
+    for ds, got in zip(segments, filled):
+        xr.testing.assert_identical(
+            got, rm6.regridding.fill_missing_data(ds.copy(), dim="all")
+        )
+    assert len(fill._maps) <= 3
+
+
+def test_moving_nans_fall_back_to_pass_by_pass_fill():
+    ds = _segment()
+    ds["eta_segment_001"][2, 0, 5] = np.nan  # a NaN in one time step only
+    expected = rm6.regridding.fill_missing_data(ds.copy(), dim="all")
+    xr.testing.assert_identical(fill.fill_missing_data(ds), expected)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fill_matches_regional_mom6_when_nans_move_over_time(seed):
+    rng = np.random.default_rng(seed)
+    ds = _segment(times=8, seed=seed)
+    temp = ds["temp_segment_001"].values
+    eta = ds["eta_segment_001"].values
+    # A wetting and drying edge that moves one cell per time step
+    for t in range(temp.shape[0]):
+        temp[t, :, :, 4 + t] = np.nan
+        eta[t, :, : 2 + t] = np.nan
+    # Scattered NaNs, and a time step missing a whole level, that only the
+    # passes along time can fill
+    temp[rng.random(temp.shape) < 0.1] = np.nan
+    temp[3, 1] = np.nan
+    eta[0] = np.nan
+    ds["temp_segment_001"].values = temp
+    ds["eta_segment_001"].values = eta
+
+    expected = rm6.regridding.fill_missing_data(ds.copy(), dim="all")
+    xr.testing.assert_identical(fill.fill_missing_data(ds), expected)
+    assert not fill._maps  # nothing to reuse for a mask that changes
+
+
+def _ic_level(shape=(30, 40), seed=0, dtype="f8"):
+    rng = np.random.default_rng(seed)
+    mask = (rng.random(shape) > 0.2).astype(float)
+    data = rng.random(shape).astype(dtype)
+    data[rng.random(shape) < 0.3] = np.nan
+    return data, mask
+
+
+@pytest.mark.parametrize("dtype", ["f8", "f4"])
+def test_fill_missing_level_matches_mom6_forge_exactly(dtype):
+    data, mask = _ic_level(dtype=dtype)
+    expected = m6b_utils.fill_missing_data(data, mask)
+    filled = fill.fill_missing_level(data, mask)
+    np.testing.assert_array_equal(np.ma.getmaskarray(filled), mask == 0)
+    np.testing.assert_array_equal(filled.filled(np.nan), expected.filled(np.nan))
+
+
+def test_fill_and_write_matches_per_level_path(tmp_path):
+    rng = np.random.default_rng(1)
+    mask = xr.DataArray((rng.random((12, 15)) > 0.2).astype(float))
+    temp = rng.random((5, 12, 15)).astype("f4")
+    temp[:, rng.random((12, 15)) < 0.3] = np.nan
+    temp[3:, :4] = np.nan  # deeper levels miss more
+    ds = xr.Dataset({"temp": (("zl", "ny", "nx"), temp)}, coords={"zl": np.arange(5)})
+    ds.to_netcdf(tmp_path / "init_tracers.nc")
+
+    # The per-level mom6_forge path this replaces
+    expected = ds.copy(deep=True)
+    for z in range(5):
+        expected["temp"][z] = m6b_utils.fill_missing_data(
+            expected["temp"][z].values, mask.values
+        )
+    expected["temp"] = final_cleanliness_fill(expected["temp"], "nx", "ny", "zl")
+
+    _fill_missing_and_write(
+        tmp_path / "init_tracers.nc",
+        tmp_path / "init_tracers_filled.nc",
+        [{"name": "temp", "mask": mask, "dims": ("nx", "ny", "zl"), "encoding": {}}],
+        max_workers=3,
+    )
+    with xr.open_dataset(tmp_path / "init_tracers_filled.nc") as out:
+        np.testing.assert_array_equal(out["temp"].values, expected["temp"].fillna(0))
+
+
+def test_tiled_fill_matches_whole_field_fill(tmp_path):
+    rng = np.random.default_rng(2)
+    mask = xr.DataArray((rng.random((12, 15)) > 0.2).astype(float))
+    temp = rng.random((5, 12, 15)).astype("f4")
+    temp[:, rng.random((12, 15)) < 0.3] = np.nan
+    temp[2] = 0.0  # filled from the level above, which is in the previous tile
+    ds = xr.Dataset({"temp": (("zl", "ny", "nx"), temp)}, coords={"zl": np.arange(5)})
+    ds.to_netcdf(tmp_path / "init_tracers.nc")
+    spec = [{"name": "temp", "mask": mask, "dims": ("nx", "ny", "zl"), "encoding": {}}]
+
+    _fill_missing_and_write(
+        tmp_path / "init_tracers.nc", tmp_path / "whole.nc", spec, max_workers=2
+    )
+    _fill_missing_and_write(
+        tmp_path / "init_tracers.nc",
+        tmp_path / "tiled.nc",
+        spec,
+        max_workers=2,
+        tile_levels=2,
+    )
+    with xr.open_dataset(tmp_path / "whole.nc") as whole, xr.open_dataset(
+        tmp_path / "tiled.nc"
+    ) as tiled:
+        xr.testing.assert_identical(tiled, whole)
+        np.testing.assert_array_equal(tiled["temp"][2], tiled["temp"][1])
@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+from CrocoDash.extract_forcings import fingerprint
+from CrocoDash.extract_forcings.manifest import RunManifest
+
+
+def test_fingerprint_reports_the_parts_that_changed(tmp_path):
+    store = fingerprint.FingerprintStore(tmp_path / fingerprint.FINGERPRINTS_NAME)
+    grid = tmp_path / "grid.nc"
+    grid.write_text("grid")
+    spec = fingerprint.ComponentInputs(
+        settings={"tidal_constituents": ["M2"]},
+        inputs=[grid],
+        coverage={"end_date": "20200131"},
+    )
+
+    current = store.fingerprint(spec)
+    assert store.changed("tides", current) is None
+    store.record("tides", current)
+    assert store.changed("tides", store.fingerprint(spec)) == []
+
+    spec.settings["tidal_constituents"] = ["M2", "S2"]
+    spec.coverage["end_date"] = "20200229"
+    assert store.changed("tides", store.fingerprint(spec)) == ["settings", "coverage"]
+
+    with patch("CrocoDash.extract_forcings.fingerprint.versions") as versions:
+        versions.return_value = {"regional_mom6": "0.0.0"}
+        assert "versions" in store.changed("tides", store.fingerprint(spec))
+
+
+def test_input_files_are_hashed_once_while_unchanged(tmp_path):
+    store = fingerprint.FingerprintStore(tmp_path / fingerprint.FINGERPRINTS_NAME)
+    tpxo = tmp_path / "tpxo.nc"
+    tpxo.write_text("a")
+    with patch(
+        "CrocoDash.extract_forcings.fingerprint.checksum",
+        wraps=fingerprint.checksum,
+    ) as checksum:
+        first = store.file_hash(tpxo)
+        assert store.file_hash(tpxo) == first
+        assert checksum.call_count == 1
+        tpxo.write_text("bb")
+        assert store.file_hash(tpxo) != first
+        assert checksum.call_count == 2
+    assert store.file_hash(tmp_path / "missing.nc") is None
+
+
+def test_invalidate_deletes_outputs_and_intermediates(tmp_path):
+    manifest = RunManifest(tmp_path / "run_manifest.json")
+    output = tmp_path / "forcing_obc_segment_001.nc"
+    regridded = tmp_path / "forcing_obc_segment_001_20200101_20200131.nc"
+    raw = tmp_path / "east_unprocessed.2020-01-01_2020-01-31.nc"
+    for path in (output, regridded, raw):
+        path.write_text("x")
+    manifest.record(output)
+    spec = fingerprint.ComponentInputs(
+        settings={},
+        outputs=[output],
+        intermediates=[regridded, tmp_path / "gone.nc"],
+        downloads=[raw],
+    )
+
+    assert fingerprint.invalidate(spec, manifest) == [output, regridded]
+    assert raw.exists()
+    assert manifest.entries() == {}
+    assert fingerprint.invalidate(spec, manifest, downloads=True) == [raw]
+    assert not raw.exists()
+
+
+def test_request_changes_apart_from_versions(tmp_path):
+    store = fingerprint.FingerprintStore(tmp_path / fingerprint.FINGERPRINTS_NAME)
+    grid = tmp_path / "hgrid.nc"
+    grid.write_text("grid")
+    spec = fingerprint.ComponentInputs(
+        settings={}, request={"variables": ["uo"]}, request_inputs=[grid]
+    )
+    store.record("bc", store.fingerprint(spec))
+
+    with patch("CrocoDash.extract_forcings.fingerprint.versions") as versions:
+        versions.return_value = {"regional_mom6": "0.0.0"}
+        assert store.changed("bc", store.fingerprint(spec)) == ["versions"]
+    grid.write_text("moved grid")
+    assert store.changed("bc", store.fingerprint(spec)) == ["request"]
+
+    # Fingerprints recorded before the request part existed keep their downloads
+    with store._locked() as data:
+        del data["components"]["bc"]["fingerprint"]["request"]
+    assert store.changed("bc", store.fingerprint(spec)) == []
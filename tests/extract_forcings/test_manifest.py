@@ -0,0 +1,132 @@
+import os
+
+import pytest
+
+from CrocoDash.extract_forcings import utils
+from CrocoDash.extract_forcings.manifest import RunManifest
+
+NETCDF = b"CDF\x01" + b"\0" * 100
+
+
+def test_check_size_mtime_and_params(tmp_path):
+    manifest = RunManifest(tmp_path / "run_manifest.json")
+    artifact = tmp_path / "ocnice" / "forcing_obc_segment_001.nc"
+    artifact.parent.mkdir()
+    artifact.write_bytes(NETCDF)
+
+    assert manifest.check(artifact) is None
+    manifest.record(artifact, {"chunks": ["a.nc", "b.nc"]})
+    assert list(manifest.entries()) == ["ocnice/forcing_obc_segment_001.nc"]
+    assert manifest.check(artifact) is True
+    assert manifest.check(artifact, {"chunks": ["a.nc", "b.nc"]}) is True
+    assert manifest.check(artifact, {"chunks": ["a.nc"]}) is False
+
+    # Truncated after it was recorded: still has the magic bytes
+    artifact.write_bytes(NETCDF[:10])
+    assert utils.is_valid_netcdf(artifact)
+    assert manifest.check(artifact) is False
+
+
+def test_existing_artifact_rebuilds_changed_and_adopts_unrecorded(tmp_path):
+    manifest = RunManifest(tmp_path / "run_manifest.json")
+    recorded = tmp_path / "recorded.nc"
+    recorded.write_bytes(NETCDF)
+    manifest.record(recorded)
+    recorded.write_bytes(NETCDF[:10])
+
+    # Rebuilt, but the file stays until the rebuild replaces it
+    assert not utils.existing_artifact(recorded, manifest)
+    assert recorded.read_bytes() == NETCDF[:10]
+    assert not utils.existing_artifact(recorded, manifest, {"chunks": ["a.nc"]})
+    assert recorded.exists()
+
+    # A file from a run before the manifest existed
+    legacy = tmp_path / "legacy.nc"
+    legacy.write_bytes(NETCDF)
+    assert utils.existing_artifact(legacy, manifest)
+    assert manifest.check(legacy) is True
+
+    (tmp_path / "junk.nc").write_bytes(b"junk")
+    with pytest.raises(RuntimeError, match="not valid NetCDF"):
+        utils.existing_artifact(tmp_path / "junk.nc", manifest)
+
+
+@pytest.mark.parametrize("checksums", [False, True])
+def test_existing_artifact_keeps_touched_files(tmp_path, checksums):
+    manifest = RunManifest(tmp_path / "run_manifest.json", checksums=checksums)
+    artifact = tmp_path / "recorded.nc"
+    artifact.write_bytes(NETCDF)
+    manifest.record(artifact, {"chunks": ["a.nc"]})
+    assert ("sha256" in manifest.entries()["recorded.nc"]) is checksums
+
+    os.utime(artifact, ns=(0, 0))
+    assert manifest.check(artifact) is False
+    assert utils.existing_artifact(artifact, manifest, {"chunks": ["a.nc"]})
+    assert manifest.check(artifact) is True
+    assert manifest.params(artifact) == {"chunks": ["a.nc"]}
+
+    # Same size, other content: only a recorded checksum can tell
+    artifact.write_bytes(NETCDF[:-1] + b"\1")
+    assert utils.existing_artifact(artifact, manifest) is not checksums
+
+
+def test_fetch_raw_chunk_is_atomic_and_recorded(tmp_path):
+    manifest = RunManifest(tmp_path / "run_manifest.json")
+    calls = []
+
+    def interrupted_access(output_folder, output_filename, **kwargs):
+        (output_folder / output_filename).write_bytes(NETCDF[:10])
+        raise ConnectionError("connection reset")
+
+    def access(output_folder, output_filename, variables, **kwargs):
+        calls.append(variables)
+        (output_folder / output_filename).write_bytes(NETCDF)
+
+    request = dict(
+        dates=["2020-01-01", "2020-01-05"],
+        latlon={"lat_min": 0, "lat_max": 1, "lon_min": 10, "lon_max": 11},
+        output_folder=tmp_path,
+        output_filename="east_unprocessed.2020-01-01_2020-01-05.nc",
+        variables=["zos"],
+        extra_args={},
+        manifest=manifest,
+    )
+    with pytest.raises(ConnectionError):
+        utils.fetch_raw_chunk(data_access_fn=interrupted_access, **request)
+    assert sorted(p.name for p in tmp_path.iterdir() if p.suffix == ".nc") == []
+
+    out = utils.fetch_raw_chunk(data_access_fn=access, **request)
+    assert manifest.check(out) is True
+    utils.fetch_raw_chunk(data_access_fn=access, **request)
+    assert len(calls) == 1
+
+    # Same file name, different request: downloaded again
+    utils.fetch_raw_chunk(data_access_fn=access, **{**request, "variables": ["uo"]})
+    assert calls == [["zos"], ["uo"]]
+
+
+def test_verify_detects_changed_content(tmp_path):
+    manifest = RunManifest(tmp_path / "run_manifest.json", checksums=True)
+    good, bad = tmp_path / "good.nc", tmp_path / "bad.nc"
+    for path in (good, bad):
+        path.write_bytes(NETCDF)
+        manifest.record(path)
+    bad.write_bytes(NETCDF[:-1] + b"\1")
+    (tmp_path / "gone.nc").write_bytes(NETCDF)
+    manifest.record(tmp_path / "gone.nc")
+    (tmp_path / "gone.nc").unlink()
+
+    assert manifest.verify() == {"bad.nc": "checksum mismatch", "gone.nc": "missing"}
+
+
+def test_verify_without_checksums_checks_sizes(tmp_path):
+    manifest = RunManifest(tmp_path / "run_manifest.json")
+    touched, truncated = tmp_path / "touched.nc", tmp_path / "truncated.nc"
+    for path in (touched, truncated):
+        path.write_bytes(NETCDF)
+        manifest.record(path)
+    assert "sha256" not in manifest.entries()["touched.nc"]
+    os.utime(touched, ns=(0, 0))
+    truncated.write_bytes(NETCDF[:10])
+
+    assert manifest.verify() == {"truncated.nc": "size changed"}
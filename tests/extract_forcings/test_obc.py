@@ -1,15 +1,34 @@
+import os
+import threading
 import pytest
 import numpy as np
 import xarray as xr
+import netCDF4 as nc
+import pandas as pd
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 from CrocoDash.extract_forcings.obc import (
     process_obc_conditions,
+    _get_boundaries,
+    _regrid_boundaries,
     _merge_boundary,
     _validate_coverage,
+    _regrid_slice,
+    _stream_merge,
+    _regridded_path,
+    _boundary_strip,
+    _extend_boundary,
+    _save_regridders,
+    _load_hgrid,
+    _union_box,
 )
+from CrocoDash.extract_forcings import estimate, planner, utils
+from CrocoDash.extract_forcings.manifest import RunManifest
 from CrocoDash.extract_forcings.utils import is_valid_netcdf
+from CrocoDash.extract_forcings.weight_cache import WeightCache
 from CrocoDash.grid import Grid
 
 # ---------------------------------------------------------------------------
@@ -92,6 +111,392 @@ def test_preview_get_outputs(obc_config):
     assert set(preview["boundaries"]) == {"east", "south"}
 
 
+def test_obc_preview_estimates_every_chunk(obc_config):
+    kwargs, _ = obc_config
+    kwargs["product_info"] = {
+        **kwargs["product_info"],
+        "grid_resolution": 1 / 12,
+        "vertical_levels": 50,
+        "time_steps_per_day": 1,
+    }
+    model = estimate.CostModel(
+        {"bc_get": (1.0, 0.0), "bc_regrid": (0.0, 1e-3), "bc_merge": (2.0, 0.0)}
+    )
+    preview = process_obc_conditions(**kwargs, preview=True, cost_model=model)
+
+    est = preview["estimate"]
+    assert est["assumed"] == []
+    assert set(est["boundaries"]) == {"east", "south"}
+    east = est["boundaries"]["east"]
+    assert [g["dates"] for g in east["get"]] == ["2020-01-01_2020-01-15"]
+    assert [r["dates"] for r in east["regrid"]] == [
+        "2020-01-01_2020-01-05",
+        "2020-01-06_2020-01-10",
+        "2020-01-11_2020-01-15",
+    ]
+    get_bytes = east["get"][0]["bytes"]
+    assert get_bytes > 0
+    # A 5-day slice holds a third of the 15-day download
+    assert east["regrid"][0]["memory_bytes"] == pytest.approx(
+        get_bytes / 3 * planner.REGRID_MEMORY_FACTOR
+    )
+    assert east["get"][0]["seconds"] == 1.0
+    assert east["merge"]["seconds"] == 2.0
+    assert est["totals"]["download_bytes"] == sum(
+        b["get"][0]["bytes"] for b in est["boundaries"].values()
+    )
+    assert est["totals"]["seconds"] > 0
+
+    quota = estimate.over_quota({"bc": est}, get_bytes - 1)
+    assert any(line.startswith("bc east GET") for line in quota)
+    assert estimate.over_quota({"bc": est}, 10 * get_bytes) == []
+    table = estimate.format_estimate({"bc": est, "tides": None}, model)
+    assert "bc east REGRID 2020-01-06_2020-01-10" in table
+
+
+# ---------------------------------------------------------------------------
+# Unit test: _get_boundaries - parallel GET keeps skip-if-valid behaviour
+# ---------------------------------------------------------------------------
+
+
+def test_get_boundaries_parallel_fetches_every_chunk_once(obc_config):
+    kwargs, tmp_path = obc_config
+    raw_dir = tmp_path / "raw"
+    calls = []
+
+    def fake_access_fn(output_folder, output_filename, **_):
+        calls.append(output_filename)
+        (Path(output_folder) / output_filename).write_bytes(b"CDF\x01")
+
+    # A chunk left over from a previous run must be skipped, not re-fetched
+    (raw_dir / "east_unprocessed.2020-01-01_2020-01-05.nc").write_bytes(b"CDF\x01")
+
+    with patch(
+        "CrocoDash.extract_forcings.utils.get_data_access_function",
+        return_value=fake_access_fn,
+    ):
+        files = _get_boundaries(
+            boundaries=["east", "south"],
+            start_date=datetime(2020, 1, 1),
+            end_date=datetime(2020, 1, 15),
+            get_step_days=5,
+            hgrid_path=kwargs["hgrid_path"],
+            output_dir=raw_dir,
+            product_name="GLORYS",
+            function_name="get_glorys_data_from_rda",
+            variables=["uo"],
+            extra_args={},
+            max_workers=4,
+        )
+
+    assert len(files) == 6
+    assert all(f.exists() for f in files)
+    assert len(calls) == 5
+    assert "east_unprocessed.2020-01-01_2020-01-05.nc" not in calls
+
+
+# ---------------------------------------------------------------------------
+# Unit test: _regrid_boundaries - parallel engine builds weights once per boundary
+# ---------------------------------------------------------------------------
+
+
+def test_get_boundaries_union_download_is_sliced_per_boundary(obc_config):
+    kwargs, tmp_path = obc_config
+    hgrid = xr.open_dataset(kwargs["hgrid_path"])
+    bounds = Grid.get_bounding_boxes(hgrid)
+    calls = []
+
+    def fake_access(
+        dates, lat_min, lat_max, lon_min, lon_max, output_folder, output_filename, **_
+    ):
+        calls.append(output_filename)
+        xr.Dataset(
+            {"zos": (("time", "latitude", "longitude"), np.zeros((5, 40, 40)))},
+            coords={
+                "time": pd.date_range(dates[0], periods=5),
+                "latitude": np.linspace(lat_min - 1, lat_max + 1, 40),
+                "longitude": np.linspace(lon_min - 1, lon_max + 1, 40),
+            },
+        ).to_netcdf(Path(output_folder) / output_filename)
+
+    with patch(
+        "CrocoDash.extract_forcings.utils.get_data_access_function",
+        return_value=fake_access,
+    ):
+        files = _get_boundaries(
+            boundaries=["east", "south"],
+            start_date=datetime(2020, 1, 1),
+            end_date=datetime(2020, 1, 10),
+            get_step_days=5,
+            hgrid_path=kwargs["hgrid_path"],
+            output_dir=tmp_path / "raw",
+            product_name="GLORYS",
+            function_name="get_glorys_data_from_rda",
+            variables=["zos"],
+            extra_args={},
+            union_max_gb=1e6,
+            product_info=kwargs["product_info"],
+            coords=[("longitude", "latitude")],
+        )
+
+    # One request per chunk instead of one per (boundary, chunk)
+    assert calls == [
+        "union_unprocessed.2020-01-01_2020-01-05.nc",
+        "union_unprocessed.2020-01-06_2020-01-10.nc",
+    ]
+    assert sorted(f.name for f in files) == [
+        "east_unprocessed.2020-01-01_2020-01-05.nc",
+        "east_unprocessed.2020-01-06_2020-01-10.nc",
+        "south_unprocessed.2020-01-01_2020-01-05.nc",
+        "south_unprocessed.2020-01-06_2020-01-10.nc",
+    ]
+    with xr.open_dataset(tmp_path / "raw" / files[0].name) as east:
+        assert east.longitude.min() >= bounds["east"]["lon_min"] - 1
+        assert east.longitude.max() <= bounds["east"]["lon_max"] + 1
+
+    # Too large a union falls back to one request per boundary
+    calls.clear()
+    with patch(
+        "CrocoDash.extract_forcings.utils.get_data_access_function",
+        return_value=fake_access,
+    ):
+        _get_boundaries(
+            boundaries=["east", "south"],
+            start_date=datetime(2020, 1, 11),
+            end_date=datetime(2020, 1, 15),
+            get_step_days=None,
+            hgrid_path=kwargs["hgrid_path"],
+            output_dir=tmp_path / "raw",
+            product_name="GLORYS",
+            function_name="get_glorys_data_from_rda",
+            variables=["zos"],
+            extra_args={},
+            union_max_gb=0.0,
+            product_info=kwargs["product_info"],
+        )
+    assert calls == [
+        "east_unprocessed.2020-01-11_2020-01-15.nc",
+        "south_unprocessed.2020-01-11_2020-01-15.nc",
+    ]
+
+
+def test_union_box_is_chosen_by_estimated_download_size():
+    boxes = {
+        b: {"lat_min": 0.0, "lat_max": 1.0, "lon_min": 0.0, "lon_max": 1.0}
+        for b in ("east", "south", "ic")
+    }
+    info = {
+        "u_var_name": "uo",
+        "v_var_name": "vo",
+        "eta_var_name": "zos",
+        "tracer_var_names": {"temp": "thetao", "salt": "so"},
+        "grid_resolution": 0.25,
+        "vertical_levels": 10,
+    }
+    start = datetime(2020, 1, 1)
+    args = (boxes, ["east", "south"], start)
+    # 13 x 13 cells (1° padding) x (4 x 10 + 1) values x 4 bytes: 28 kB a day
+    assert _union_box(*args, start, info, union_max_gb=None) is None
+    assert _union_box(*args, start, info, union_max_gb=1e-4) == boxes["east"]
+    # The same box over more days, or with more levels, is too big
+    assert _union_box(*args, datetime(2020, 1, 10), info, 1e-4) is None
+    deep = {**info, "vertical_levels": 100}
+    assert _union_box(*args, start, deep, union_max_gb=1e-4) is None
+
+
+def test_boundary_strip_covers_the_segment(obc_config):
+    kwargs, _ = obc_config
+    hgrid = xr.open_dataset(kwargs["hgrid_path"])
+    bounds = Grid.get_bounding_boxes(hgrid)
+    for boundary in ["north", "south", "east", "west"]:
+        strip = _boundary_strip(hgrid, boundary, halo=0.1)
+        union = utils.union_latlon(strip)
+        assert union["lat_min"] == pytest.approx(bounds[boundary]["lat_min"] - 0.1)
+        assert union["lon_max"] == pytest.approx(bounds[boundary]["lon_max"] + 0.1)
+
+
+def test_regrid_boundaries_parallel_reuses_persisted_weights(obc_config):
+    kwargs, tmp_path = obc_config
+    regridded_dir = tmp_path / "regridded"
+    raw_file = tmp_path / "raw" / "east_unprocessed.2020-01-01_2020-01-15.nc"
+    xr.Dataset(
+        {"zos": ("time", np.zeros(15))},
+        coords={"time": np.arange("2020-01-01", "2020-01-16", dtype="datetime64[D]")},
+    ).to_netcdf(raw_file)
+    # Already regridded by an earlier run: must not be redone
+    (regridded_dir / "forcing_obc_segment_001_2020-01-01_2020-01-05.nc").write_bytes(
+        b"CDF\x01"
+    )
+    seen_regridders = []
+
+    def fake_regrid_slice(
+        seg_id, chunk_start, chunk_end, regridders, save_weights_to=None, **_
+    ):
+        seen_regridders.append(regridders)
+        if save_weights_to is not None:
+            _save_regridders({"tracers": f"weights_{seg_id}"}, save_weights_to)
+        out = regridded_dir / (
+            f"forcing_obc_segment_{seg_id:03d}_"
+            f"{chunk_start:%Y-%m-%d}_{chunk_end:%Y-%m-%d}.nc"
+        )
+        out.write_bytes(b"CDF\x01")
+        return out, {"tracers": f"weights_{seg_id}"}
+
+    with patch(
+        "CrocoDash.extract_forcings.obc._regrid_slice", side_effect=fake_regrid_slice
+    ), patch.dict(
+        "CrocoDash.extract_forcings.utils.EXECUTORS", {"process": ThreadPoolExecutor}
+    ):
+        files = _regrid_boundaries(
+            boundary_specs=[("east", 1, [raw_file])],
+            start_date=datetime(2020, 1, 1),
+            end_date=datetime(2020, 1, 15),
+            regrid_step_days=5,
+            hgrid_path=kwargs["hgrid_path"],
+            output_folder=regridded_dir,
+            dataset_varnames=kwargs["product_info"],
+            fill_method=None,
+            max_workers=2,
+        )
+
+    assert [f.exists() for f in files["east"]] == [True, True, True]
+    # First pending slice builds the weights, the other one loads them from disk
+    assert seen_regridders == [None, {"tracers": "weights_1"}]
+    assert (regridded_dir / "weights" / "segment_001_regridders.pkl").exists()
+    assert not list(regridded_dir.glob("_work_*"))
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_regrid_boundaries_reuses_weights_across_runs(obc_config, max_workers):
+    kwargs, tmp_path = obc_config
+    raw_file = tmp_path / "raw" / "east_unprocessed.2020-01-01_2020-01-15.nc"
+    xr.Dataset(
+        {"zos": (("time", "latitude", "longitude"), np.zeros((15, 2, 3)))},
+        coords={
+            "time": np.arange("2020-01-01", "2020-01-16", dtype="datetime64[D]"),
+            "latitude": [10.0, 11.0],
+            "longitude": [20.0, 21.0, 22.0],
+        },
+    ).to_netcdf(raw_file)
+    cache = WeightCache(tmp_path / "weight_cache")
+    seen_regridders = []
+
+    def fake_regrid_slice(
+        seg_id,
+        chunk_start,
+        chunk_end,
+        regridders,
+        output_folder,
+        save_weights_to=None,
+        **_,
+    ):
+        seen_regridders.append(regridders)
+        if save_weights_to is not None:
+            _save_regridders({"tracers": f"weights_{seg_id}"}, save_weights_to)
+        out = Path(output_folder) / (
+            f"forcing_obc_segment_{seg_id:03d}_"
+            f"{chunk_start:%Y-%m-%d}_{chunk_end:%Y-%m-%d}.nc"
+        )
+        out.write_bytes(b"CDF\x01")
+        return out, {"tracers": f"weights_{seg_id}"}
+
+    def run(regridded_dir):
+        regridded_dir.mkdir()
+        _regrid_boundaries(
+            boundary_specs=[("east", 1, [raw_file])],
+            start_date=datetime(2020, 1, 1),
+            end_date=datetime(2020, 1, 15),
+            regrid_step_days=5,
+            hgrid_path=kwargs["hgrid_path"],
+            output_folder=regridded_dir,
+            dataset_varnames=kwargs["product_info"],
+            fill_method=None,
+            max_workers=max_workers,
+            weight_cache=cache,
+        )
+
+    with patch(
+        "CrocoDash.extract_forcings.obc._regrid_slice", side_effect=fake_regrid_slice
+    ), patch.dict(
+        "CrocoDash.extract_forcings.utils.EXECUTORS", {"process": ThreadPoolExecutor}
+    ):
+        run(tmp_path / "first_run")
+        assert seen_regridders[0] is None
+        assert len(list(cache.cache_dir.glob("*.pkl"))) == 1
+
+        seen_regridders.clear()
+        run(tmp_path / "second_run")
+
+    # A fresh case over the same grids never rebuilds the weights
+    assert seen_regridders == [{"tracers": "weights_1"}] * 3
+
+
+def test_load_hgrid_closes_the_file(tmp_path):
+    from xarray.backends.file_manager import FILE_CACHE
+
+    path = tmp_path / "hgrid.nc"
+    xr.Dataset({"x": (("nyp", "nxp"), np.ones((3, 4)))}).to_netcdf(path)
+
+    hgrid = _load_hgrid(path)
+
+    assert not [key for key in FILE_CACHE if str(path) in str(key)]
+    assert float(hgrid["x"].sum()) == 12.0
+
+
+def test_save_regridders_never_leaves_a_partial_pickle(tmp_path):
+    path = tmp_path / "segment_001.pkl"
+    path.write_bytes(b"old")
+    with patch("pickle.dump", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            _save_regridders({"u": 1}, path)
+    assert path.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [path]
+
+    assert _save_regridders({"u": 1}, path) == path
+    assert pd.read_pickle(path) == {"u": 1}
+
+
+def test_regrid_slice_saves_weights_before_publishing_output(obc_config):
+    kwargs, tmp_path = obc_config
+    regridded_dir = tmp_path / "regridded"
+    weights = tmp_path / "segment_001_regridders.pkl"
+    ds = xr.Dataset(
+        {"zos": ("time", np.zeros(3))},
+        coords={"time": pd.date_range("2020-01-01 12:00", periods=3)},
+    )
+    rename = os.rename
+
+    def checked_rename(src, dst):
+        assert weights.exists()
+        rename(src, dst)
+
+    with patch("CrocoDash.extract_forcings.obc.rm6") as mock_rm6, patch(
+        "CrocoDash.extract_forcings.obc.os.rename", side_effect=checked_rename
+    ):
+        mock_rm6.segment.return_value.regridders = {"tracers": "weights"}
+        mock_rm6.segment.return_value.regrid_velocity_tracers.side_effect = (
+            lambda **_: (regridded_dir / "forcing_obc_segment_001.nc").write_bytes(
+                b"CDF\x01"
+            )
+        )
+        out, _ = _regrid_slice(
+            boundary="east",
+            seg_id=1,
+            ds_full=ds,
+            chunk_start=datetime(2020, 1, 1),
+            chunk_end=datetime(2020, 1, 3),
+            start_date=datetime(2020, 1, 1),
+            hgrid=None,
+            output_folder=regridded_dir,
+            dataset_varnames={"cf_calendar": "gregorian", "time_units": "days"},
+            fill_method=None,
+            save_weights_to=weights,
+        )
+
+    assert out.exists()
+    assert pd.read_pickle(weights) == {"tracers": "weights"}
+
+
 # ---------------------------------------------------------------------------
 # Unit test: _merge_boundary - tests merge without any external data
 # ---------------------------------------------------------------------------
@@ -120,6 +525,9 @@ def test_merge_single_boundary(
 
     chunk_files = sorted(regridded_dir.glob("forcing_obc_segment_001_*.nc"))
     assert len(chunk_files) > 0
+    # The factory writes the same dataset to every chunk; give each its own times
+    for i, f in enumerate(chunk_files):
+        east.assign_coords(time=east.time + i * east.sizes["time"]).to_netcdf(f)
 
     result = _merge_boundary("001", chunk_files, output_dir)
 
@@ -127,9 +535,212 @@ def test_merge_single_boundary(
     assert result.name == "forcing_obc_segment_001.nc"
     ds = xr.open_dataset(result)
     assert "time" in ds.dims
+    assert ds.sizes["time"] == 6 * len(chunk_files)
     ds.close()
 
 
+def _obc_chunk(path, days, units="days since 2020-01-01"):
+    ds = xr.Dataset(
+        {
+            "eta_segment_001": (
+                ("time", "ny_segment_001", "nx_segment_001"),
+                np.random.default_rng(int(days[0])).random((len(days), 1, 4)),
+            ),
+            "lon_segment_001": ("nx_segment_001", np.arange(4.0)),
+        },
+        coords={"time": ("time", np.asarray(days, dtype="f8"), {"units": units})},
+        attrs={"history": "regridded"},
+    )
+    ds.to_netcdf(path)
+    return path
+
+
+def test_stream_merge_matches_concat_with_unlimited_time(tmp_path):
+    chunks = [
+        _obc_chunk(tmp_path / f"chunk_{i}.nc", [3 * i, 3 * i + 1, 3 * i + 2])
+        for i in range(4)
+    ]
+    # A chunk using other units is converted to the first chunk's
+    chunks.append(
+        _obc_chunk(
+            tmp_path / "chunk_4.nc", [12 * 24, 13 * 24], "hours since 2020-01-01"
+        )
+    )
+
+    out = _stream_merge(chunks, tmp_path / "merged.nc")
+
+    expected = xr.concat(
+        [xr.open_dataset(c) for c in chunks], dim="time", data_vars="minimal"
+    )
+    with xr.open_dataset(out) as merged:
+        xr.testing.assert_allclose(merged, expected)
+        assert merged.attrs["history"] == "regridded"
+        assert merged.encoding["unlimited_dims"] == {"time"}
+
+
+def test_stream_merge_rejects_non_monotonic_time(tmp_path):
+    chunks = [
+        _obc_chunk(tmp_path / "a.nc", [0, 1, 2]),
+        _obc_chunk(tmp_path / "b.nc", [2, 3]),
+    ]
+    with pytest.raises(ValueError, match="not strictly increasing"):
+        _stream_merge(chunks, tmp_path / "merged.nc")
+    # Nothing half-written is left behind for the next run to mistake as done
+    assert list(tmp_path.glob("*merged*")) == []
+
+
+def _merged_times(path):
+    with xr.open_dataset(path, decode_times=False) as ds:
+        return ds["time"].values.tolist()
+
+
+def test_extend_boundary_appends_in_place(tmp_path):
+    manifest = RunManifest(tmp_path / "run_manifest.json")
+    chunks = [
+        _obc_chunk(tmp_path / "a.nc", [0, 1, 2]),
+        _obc_chunk(tmp_path / "b.nc", [3, 4, 5]),
+    ]
+    merged = _merge_boundary("001", chunks, tmp_path, manifest)
+    inode = merged.stat().st_ino
+
+    # Overlapping steps (day 5) are already in the merged file and dropped
+    new = _obc_chunk(tmp_path / "c.nc", [5, 6, 7, 8])
+    _extend_boundary("001", [new], tmp_path, manifest)
+    assert merged.stat().st_ino == inode
+    assert _merged_times(merged) == list(range(9))
+    with xr.open_dataset(merged) as ds, xr.open_dataset(new) as c:
+        np.testing.assert_array_equal(
+            ds["eta_segment_001"][6:], c["eta_segment_001"][1:]
+        )
+    assert manifest.check(merged, {"chunks": ["a.nc", "b.nc", "c.nc"]}) is True
+
+    # An append interrupted part-way leaves a file the manifest no longer
+    # matches: it is rebuilt from the recorded chunks plus the new ones
+    with nc.Dataset(merged, "a") as ds:
+        ds["time"][9] = 9
+    _extend_boundary(
+        "001", [_obc_chunk(tmp_path / "d.nc", [9, 10])], tmp_path, manifest
+    )
+    assert _merged_times(merged) == list(range(11))
+    assert manifest.check(merged, {"chunks": ["a.nc", "b.nc", "c.nc", "d.nc"]})
+
+
+def test_process_obc_conditions_extend_only_processes_new_dates(obc_config):
+    kwargs, tmp_path = obc_config
+    regridded_dir = tmp_path / "regridded"
+    output_dir = tmp_path / "output"
+    for seg in (1, 2):
+        _stream_merge(
+            [_obc_chunk(tmp_path / f"old_{seg}.nc", list(range(15)))],
+            output_dir / f"forcing_obc_segment_{seg:03d}.nc",
+        )
+    for boundary in ("east", "south"):
+        (
+            tmp_path / "raw" / f"{boundary}_unprocessed.2020-01-16_2020-01-20.nc"
+        ).write_bytes(b"CDF\x01" + b"\0" * 100)
+    calls = {}
+
+    def fake_get(start_date, end_date, **_):
+        calls["get"] = (start_date, end_date)
+
+    def fake_regrid(boundary_specs, start_date, end_date, **_):
+        calls["regrid"] = (start_date, end_date)
+        return {
+            boundary: [
+                _obc_chunk(
+                    _regridded_path(regridded_dir, seg, start_date, end_date),
+                    list(range(15, 20)),
+                )
+            ]
+            for boundary, seg, _ in boundary_specs
+        }
+
+    with patch("CrocoDash.extract_forcings.obc._get_boundaries", fake_get), patch(
+        "CrocoDash.extract_forcings.obc._regrid_boundaries", fake_regrid
+    ):
+        process_obc_conditions(**{**kwargs, "end_date": "2020-01-20"}, extend=True)
+        assert (
+            calls["get"]
+            == calls["regrid"]
+            == (
+                datetime(2020, 1, 16),
+                datetime(2020, 1, 20),
+            )
+        )
+        for seg in (1, 2):
+            merged = output_dir / f"forcing_obc_segment_{seg:03d}.nc"
+            assert _merged_times(merged) == list(range(20))
+
+        # Already extended: nothing to download
+        calls.clear()
+        assert (
+            process_obc_conditions(**{**kwargs, "end_date": "2020-01-20"}, extend=True)
+            is None
+        )
+        assert calls == {}
+
+
+def test_pipeline_regrids_while_downloading_and_merges(obc_config):
+    kwargs, tmp_path = obc_config
+    regridded_dir = tmp_path / "regridded"
+    first_regrid_started = threading.Event()
+    events = []
+
+    def fake_get_chunk(
+        product_name, function_name, output_folder, output_filename, **_
+    ):
+        # The last chunk is only delivered once regridding is under way, which
+        # can only happen if REGRID does not wait for the whole GET phase.
+        if output_filename.endswith("2020-01-15.nc"):
+            assert first_regrid_started.wait(timeout=10)
+        path = Path(output_folder) / output_filename
+        path.write_bytes(b"CDF\x01")
+        return path
+
+    def fake_regrid_slice(
+        seg_id, chunk_start, chunk_end, regridders, save_weights_to=None, **_
+    ):
+        first_regrid_started.set()
+        if save_weights_to is not None:
+            _save_regridders({"tracers": f"weights_{seg_id}"}, save_weights_to)
+        events.append(("regrid", seg_id, regridders))
+        out = _regridded_path(regridded_dir, seg_id, chunk_start, chunk_end)
+        out.write_bytes(b"CDF\x01")
+        return out, {"tracers": f"weights_{seg_id}"}
+
+    def fake_merge(boundary_label, regridded_files, output_folder, **_):
+        events.append(("merge", int(boundary_label), len(regridded_files)))
+        return Path(output_folder) / f"forcing_obc_segment_{boundary_label}.nc"
+
+    with patch(
+        "CrocoDash.extract_forcings.obc._get_chunk", side_effect=fake_get_chunk
+    ), patch(
+        "CrocoDash.extract_forcings.obc._regrid_slice", side_effect=fake_regrid_slice
+    ), patch(
+        "CrocoDash.extract_forcings.obc._merge_boundary", side_effect=fake_merge
+    ), patch(
+        "CrocoDash.extract_forcings.obc._open_raw", return_value=xr.Dataset()
+    ), patch(
+        "CrocoDash.extract_forcings.obc.rm6"
+    ), patch.dict(
+        "CrocoDash.extract_forcings.utils.EXECUTORS", {"process": ThreadPoolExecutor}
+    ):
+        process_obc_conditions(
+            **{**kwargs, "get_step_days": 5}, max_workers=2, pipeline=True
+        )
+
+    for seg in (1, 2):
+        seg_events = [e for e in events if e[1] == seg]
+        # Three slices, the first building the weights the others reuse, then
+        # one merge of all three
+        assert seg_events == [
+            ("regrid", seg, None),
+            ("regrid", seg, {"tracers": f"weights_{seg}"}),
+            ("regrid", seg, {"tracers": f"weights_{seg}"}),
+            ("merge", seg, 3),
+        ]
+
+
 # ---------------------------------------------------------------------------
 # Slow integration tests (require real data access)
 # ---------------------------------------------------------------------------
@@ -195,12 +806,16 @@ def test_obc_merge_workflow(
 
     # regrid_step=5 → three regridded chunks per boundary
     for seg, ds in [("001", east), ("002", south)]:
-        for fname in [
-            f"forcing_obc_segment_{seg}_2020-01-01_2020-01-05.nc",
-            f"forcing_obc_segment_{seg}_2020-01-06_2020-01-10.nc",
-            f"forcing_obc_segment_{seg}_2020-01-11_2020-01-15.nc",
-        ]:
-            ds.to_netcdf(regridded_dir / fname)
+        for i, fname in enumerate(
+            [
+                f"forcing_obc_segment_{seg}_2020-01-01_2020-01-05.nc",
+                f"forcing_obc_segment_{seg}_2020-01-06_2020-01-10.nc",
+                f"forcing_obc_segment_{seg}_2020-01-11_2020-01-15.nc",
+            ]
+        ):
+            ds.assign_coords(time=ds.time + i * ds.sizes["time"]).to_netcdf(
+                regridded_dir / fname
+            )
 
     process_obc_conditions(**kwargs)
 
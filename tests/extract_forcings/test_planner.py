@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+from datetime import datetime
+from unittest.mock import patch
+
+from CrocoDash.extract_forcings import planner
+from CrocoDash.extract_forcings.obc import _plan_regrid
+
+GB = 1024**3
+
+
+def _raw_file(path, days=5, per_day=2):
+    n = days * per_day
+    xr.Dataset(
+        {
+            "zos": (("time", "lat", "lon"), np.zeros((n, 4, 3), dtype="f4")),
+            "thetao": (("time", "depth", "lat", "lon"), np.zeros((n, 2, 4, 3))),
+            "depth_bnds": (("depth",), np.zeros(2)),
+        },
+        coords={"time": pd.date_range("2020-01-01", periods=n, freq="12h")},
+    ).to_netcdf(path)
+    return path
+
+
+def test_raw_bytes_per_day_from_header(tmp_path):
+    path = _raw_file(tmp_path / "east_unprocessed.2020-01-01_2020-01-05.nc")
+    # Two steps a day of 4*3 float32 + 2*4*3 float64; time-independent vars ignored
+    assert planner.raw_bytes_per_day(path, days=5) == 2 * (12 * 4 + 24 * 8)
+
+
+@pytest.mark.parametrize(
+    "budget, cpus, expected",
+    [
+        # Laptop: fewer workers so slices stay at least MIN_STEP_DAYS long
+        (8 * GB, 8, {"regrid_step_days": 5, "max_workers": 6}),
+        # Big node: long slices, and no more workers than there are slices
+        (512 * GB, 64, {"regrid_step_days": 42, "max_workers": 36}),
+    ],
+)
+def test_plan_regrid_fits_the_budget(budget, cpus, expected):
+    with patch("os.cpu_count", return_value=cpus):
+        plan = planner.plan_regrid(
+            bytes_per_day=64 * 1024**2,
+            total_days=365,
+            n_boundaries=4,
+            memory_budget=budget,
+        )
+    assert {k: plan[k] for k in expected} == expected
+    used = plan["regrid_step_days"] * plan["max_workers"] * 64 * 1024**2
+    assert used * planner.REGRID_MEMORY_FACTOR <= budget
+
+
+def test_plan_regrid_respects_user_values_and_slice_count():
+    plan = planner.plan_regrid(
+        bytes_per_day=1024**2,
+        total_days=10,
+        n_boundaries=2,
+        memory_budget=64 * GB,
+        max_workers=3,
+    )
+    assert plan["max_workers"] == 3
+    assert plan["regrid_step_days"] == 10
+
+    # More workers than slices would sit idle
+    with patch("os.cpu_count", return_value=8):
+        plan = planner.plan_regrid(
+            bytes_per_day=1024**2,
+            total_days=10,
+            n_boundaries=2,
+            memory_budget=64 * GB,
+            regrid_step_days=5,
+        )
+    assert plan == {**plan, "regrid_step_days": 5, "max_workers": 4}
+
+    # Not even one day fits: smallest possible plan
+    plan = planner.plan_regrid(
+        bytes_per_day=GB, total_days=10, n_boundaries=2, memory_budget=GB
+    )
+    assert (plan["regrid_step_days"], plan["max_workers"]) == (1, 1)
+
+
+def test_plan_regrid_caps_workers_at_cpu_count_for_a_fixed_step():
+    with patch("os.cpu_count", return_value=16):
+        plan = planner.plan_regrid(
+            bytes_per_day=1024**2,
+            total_days=3650,
+            n_boundaries=4,
+            memory_budget=1024 * GB,
+            regrid_step_days=5,
+        )
+    assert plan["max_workers"] == 16
+
+
+def test_plan_regrid_from_raw_files(tmp_path):
+    _raw_file(tmp_path / "east_unprocessed.2020-01-01_2020-01-05.nc")
+    _raw_file(tmp_path / "west_unprocessed.2020-01-01_2020-01-10.nc", days=10)
+    assert (
+        _plan_regrid(["north"], tmp_path, datetime(2020, 1, 1), datetime(2020, 1, 10))
+        is None
+    )
+
+    plan = _plan_regrid(
+        ["east", "west"],
+        tmp_path,
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 10),
+        memory_budget_gb=1,
+        max_workers=2,
+    )
+    assert plan["bytes_per_day"] == 2 * (12 * 4 + 24 * 8)
+    assert plan["regrid_step_days"] == 10
@@ -5,6 +5,7 @@ This testing file is for the other processes in extract_forcings. Most do not ne
 import pytest
 from CrocoDash.extract_forcings import runoff, tides, bgc, chlorophyll as chl
 import xarray as xr
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 
@@ -311,3 +312,132 @@ def test_generate_rof_ocn_map_reuses_existing(
     )
     # The "already exists, reusing it" branch should be taken.
     mock_gen_maps.assert_not_called()
+
+
+def test_download_initial_condition_slices_union_file(tmp_path):
+    import numpy as np
+    import pandas as pd
+    from CrocoDash.extract_forcings.initial_condition import (
+        _download_initial_condition,
+    )
+
+    xr.Dataset(
+        {"zos": (("time", "latitude", "longitude"), np.zeros((10, 2, 2)))},
+        coords={
+            "time": pd.date_range("2020-01-01 12:00", periods=10),
+            "latitude": [0.0, 1.0],
+            "longitude": [0.0, 1.0],
+        },
+    ).to_netcdf(tmp_path / "union_unprocessed.2020-01-01_2020-01-10.nc")
+    access_fn = Mock()
+
+    _download_initial_condition(
+        data_access_function=access_fn,
+        latlon_info={"lat_min": 0, "lat_max": 1, "lon_min": 0, "lon_max": 1},
+        raw_data_dir=tmp_path,
+        start_date_str="2020-01-01",
+        end_date_str="2020-01-02",
+        variables=["zos"],
+        extra_args={},
+    )
+
+    access_fn.assert_not_called()
+    with xr.open_dataset(tmp_path / "ic_unprocessed.nc") as ds:
+        assert ds.sizes["time"] == 2
+
+
+def _write_ic_files(output_dir, ny=6, nx=8, nz=3):
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+
+    def field(*shape):
+        data = rng.random(shape).astype("f4")
+        data[rng.random(shape) < 0.2] = np.nan
+        return data
+
+    xr.Dataset({"eta_t": (("ny", "nx"), field(ny, nx))}).to_netcdf(
+        output_dir / "init_eta.nc"
+    )
+    xr.Dataset(
+        {
+            "u": (("zl", "ny", "nxp"), field(nz, ny, nx + 1)),
+            "v": (("zl", "nyp", "nx"), field(nz, ny + 1, nx)),
+        },
+        coords={"zl": np.arange(nz)},
+    ).to_netcdf(output_dir / "init_vel.nc")
+    xr.Dataset(
+        {name: (("zl", "ny", "nx"), field(nz, ny, nx)) for name in ("temp", "salt")},
+        coords={"zl": np.arange(nz)},
+    ).to_netcdf(output_dir / "init_tracers.nc")
+    ocean = xr.DataArray((rng.random((ny + 1, nx + 1)) > 0.1).astype(int))
+    return {
+        "t": ocean[:ny, :nx],
+        "u": ocean[:ny, :],
+        "v": ocean[:, :nx],
+    }
+
+
+@pytest.mark.parametrize("in_place", [False, True])
+def test_fill_initial_condition_runs_fills_together(tmp_path, in_place):
+    from CrocoDash.extract_forcings import initial_condition as ic
+    from CrocoDash.extract_forcings.manifest import RunManifest
+
+    reference_dir = tmp_path / "reference"
+    output_dir = tmp_path / "ocnice"
+    reference_dir.mkdir()
+    output_dir.mkdir()
+    masks = _write_ic_files(reference_dir)
+    _write_ic_files(output_dir)
+    manifest = RunManifest(tmp_path / "run_manifest.json")
+
+    filled = ic._fill_initial_condition(
+        output_dir,
+        SimpleNamespace(masks=masks),
+        manifest=manifest,
+        in_place=in_place,
+    )
+
+    names = ["init_eta", "init_vel", "init_tracers"]
+    suffix = "" if in_place else "_filled"
+    assert [p.name for p in filled] == [f"{n}{suffix}.nc" for n in names]
+    assert sorted(p.name for p in output_dir.iterdir()) == sorted(
+        {f"{n}.nc" for n in names} | {p.name for p in filled}
+    )
+    specs = ic._fill_specs(masks)
+    for name, path in zip(ic._IC_FILES, filled):
+        assert manifest.check(path) is True
+        expected = reference_dir / f"expected_{name}.nc"
+        ic._fill_missing_and_write(
+            reference_dir / f"init_{name}.nc", expected, specs[name]
+        )
+        with xr.open_dataset(path) as got, xr.open_dataset(expected) as want:
+            xr.testing.assert_identical(got, want)
+
+    # Already filled: nothing is read or written again, not even the masks
+    with patch.object(ic, "_fill_missing_and_write") as fill_again:
+        ic._fill_initial_condition(
+            output_dir, SimpleNamespace(), manifest=manifest, in_place=in_place
+        )
+    fill_again.assert_not_called()
+
+
+def test_fill_in_place_refills_a_file_changed_since_its_fill(tmp_path):
+    import os
+    from CrocoDash.extract_forcings import initial_condition as ic
+    from CrocoDash.extract_forcings.manifest import RunManifest
+
+    masks = _write_ic_files(tmp_path)
+    manifest = RunManifest(tmp_path / "run_manifest.json")
+    filled = ic._fill_initial_condition(
+        tmp_path, SimpleNamespace(masks=masks), manifest=manifest, in_place=True
+    )
+    stat = filled[0].stat()
+    os.utime(filled[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    with patch.object(ic, "_fill_missing_and_write") as fill_again:
+        ic._fill_initial_condition(
+            tmp_path, SimpleNamespace(masks=masks), manifest=manifest, in_place=True
+        )
+    assert fill_again.call_count == 3
+    assert filled[0].exists()
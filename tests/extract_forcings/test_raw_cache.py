@@ -0,0 +1,166 @@
+import os
+import shutil
+import sys
+import pytest
+from unittest.mock import patch
+
+from CrocoDash.extract_forcings import utils
+from CrocoDash.extract_forcings.raw_cache import RawCache
+
+
+def _fake_access(calls):
+    def fake_access(output_folder, output_filename, **kwargs):
+        calls.append(kwargs)
+        (output_folder / output_filename).write_bytes(b"CDF\x01" + b"\0" * 100)
+
+    return fake_access
+
+
+def _fetch(access, case_dir, cache, **overrides):
+    request = dict(
+        dates=["2020-01-01", "2020-01-05"],
+        latlon={"lat_min": 0, "lat_max": 1, "lon_min": 10, "lon_max": 11},
+        output_folder=case_dir,
+        output_filename="east_unprocessed.2020-01-01_2020-01-05.nc",
+        variables=["zos", "uo"],
+        extra_args={"member": 1},
+        name="east",
+    )
+    request.update(overrides)
+    case_dir.mkdir(exist_ok=True)
+    return utils.fetch_raw_chunk(data_access_fn=access, cache=cache, **request)
+
+
+def test_sibling_cases_share_downloads(tmp_path):
+    calls = []
+    access = _fake_access(calls)
+    cache = RawCache(tmp_path / "cache")
+
+    first = _fetch(access, tmp_path / "case1", cache)
+    second = _fetch(access, tmp_path / "case2", cache, variables=["uo", "zos"])
+    assert len(calls) == 1
+    assert os.path.samefile(first, second)
+
+    # Any change to the request is a different entry
+    _fetch(access, tmp_path / "case3", cache, extra_args={"member": 2})
+    _fetch(access, tmp_path / "case4", cache, dates=["2020-01-01", "2020-01-06"])
+    assert len(calls) == 3
+    assert len(cache.entries()) == 3
+
+    # Transfer tuning is not part of the request
+    _fetch(
+        access,
+        tmp_path / "case5",
+        cache,
+        extra_args={"member": 1, "max_concurrent_requests": 8, "chunk_days": 5},
+    )
+    assert len(calls) == 3
+
+
+def test_failed_chunked_download_keeps_its_parts(tmp_path):
+    seen = []
+
+    def flaky_access(output_folder, output_filename, **kwargs):
+        parts = output_folder / f".parts_{output_filename[:-3]}"
+        seen.append(sorted(p.name for p in parts.glob("*.nc")))
+        if not seen[-1]:
+            parts.mkdir()
+            (parts / "part_000.nc").write_bytes(b"CDF\x01")
+            raise ConnectionError("server hiccup")
+        shutil.rmtree(parts)
+        (output_folder / output_filename).write_bytes(b"CDF\x01" + b"\0" * 100)
+
+    with pytest.raises(ConnectionError):
+        _fetch(flaky_access, tmp_path / "case", None)
+    path = _fetch(flaky_access, tmp_path / "case", None)
+    assert seen == [[], ["part_000.nc"]]
+    assert sorted(os.listdir(path.parent)) == [path.name]
+
+
+@pytest.mark.parametrize("link", ["symlink", "copy"])
+def test_materialize_link_modes(tmp_path, link):
+    calls = []
+    access = _fake_access(calls)
+    _fetch(access, tmp_path / "case1", RawCache(tmp_path / "cache"))
+    dest = _fetch(access, tmp_path / "case2", RawCache(tmp_path / "cache", link=link))
+    assert len(calls) == 1
+    assert dest.is_symlink() == (link == "symlink")
+    assert utils.is_valid_netcdf(dest)
+
+
+@pytest.mark.parametrize("link", ["hardlink", "symlink", "copy"])
+def test_materialize_replaces_an_outdated_file(tmp_path, link):
+    from CrocoDash.extract_forcings.manifest import RunManifest
+
+    calls = []
+    access = _fake_access(calls)
+    _fetch(access, tmp_path / "case1", RawCache(tmp_path / "cache"))
+    manifest = RunManifest(tmp_path / "case2" / "run_manifest.json")
+    # The same file name from an earlier request with other variables
+    _fetch(access, tmp_path / "case2", None, variables=["zos"], manifest=manifest)
+    dest = _fetch(
+        access,
+        tmp_path / "case2",
+        RawCache(tmp_path / "cache", link=link),
+        manifest=manifest,
+    )
+    assert len(calls) == 2
+    assert manifest.check(dest, None) is True
+    assert manifest.params(dest)["variables"] == ["uo", "zos"]
+
+
+def test_lru_eviction_and_prune(tmp_path):
+    calls = []
+    access = _fake_access(calls)
+    # Room for two 104-byte entries
+    cache = RawCache(tmp_path / "cache", max_bytes=250)
+    for i, day in enumerate(["01", "02", "03"]):
+        _fetch(
+            access,
+            tmp_path / f"case{i}",
+            cache,
+            dates=[f"2020-01-{day}", f"2020-01-{day}"],
+        )
+    assert sorted(e["request"]["dates"][0] for e in cache.entries().values()) == [
+        "2020-01-02",
+        "2020-01-03",
+    ]
+    # Evicting the entry does not break the case that hardlinked it
+    assert utils.is_valid_netcdf(
+        tmp_path / "case0" / "east_unprocessed.2020-01-01_2020-01-05.nc"
+    )
+
+    assert len(cache.prune(max_bytes=0)) == 2
+    assert cache.entries() == {}
+
+
+def test_verify_reports_and_removes_bad_entries(tmp_path):
+    calls = []
+    cache = RawCache(tmp_path / "cache", link="copy")
+    _fetch(_fake_access(calls), tmp_path / "case1", cache)
+    (key,) = cache.entries()
+    cache.path(key).write_bytes(b"junk")
+    (tmp_path / "cache" / "stray.nc").write_bytes(b"CDF\x01")
+
+    assert cache.verify() == {key: "size mismatch", "stray": "not in index"}
+    cache.verify(remove=True)
+    assert cache.verify() == {}
+    assert cache.entries() == {}
+
+
+def test_cache_cli(tmp_path, capsys):
+    _fetch(_fake_access([]), tmp_path / "case1", RawCache(tmp_path / "cache"))
+
+    def run(*argv):
+        with patch.object(
+            sys, "argv", ["crocodash", "cache", *argv, "--dir", str(tmp_path / "cache")]
+        ):
+            from CrocoDash.cli import main
+
+            main()
+        return capsys.readouterr().out
+
+    assert "1 entries" in run("list")
+    assert "Found 0 bad entries" in run("verify")
+    assert "Removed 1 entries" in run("prune", "--max-gb", "0")
+    assert "0 entries" in run("list")
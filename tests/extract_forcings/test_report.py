@@ -0,0 +1,169 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from CrocoDash.extract_forcings import report, utils
+
+
+def _write(path, n_bytes):
+    report.count("provider_requests")
+    with open(path, "wb") as f:
+        f.write(b"\0" * n_bytes)
+    return path
+
+
+def _chunk_span(task):
+    return (task["path"].name.split("_")[0], "GET", task["path"].stem)
+
+
+def test_spans_nest_by_path_and_aggregate(tmp_path):
+    tasks = [
+        dict(path=tmp_path / f"{boundary}_{i}.bin", n_bytes=4096)
+        for boundary in ("east", "west")
+        for i in range(2)
+    ]
+    run = report.RunReport()
+    with run.record():
+        with report.span("bc"):
+            utils.run_tasks(_write, tasks, max_workers=2, span=_chunk_span)
+            with report.span("east", "MERGE"):
+                np.linalg.eigvals(np.random.default_rng(0).random((200, 200)))
+
+    data = run.to_dict()["run"]
+    (bc,) = data["children"]
+    assert [c["name"] for c in bc["children"]] == ["east", "west"]
+    east = bc["children"][0]
+    assert [c["name"] for c in east["children"]] == ["GET", "MERGE"]
+    get = east["children"][0]
+    assert [c["name"] for c in get["children"]] == ["east_0", "east_1"]
+    assert all(c["written_bytes"] >= 4096 for c in get["children"])
+    assert get["written_bytes"] == sum(c["written_bytes"] for c in get["children"])
+    assert bc["counters"] == data["counters"] == {"provider_requests": 4}
+    chunks_end = max(c["start"] + c["wall_s"] for c in get["children"])
+    assert get["start"] + get["wall_s"] == pytest.approx(chunks_end, abs=1e-3)
+    assert east["children"][1]["cpu_s"] > 0
+    assert bc["peak_rss_bytes"] > 0
+    # The run is measured for the whole process, so it covers every span
+    assert data["cpu_s"] >= bc["cpu_s"] - 0.05
+
+
+def test_process_pool_tasks_are_measured_in_the_worker(tmp_path):
+    tasks = [dict(path=tmp_path / f"north_{i}.bin", n_bytes=8192) for i in range(3)]
+    run = report.RunReport()
+    with run.record():
+        utils.run_tasks(
+            _write, tasks, max_workers=3, executor="process", span=_chunk_span
+        )
+    get = run.to_dict()["run"]["children"][0]["children"][0]
+    assert [c["name"] for c in get["children"]] == ["north_0", "north_1", "north_2"]
+    assert all(c["written_bytes"] >= 8192 for c in get["children"])
+    assert get["counters"] == {"provider_requests": 3}
+
+
+def test_spans_are_no_ops_without_a_report(tmp_path):
+    assert report.current() is None
+    with report.span("bc", "east") as node:
+        report.count("provider_requests")
+    assert node is None
+    tasks = [dict(path=tmp_path / "a_0.bin", n_bytes=1)]
+    assert utils.run_tasks(_write, tasks, span=_chunk_span) == [tmp_path / "a_0.bin"]
+
+
+def test_write_load_and_format(tmp_path):
+    run = report.RunReport(config="config.json")
+    with run.record():
+        with report.span("tides"):
+            pass
+        with report.span("bc", "east", "GET", "2020-01-01_2020-01-31"):
+            report.count("provider_requests", 2)
+    path = run.write(tmp_path)
+    assert report.latest(tmp_path) == path
+
+    data = report.load(path)
+    assert data["format"] == report.REPORT_FORMAT
+    assert "xarray" in data["versions"]
+    table = report.format_report(data)
+    assert "2020-01-01_2020-01-31" in table
+    shallow = report.format_report(data, depth=1)
+    assert "tides" in shallow and "east" not in shallow
+
+
+def _report(wall, rss, versions=None, extra=()):
+    def node(name, wall, rss, children=()):
+        return dict(
+            name=name,
+            attrs={},
+            start=0.0,
+            wall_s=wall,
+            cpu_s=wall,
+            peak_rss_bytes=rss,
+            read_bytes=0,
+            written_bytes=0,
+            counters={},
+            children=list(children),
+        )
+
+    components = [node("bc", wall, rss), node("tides", 5.0, 1024**3)]
+    components += [node(name, 1.0, 0) for name in extra]
+    return dict(
+        format=report.REPORT_FORMAT,
+        created="2026-01-01T00:00:00",
+        host="node",
+        cpus=8,
+        versions=versions or {"xesmf": "0.8.0"},
+        run=node("run", wall + 5.0, rss, components),
+    )
+
+
+def test_diff_flags_regressions_past_thresholds():
+    a = _report(wall=100.0, rss=2 * 1024**3)
+    b = _report(
+        wall=130.0, rss=2.1 * 1024**3, versions={"xesmf": "0.9.0"}, extra=["chl"]
+    )
+    rows = report.diff_reports(a, b)
+    regressed = {(r["path"], r["metric"]) for r in rows if r["regressed"]}
+    # 30% slower is past the 25% default; 5% more memory is not
+    assert regressed == {
+        ("run", "wall_s"),
+        ("run", "cpu_s"),
+        ("run / bc", "wall_s"),
+        ("run / bc", "cpu_s"),
+    }
+    assert not any(
+        r["regressed"] for r in report.diff_reports(a, b, thresholds={"time": 0.5})
+    )
+    table = report.format_diff(a, b, rows)
+    assert "xesmf: 0.8.0 -> 0.9.0" in table
+    assert "run / chl" in table and "only in B" in table
+    assert "4 regressed metrics" in table
+
+    # Below the absolute floor a large relative change is noise
+    small_a, small_b = _report(wall=0.2, rss=0), _report(wall=0.6, rss=0)
+    assert not any(
+        r["regressed"]
+        for r in report.diff_reports(small_a, small_b, depth=1)
+        if r["path"] == "run / bc"
+    )
+
+
+def test_report_diff_cli_exit_status(tmp_path, capsys):
+    from CrocoDash import cli
+
+    paths = []
+    for name, wall in (("a", 100.0), ("b", 100.0), ("c", 200.0)):
+        paths.append(tmp_path / f"{name}.json")
+        paths[-1].write_text(json.dumps(_report(wall=wall, rss=0)))
+
+    with patch("sys.argv", ["crocodash", "report", "diff", *map(str, paths[:2])]):
+        cli.main()
+    assert "0 regressed metrics" in capsys.readouterr().out
+
+    with patch(
+        "sys.argv", ["crocodash", "report", "diff", str(paths[0]), str(paths[2])]
+    ):
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main()
+    assert exit_info.value.code == 1
+    assert "REGRESSED" in capsys.readouterr().out
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from CrocoDash.extract_forcings import scheduler
+from CrocoDash.extract_forcings.scheduler import Component
+
+
+def _recorder(events, name, seconds=0.05, error=None):
+    def run():
+        events.append(("start", name))
+        time.sleep(seconds)
+        events.append(("end", name))
+        if error:
+            raise error
+
+    return run
+
+
+def test_independent_components_overlap_and_dependents_wait():
+    events = []
+    components = [
+        Component("tides", _recorder(events, "tides")),
+        Component("runoff", _recorder(events, "runoff"), outputs=("map",)),
+        Component("nutrients", _recorder(events, "nutrients"), inputs=("map",)),
+    ]
+    status = scheduler.run_components(components, max_workers=3)
+
+    assert [s.status for s in status.values()] == ["done"] * 3
+    assert events.index(("start", "runoff")) < events.index(("end", "tides"))
+    assert events.index(("end", "runoff")) < events.index(("start", "nutrients"))
+
+
+def test_one_slot_runs_in_declaration_order():
+    events = []
+    components = [
+        Component(name, _recorder(events, name, 0.01)) for name in ["bc", "ic", "tides"]
+    ]
+    scheduler.run_components(components, max_workers=1)
+    assert events == [(e, n) for n in ["bc", "ic", "tides"] for e in ("start", "end")]
+
+
+def test_component_claiming_whole_budget_runs_alone():
+    running, peak = set(), []
+    lock = threading.Lock()
+
+    def make(name):
+        def run():
+            with lock:
+                running.add(name)
+                peak.append(set(running))
+            time.sleep(0.05)
+            with lock:
+                running.discard(name)
+
+        return run
+
+    components = [
+        Component("bc", make("bc"), workers=8),
+        Component("tides", make("tides")),
+        Component("chl", make("chl")),
+    ]
+    scheduler.run_components(components, max_workers=4)
+    assert {"bc"} in peak
+    assert all("bc" not in p or p == {"bc"} for p in peak)
+
+
+def test_failure_skips_dependents_and_is_raised_after_the_rest():
+    events = []
+    components = [
+        Component(
+            "runoff",
+            _recorder(events, "runoff", error=RuntimeError("no mesh")),
+            outputs=("map",),
+        ),
+        Component("nutrients", _recorder(events, "nutrients"), inputs=("map",)),
+        Component("tides", _recorder(events, "tides")),
+    ]
+    status = scheduler.run_components(components, max_workers=2)
+
+    assert {n: s.status for n, s in status.items()} == {
+        "runoff": "failed",
+        "nutrients": "skipped",
+        "tides": "done",
+    }
+    table = scheduler.format_status_table(status)
+    assert "needs runoff" in table and "no mesh" in table
+    with pytest.raises(RuntimeError, match="no mesh"):
+        scheduler.raise_first_failure(status)
+
+
+def test_components_run_with_ordered_netcdf_locks():
+    from xarray.backends import locks
+
+    from CrocoDash import netcdf_locks
+
+    seen = []
+    components = [
+        Component(
+            name, lambda: seen.append(locks.CombinedLock.__init__), outputs=(name,)
+        )
+        for name in ["bc", "ic"]
+    ]
+    scheduler.run_components(components, max_workers=2)
+
+    assert seen == [netcdf_locks._ordered_init] * 2
+    assert locks.CombinedLock.__init__ is not netcdf_locks._ordered_init
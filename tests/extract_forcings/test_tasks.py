@@ -0,0 +1,163 @@
+import json
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import xarray as xr
+
+from CrocoDash.extract_forcings import obc, tasks
+
+
+@pytest.fixture
+def obc_arguments(tmp_path, get_rect_grid):
+    hgrid_path = tmp_path / "hgrid.nc"
+    get_rect_grid.write_supergrid(hgrid_path)
+    for name in ("raw", "regridded", "output"):
+        (tmp_path / name).mkdir()
+    return dict(
+        start_date="2020-01-01",
+        end_date="2020-01-15",
+        boundary_number_conversion={"east": 1, "south": 2},
+        product_name="GLORYS",
+        function_name="get_glorys_data_from_rda",
+        product_info={
+            "u_var_name": "uo",
+            "v_var_name": "vo",
+            "eta_var_name": "zos",
+            "tracer_var_names": {"temp": "thetao", "salt": "so"},
+        },
+        function_args={},
+        hgrid_path=str(hgrid_path),
+        raw_dataset_path=tmp_path / "raw",
+        regridded_dataset_path=tmp_path / "regridded",
+        output_path=tmp_path / "output",
+        get_step_days=10,
+        regrid_step_days=5,
+    )
+
+
+def _write_task_file(tmp_path, arguments):
+    data = tasks.build_tasks(arguments)
+    data["config"] = str(tmp_path / "config.json")
+    path = tmp_path / tasks.TASKS_NAME
+    path.write_text(json.dumps(data))
+    return data, path
+
+
+def _touch_netcdf(path):
+    xr.Dataset({"v": ("t", [0.0])}).to_netcdf(path)
+    return Path(path)
+
+
+def test_build_tasks_orders_stages_and_dependencies(obc_arguments):
+    data = tasks.build_tasks(obc_arguments)
+    task_list = data["tasks"]
+    # 2 GET chunks, 3 REGRID slices and a MERGE per boundary
+    assert len(task_list) == 12
+    assert [t["id"] for t in task_list] == list(range(12))
+    assert [t["stage"] for t in task_list] == [0] * 4 + [1] * 2 + [2] * 4 + [3] * 2
+    for task in task_list:
+        assert all(task_list[d]["stage"] < task["stage"] for d in task["depends"])
+        assert all(
+            task_list[d]["boundary"] == task["boundary"] for d in task["depends"]
+        )
+
+    east = {
+        (t["kind"], tuple(t["dates"])): t for t in task_list if t["boundary"] == "east"
+    }
+    first_get = east[("GET", ("2020-01-01", "2020-01-10"))]
+    second_get = east[("GET", ("2020-01-11", "2020-01-15"))]
+    first_slice = east[("REGRID", ("2020-01-01", "2020-01-05"))]
+    last_slice = east[("REGRID", ("2020-01-11", "2020-01-15"))]
+    assert first_get["outputs"] == [
+        str(
+            obc_arguments["raw_dataset_path"]
+            / "east_unprocessed.2020-01-01_2020-01-10.nc"
+        )
+    ]
+    assert first_slice["depends"] == [first_get["id"]]
+    # Later slices load the weights the first slice builds
+    assert last_slice["depends"] == [second_get["id"], first_slice["id"]]
+    merge = east[("MERGE", ("2020-01-01", "2020-01-15"))]
+    assert len(merge["depends"]) == 3
+    assert merge["outputs"][0].endswith("forcing_obc_segment_001.nc")
+
+
+def test_run_local_runs_every_task_after_its_dependencies(tmp_path, obc_arguments):
+    data, path = _write_task_file(tmp_path, obc_arguments)
+    finished = []
+    lock = threading.Lock()
+
+    def record(path):
+        with lock:
+            finished.append(str(path))
+        return _touch_netcdf(path)
+
+    def fake_get(product_name, function_name, **request):
+        return record(request["output_folder"] / request["output_filename"])
+
+    def fake_regrid(
+        raw_files,
+        hgrid_path,
+        weights_path,
+        output_folder,
+        chunk_start,
+        chunk_end,
+        seg_id,
+        **kwargs,
+    ):
+        assert all(Path(f).exists() for f in raw_files)
+        return record(
+            obc._regridded_path(output_folder, seg_id, chunk_start, chunk_end)
+        )
+
+    def fake_merge(boundary_label, regridded_files, output_folder, manifest=None):
+        assert all(Path(f).exists() for f in regridded_files)
+        return record(Path(output_folder) / f"forcing_obc_segment_{boundary_label}.nc")
+
+    with (
+        patch.object(tasks.driver, "_load", return_value=({}, {}, tmp_path)),
+        patch.object(tasks.driver, "_obc_arguments", return_value=obc_arguments),
+        patch.object(obc, "_get_chunk", side_effect=fake_get),
+        patch.object(obc, "_regrid_slice_task", side_effect=fake_regrid),
+        patch.object(obc, "_merge_boundary", side_effect=fake_merge),
+    ):
+        status = tasks.run_local(path, max_workers=3, executor="thread")
+
+    assert {s.status for s in status.values()} == {"done"}
+    order = {p: i for i, p in enumerate(finished)}
+    for task in data["tasks"]:
+        for d in task["depends"]:
+            assert order[data["tasks"][d]["outputs"][0]] < order[task["outputs"][0]]
+
+
+def test_run_task_refuses_unfinished_dependencies(tmp_path, obc_arguments):
+    data, path = _write_task_file(tmp_path, obc_arguments)
+    merge = data["tasks"][-1]
+    with pytest.raises(RuntimeError, match="depends on unfinished tasks"):
+        tasks.run_task(path, merge["id"])
+
+
+def test_first_slice_reruns_until_its_weights_exist(tmp_path, obc_arguments):
+    data, path = _write_task_file(tmp_path, obc_arguments)
+    (tmp_path / "extract_forcings").mkdir()
+    first_slice = next(t for t in data["tasks"] if t["stage"] == 1)
+    for d in first_slice["depends"]:
+        _touch_netcdf(data["tasks"][d]["outputs"][0])
+    # The output of a run that died before its weights were saved
+    _touch_netcdf(first_slice["outputs"][0])
+
+    with (
+        patch.object(tasks.driver, "_load", return_value=({}, {}, tmp_path)),
+        patch.object(tasks.driver, "_obc_arguments", return_value=obc_arguments),
+        patch.object(obc, "_regrid_slice_task") as regrid,
+    ):
+        tasks.run_task(path, first_slice["id"])
+        assert regrid.call_args.kwargs["weights_path"] is None
+
+        weights = obc._weights_path(obc_arguments["regridded_dataset_path"], 1)
+        weights.write_bytes(b"weights")
+        regrid.reset_mock()
+        tasks.run_task(path, first_slice["id"])
+        regrid.assert_not_called()
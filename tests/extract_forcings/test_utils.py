@@ -1,3 +1,10 @@
+import pytest
+import numpy as np
+import pandas as pd
+import xarray as xr
+from datetime import datetime
+from pathlib import Path
+
 from CrocoDash.extract_forcings import utils
 
 
@@ -16,3 +23,159 @@ def test_build_forcing_request_merges_function_args():
 
     assert extra_args["dataset_path"] == "/some/path"
     assert extra_args["member"] == 5
+
+
+def test_run_tasks_preserves_order_serial_and_threaded():
+    tasks = [{"x": i} for i in range(8)]
+
+    assert utils.run_tasks(lambda x: x * 2, tasks) == [i * 2 for i in range(8)]
+    assert utils.run_tasks(lambda x: x * 2, tasks, max_workers=4) == [
+        i * 2 for i in range(8)
+    ]
+
+
+def test_run_tasks_reraises_after_all_tasks_finish():
+    done = []
+
+    def work(x):
+        if x == 0:
+            raise RuntimeError("boom")
+        done.append(x)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        utils.run_tasks(work, [{"x": i} for i in range(4)], max_workers=2)
+    assert sorted(done) == [1, 2, 3]
+
+
+def test_run_tasks_unknown_executor_raises():
+    with pytest.raises(ValueError, match="executor"):
+        utils.run_tasks(lambda: None, [{}], executor="mpi")
+
+
+def _raw_box(path, lons, lats, days=3):
+    ds = xr.Dataset(
+        {
+            "zos": (
+                ("time", "latitude", "longitude"),
+                np.zeros((days, len(lats), len(lons))),
+            )
+        },
+        coords={
+            "time": pd.date_range("2020-01-01 12:00", periods=days),
+            "latitude": lats,
+            "longitude": lons,
+        },
+    )
+    ds.to_netcdf(path)
+    return path
+
+
+def test_slice_raw_file_latlon_and_dates(tmp_path):
+    # Source in 0..360 longitudes, box requested in -180..180
+    src = _raw_box(
+        tmp_path / "union.nc", np.arange(295.0, 311.0), np.arange(25.0, 41.0)
+    )
+    dest = utils.slice_raw_file(
+        src,
+        tmp_path / "east.nc",
+        latlon={"lat_min": 30.0, "lat_max": 35.0, "lon_min": -52.0, "lon_max": -52.0},
+        coords=[("longitude", "latitude")],
+        dates=["2020-01-02", "2020-01-03"],
+    )
+    with xr.open_dataset(dest) as ds:
+        np.testing.assert_array_equal(ds.longitude, [307.0, 308.0, 309.0])
+        np.testing.assert_array_equal(ds.latitude, np.arange(29.0, 37.0))
+        assert ds.sizes["time"] == 2
+    assert not list(tmp_path.glob(".*tmp"))
+
+
+def test_find_covering_raw_file(tmp_path):
+    _raw_box(tmp_path / "union_unprocessed.2020-01-01_2020-01-15.nc", [0.0], [0.0])
+    (tmp_path / "union_unprocessed.2020-01-16_2020-01-31.nc").write_bytes(b"junk")
+
+    found = utils.find_covering_raw_file(
+        tmp_path, "union", datetime(2020, 1, 1), datetime(2020, 1, 2)
+    )
+    assert found.name == "union_unprocessed.2020-01-01_2020-01-15.nc"
+    # Not covered, or only by an invalid file
+    assert (
+        utils.find_covering_raw_file(
+            tmp_path, "union", datetime(2020, 1, 15), datetime(2020, 1, 16)
+        )
+        is None
+    )
+    assert (
+        utils.find_covering_raw_file(
+            tmp_path, "union", datetime(2020, 1, 20), datetime(2020, 1, 21)
+        )
+        is None
+    )
+
+
+def test_union_latlon_and_area():
+    boxes = [
+        {"lat_min": 0, "lat_max": 2, "lon_min": 10, "lon_max": 10},
+        {"lat_min": 1, "lat_max": 3, "lon_min": 10, "lon_max": 14},
+    ]
+    union = utils.union_latlon(boxes)
+    assert union == {"lat_min": 0, "lat_max": 3, "lon_min": 10, "lon_max": 14}
+    assert utils.latlon_area(union) == (3 + 2) * (4 + 2)
+    assert utils.latlon_area(union, pad=0) == 12
+
+
+def test_strip_boxes_splits_diagonal_segments_only():
+    straight = utils.strip_boxes(np.full(50, 10.0), np.linspace(0, 10, 50), halo=0.25)
+    assert len(straight) == 1
+
+    diagonal = utils.strip_boxes(
+        np.linspace(0, 10, 50), np.linspace(0, 10, 50), halo=0.25
+    )
+    assert len(diagonal) > 1
+    strip_area = sum(utils.latlon_area(b, pad=0) for b in diagonal)
+    assert strip_area < utils.latlon_area(utils.union_latlon(diagonal), pad=0) / 4
+    # Consecutive boxes overlap, so the strip has no gaps
+    for a, b in zip(diagonal[:-1], diagonal[1:]):
+        assert a["lon_max"] >= b["lon_min"] and a["lat_max"] >= b["lat_min"]
+
+
+def test_fetch_raw_chunk_strip_merges_boxes(tmp_path):
+    calls = []
+
+    def fake_access(
+        dates,
+        lat_min,
+        lat_max,
+        lon_min,
+        lon_max,
+        output_folder,
+        output_filename,
+        pad=1,
+        **_,
+    ):
+        calls.append(pad)
+        _raw_box(
+            Path(output_folder) / output_filename,
+            np.arange(lon_min, lon_max + 1),
+            np.arange(lat_min, lat_max + 1),
+        )
+
+    strip = [
+        {"lat_min": 0.0, "lat_max": 2.0, "lon_min": 0.0, "lon_max": 2.0},
+        {"lat_min": 2.0, "lat_max": 4.0, "lon_min": 2.0, "lon_max": 4.0},
+    ]
+    out = utils.fetch_raw_chunk(
+        fake_access,
+        dates=["2020-01-01", "2020-01-03"],
+        latlon=None,
+        output_folder=tmp_path,
+        output_filename="east_unprocessed.nc",
+        variables=["zos"],
+        extra_args={},
+        strip=strip,
+    )
+    assert calls == [0, 0]
+    with xr.open_dataset(out) as ds:
+        np.testing.assert_array_equal(ds.longitude, np.arange(0.0, 5.0))
+        assert not np.isnan(ds.zos.sel(latitude=0.0, longitude=0.0)).any()
+        assert np.isnan(ds.zos.sel(latitude=4.0, longitude=0.0)).all()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["east_unprocessed.nc"]
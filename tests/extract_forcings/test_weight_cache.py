@@ -0,0 +1,69 @@
+import os
+import numpy as np
+import xarray as xr
+
+from CrocoDash.extract_forcings.weight_cache import WeightCache, fingerprint
+
+
+def test_fingerprint_depends_on_values_shape_and_params():
+    lon = np.linspace(0, 10, 11)
+    key = fingerprint(lon, method="bilinear")
+    assert key == fingerprint(xr.DataArray(lon.copy()), method="bilinear")
+    assert key != fingerprint(lon + 1e-9, method="bilinear")
+    assert key != fingerprint(lon.reshape(1, 11), method="bilinear")
+    assert key != fingerprint(lon, method="conservative")
+    # Dates are not an input, so the parameter order must not matter either
+    assert fingerprint(lon, a=1, b=2) == fingerprint(lon, b=2, a=1)
+
+
+def test_put_get_materialize(tmp_path):
+    cache = WeightCache(tmp_path / "cache")
+    src = tmp_path / "weights.nc"
+    src.write_bytes(b"weights")
+
+    assert cache.get("abc", ".nc") is None
+    assert not cache.materialize("abc", ".nc", tmp_path / "out.nc")
+
+    cache.put("abc", ".nc", src)
+    assert cache.get("abc", ".nc").read_bytes() == b"weights"
+    assert cache.materialize("abc", ".nc", tmp_path / "case" / "out.nc")
+    assert (tmp_path / "case" / "out.nc").read_bytes() == b"weights"
+    assert not list(cache.cache_dir.glob(".*"))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = WeightCache(tmp_path / "cache", max_bytes=25)
+    src = tmp_path / "weights.nc"
+    src.write_bytes(b"x" * 10)
+
+    cache.put("old", ".nc", src)
+    cache.put("used", ".nc", src)
+    # Age both entries, then touch "used" so that "old" is the LRU one
+    for i, name in enumerate(["old.nc", "used.nc"]):
+        os.utime(cache.cache_dir / name, (1000 + i, 1000 + i))
+    cache.get("used", ".nc")
+
+    cache.put("new", ".nc", src)
+    assert sorted(p.name for p in cache.cache_dir.iterdir()) == ["new.nc", "used.nc"]
+
+
+def test_never_evicts_the_entry_just_added(tmp_path):
+    cache = WeightCache(tmp_path / "cache", max_bytes=5)
+    src = tmp_path / "weights.nc"
+    src.write_bytes(b"x" * 10)
+
+    path = cache.put("big", ".nc", src)
+    assert path.exists()
+
+
+def test_ignores_a_directory_others_can_write_to(tmp_path):
+    cache = WeightCache(tmp_path / "cache")
+    src = tmp_path / "weights.pkl"
+    src.write_bytes(b"weights")
+    cache.put("abc", ".pkl", src)
+    assert cache.cache_dir.stat().st_mode & 0o777 == 0o700
+
+    cache.cache_dir.chmod(0o777)
+    assert cache.get("abc", ".pkl") is None
+    assert cache.put("def", ".pkl", src) is None
+    assert not cache.path("def", ".pkl").exists()
@@ -5,6 +5,7 @@ import stat
 
 from CrocoDash.raw_data_access.datasets.utils import (
     convert_lons_to_180_range,
+    split_date_range,
     write_bash_curl_script,
 )
 
@@ -41,3 +42,15 @@ def test_write_bash_curl_script_creates_executable_script(tmp_path):
     # Ensure executable bit is set (owner, group, or other).
     mode = os.stat(script_path).st_mode
     assert mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def test_split_date_range_covers_every_day_once():
+    """Pieces are consecutive, inclusive and at most chunk_days long."""
+    assert split_date_range(["2000-01-01", "2000-01-10"], 4) == [
+        ("2000-01-01", "2000-01-04"),
+        ("2000-01-05", "2000-01-08"),
+        ("2000-01-09", "2000-01-10"),
+    ]
+    assert split_date_range(["2000-01-01", "2000-01-10"], 31) == [
+        ("2000-01-01", "2000-01-10")
+    ]
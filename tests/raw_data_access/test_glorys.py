@@ -3,6 +3,7 @@ import os
 import pytest
 import xarray as xr
 import numpy as np
+import pandas as pd
 
 
 @pytest.mark.slow
@@ -67,3 +68,95 @@ def test_get_glorys_data_script_for_cli(tmp_path):
 
     # Just testing if it exists, this function just calls a regional_mom6 function
     assert os.path.exists(path)
+
+
+class FakeSubset:
+    """Stand-in for copernicusmarine.subset writing a small daily dataset,
+    each variable filled with the length of its name.
+
+    Each call in fail_first raises once before succeeding.
+    """
+
+    def __init__(self, fail_first=()):
+        self.calls = []
+        self.fail_first = set(fail_first)
+
+    def __call__(self, **kwargs):
+        key = (kwargs["start_datetime"][:10], tuple(kwargs["variables"]))
+        self.calls.append(key)
+        if key in self.fail_first:
+            self.fail_first.discard(key)
+            raise ConnectionError("server hiccup")
+        time = pd.date_range(key[0], kwargs["end_datetime"][:10], freq="D")
+        latitude = np.arange(kwargs["minimum_latitude"], kwargs["maximum_latitude"])
+        shape = (len(time), len(latitude))
+        ds = xr.Dataset(
+            {v: (("time", "latitude"), np.full(shape, len(v))) for v in key[1]},
+            coords={"time": time, "latitude": latitude},
+        )
+        ds.to_netcdf(
+            os.path.join(kwargs["output_directory"], kwargs["output_filename"])
+        )
+
+
+def _cds_request(tmp_path, output_filename="temp.nc", **kwargs):
+    return gl.GLORYS.get_glorys_data_from_cds_api(
+        ["2000-01-01", "2000-01-10"],
+        60,
+        61,
+        -35,
+        -34,
+        output_folder=tmp_path,
+        output_filename=output_filename,
+        variables=["zos", "thetao"],
+        backoff_seconds=0,
+        **kwargs,
+    )
+
+
+def test_get_glorys_data_from_cds_api_stitches_parts(tmp_path, monkeypatch):
+    subset = FakeSubset()
+    monkeypatch.setattr(gl.copernicusmarine, "subset", subset)
+    path = _cds_request(tmp_path, chunk_days=4, split_variables=True)
+
+    assert len(subset.calls) == 6  # 3 date pieces x 2 variables
+    with xr.open_dataset(path) as ds:
+        assert list(ds.time.dt.day.values) == list(range(1, 11))
+        assert set(ds.data_vars) == {"zos", "thetao"}
+        assert (ds.thetao == 6).all() and (ds.zos == 3).all()
+    assert os.listdir(tmp_path) == ["temp.nc"]
+
+
+def test_get_glorys_data_from_cds_api_retries_only_failed_parts(tmp_path, monkeypatch):
+    failing = ("2000-01-05", ("zos", "thetao"))
+    subset = FakeSubset(fail_first=[failing])
+    monkeypatch.setattr(gl.copernicusmarine, "subset", subset)
+    _cds_request(tmp_path, chunk_days=4)
+    assert sorted(subset.calls).count(failing) == 2
+    assert len(subset.calls) == 4
+
+    # Without retries the failure is raised and the finished parts are kept
+    subset = FakeSubset(fail_first=[failing])
+    monkeypatch.setattr(gl.copernicusmarine, "subset", subset)
+    with pytest.raises(ConnectionError):
+        _cds_request(tmp_path, chunk_days=4, retries=0, output_filename="b.nc")
+    subset.calls.clear()
+    _cds_request(tmp_path, chunk_days=4, retries=0, output_filename="b.nc")
+    assert subset.calls == [failing]
+
+
+def test_get_glorys_data_from_cds_api_ignores_parts_of_another_split(
+    tmp_path, monkeypatch
+):
+    failing = ("2000-01-05", ("zos", "thetao"))
+    monkeypatch.setattr(gl.copernicusmarine, "subset", FakeSubset([failing]))
+    with pytest.raises(ConnectionError):
+        _cds_request(tmp_path, chunk_days=4, retries=0)
+
+    # Re-split: the kept 4-day parts are not mistaken for the 5-day ones
+    subset = FakeSubset()
+    monkeypatch.setattr(gl.copernicusmarine, "subset", subset)
+    path = _cds_request(tmp_path, chunk_days=5)
+    assert sorted(start for start, _ in subset.calls) == ["2000-01-01", "2000-01-06"]
+    with xr.open_dataset(path) as ds:
+        assert list(ds.time.dt.day.values) == list(range(1, 11))
@@ -0,0 +1,108 @@
+"""Tests for CrocoDash.netcdf_locks.ordered_locks."""
+
+import threading
+
+from xarray.backends import locks, netCDF4_
+
+from CrocoDash import netcdf_locks
+
+
+def _order(lock):
+    shared = [locks.NETCDFC_LOCK, locks.HDF5_LOCK]
+    return [l for l in lock.locks if any(l is s for s in shared)]
+
+
+def test_reads_and_writes_take_the_shared_locks_in_one_order(tmp_path):
+    shared = [locks.NETCDFC_LOCK, locks.HDF5_LOCK]
+    with netcdf_locks.ordered_locks():
+        assert _order(netCDF4_.NETCDF4_PYTHON_LOCK) == shared
+        for i in range(50):
+            write_lock = locks.combine_locks(
+                [
+                    netCDF4_.NETCDF4_PYTHON_LOCK,
+                    locks.get_write_lock(str(tmp_path / f"{i}.nc")),
+                ]
+            )
+            assert _order(write_lock) == shared
+
+
+def test_xarray_is_restored_when_the_last_block_exits():
+    init = locks.CombinedLock.__init__
+    shared_locks = netCDF4_.NETCDF4_PYTHON_LOCK.locks
+
+    with netcdf_locks.ordered_locks():
+        with netcdf_locks.ordered_locks():
+            pass
+        assert locks.CombinedLock.__init__ is not init
+
+    assert locks.CombinedLock.__init__ is init
+    assert netCDF4_.NETCDF4_PYTHON_LOCK.locks == shared_locks
+
+
+class _StepLock:
+    """A lock with a chosen hash that, once acquired, waits for the other
+    thread to acquire its first lock too, so an inverted order deadlocks."""
+
+    def __init__(self, hash_, barrier):
+        self._hash = hash_
+        self._barrier = barrier
+        self._lock = threading.Lock()
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return self is other
+
+    def acquire(self, blocking=True):
+        return self._lock.acquire(blocking)
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        if not self._lock.acquire(timeout=2):
+            raise TimeoutError("deadlock")
+        try:
+            self._barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+
+    def __exit__(self, *args):
+        self._lock.release()
+
+
+def _read_and_write_at_once():
+    """Mimic xarray: a read holds the shared lock, a write the shared lock
+    combined with a per-file lock. Returns the errors of the two threads."""
+    barrier = threading.Barrier(2, timeout=0.5)
+    # Equal hashes make the set in CombinedLock reorder the shared locks
+    netcdf_c, hdf5 = _StepLock(3, barrier), _StepLock(3, barrier)
+    shared = locks.combine_locks([netcdf_c, hdf5])
+    write = locks.combine_locks([shared, _StepLock(4, barrier)])
+    errors = []
+
+    def hold(lock):
+        try:
+            with lock:
+                pass
+        except TimeoutError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=hold, args=(l,)) for l in (shared, write)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    assert not any(t.is_alive() for t in threads)
+    return errors
+
+
+def test_concurrent_read_and_write_deadlock_without_ordered_locks():
+    assert len(_read_and_write_at_once()) == 2
+
+    with netcdf_locks.ordered_locks():
+        assert _read_and_write_at_once() == []